@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Optional
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Mapping, Optional
 
 import httpx
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
@@ -8,24 +10,36 @@ from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_ex
 from ..core.errors import AdapterError
 
 
+logger = logging.getLogger(__name__)
+
+
 class NansenAPIClient:
     """Nansen API 介面層。"""
 
+    _ADDRESS_LABELS_PATH = "/api/beta/profiler/address/labels"
+
     def __init__(
         self,
         base_url: str,
         api_key: str,
         timeout: float = 30.0,
         transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_concurrency: int = 32,
     ) -> None:
+        self._base_url = base_url
+        self._headers = {
+            "x-api-key": api_key,
+            "apiKey": api_key,
+            "Authorization": f"Bearer {api_key}",
+            "User-Agent": "nansen-sm-collector/0.1.0",
+        }
+        self._timeout = timeout
+        self._async_transport = async_transport
+        self._max_concurrency = max(1, max_concurrency)
         self._client = httpx.Client(
             base_url=base_url,
-            headers={
-                "x-api-key": api_key,
-                "apiKey": api_key,
-                "Authorization": f"Bearer {api_key}",
-                "User-Agent": "nansen-sm-collector/0.1.0",
-            },
+            headers=self._headers,
             timeout=timeout,
             transport=transport,
         )
@@ -60,6 +74,30 @@ class NansenAPIClient:
             ) from error
         return response.json()
 
+    @retry(
+        retry=retry_if_exception_type(AdapterError),
+        wait=wait_exponential(multiplier=1, max=8),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    async def _apost(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        response = await client.post(path, json=payload)
+        if response.status_code >= 500:
+            raise AdapterError(f"Nansen 伺服器錯誤：{response.status_code}")
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as error:
+            body = response.text
+            raise AdapterError(
+                f"Nansen 回應錯誤：{error} — body: {body}"
+            ) from error
+        return response.json()
+
     @retry(
         retry=retry_if_exception_type(AdapterError),
         wait=wait_exponential(multiplier=1, max=8),
@@ -94,11 +132,59 @@ class NansenAPIClient:
     def fetch_address_labels(self, chain: str, address: str) -> Dict[str, Any]:
         """查詢單一地址標籤。"""
 
-        payload = {
+        return self._post(self._ADDRESS_LABELS_PATH, self._address_labels_payload(chain, address))
+
+    async def afetch_address_labels(
+        self,
+        address_chain_pairs: Mapping[str, str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """並行查詢多個地址標籤，回傳 address -> 原始回應。
+
+        重試後仍失敗的地址記錄警告後略過，不影響其他地址已取得的結果。
+        """
+
+        if not address_chain_pairs:
+            return {}
+        limits = httpx.Limits(
+            max_connections=self._max_concurrency,
+            max_keepalive_connections=self._max_concurrency,
+        )
+        async with httpx.AsyncClient(
+            base_url=self._base_url,
+            headers=self._headers,
+            timeout=self._timeout,
+            limits=limits,
+            transport=self._async_transport,
+        ) as client:
+            addresses = list(address_chain_pairs)
+            responses = await asyncio.gather(
+                *(
+                    self._apost(
+                        client,
+                        self._ADDRESS_LABELS_PATH,
+                        self._address_labels_payload(address_chain_pairs[address], address),
+                    )
+                    for address in addresses
+                ),
+                return_exceptions=True,
+            )
+        results: Dict[str, Dict[str, Any]] = {}
+        for address, response in zip(addresses, responses):
+            if isinstance(response, BaseException):
+                logger.warning(
+                    "nansen_address_labels_failed",
+                    extra={"address": address, "error": str(response)},
+                )
+                continue
+            results[address] = response
+        return results
+
+    @staticmethod
+    def _address_labels_payload(chain: str, address: str) -> Dict[str, Any]:
+        return {
             "parameters": {
                 "chain": chain,
                 "address": address,
             },
             "pagination": {"page": 1, "recordsPerPage": 100},
         }
-        return self._post("/api/beta/profiler/address/labels", payload)
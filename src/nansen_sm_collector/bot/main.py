@@ -60,6 +60,7 @@ def run_bot() -> None:
         ApplicationBuilder()
         .token(settings.telegram_bot_token)
         .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
         .build()
     )
 
@@ -223,6 +224,12 @@ async def _post_init(application: Application) -> None:
         logger.warning("set_bot_commands_failed", extra={"error": str(exc)})
 
 
+async def _post_shutdown(application: Application) -> None:
+    zeabur_client: ZeaburAPIClient | None = application.bot_data.get("zeabur_client")
+    if zeabur_client:
+        await zeabur_client.aclose()
+
+
 def _build_primary_keyboard() -> InlineKeyboardMarkup:
     buttons = [
         [InlineKeyboardButton("▶️ 立即執行", callback_data="run_once")],
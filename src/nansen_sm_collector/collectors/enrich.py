@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any, Iterable, List
 
@@ -50,11 +51,18 @@ class EventEnricher:
 
     def _fetch_labels(self, address_chain_pairs: dict[str, str | None]) -> dict[str, list[str]]:
         results: dict[str, list[str]] = {}
+        pairs = {address: chain for address, chain in address_chain_pairs.items() if chain}
         try:
-            for address, chain in address_chain_pairs.items():
-                if not chain:
-                    continue
-                response = self._client.fetch_address_labels(chain=chain, address=address)
+            afetch_labels = getattr(self._client, "afetch_address_labels", None)
+            if afetch_labels is not None:
+                # 支援非同步的客戶端一次並行查詢所有地址。
+                responses = asyncio.run(afetch_labels(pairs))
+            else:
+                responses = {
+                    address: self._client.fetch_address_labels(chain=chain, address=address)
+                    for address, chain in pairs.items()
+                }
+            for address, response in responses.items():
                 records = response.get("data", []) if isinstance(response, dict) else response
                 labels = [
                     record.get("label")
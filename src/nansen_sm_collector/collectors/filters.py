@@ -84,19 +84,18 @@ class EventFilterSet:
 
         lookback_minutes = self._settings.min_usd_notional_lookback_minutes
         since = (event.occurred_at or utc_now()) - timedelta(minutes=lookback_minutes)
-        history = self._event_repo.get_usd_notional_history(
+        stats = self._event_repo.get_usd_notional_stats(
             token_symbol=token_symbol,
             chain=chain,
             since=since,
+            quantile=self._settings.min_usd_notional_quantile,
         )
 
         min_samples = self._settings.min_usd_notional_min_samples
-        if len(history) < min_samples:
+        if stats["count"] < min_samples:
             return fallback
 
-        quantile = self._settings.min_usd_notional_quantile
-        threshold = _percentile(history, quantile)
-        return max(threshold, fallback)
+        return max(stats["percentile"], fallback)
 
     def _liquidity_ok(self, event: Event) -> bool:
         liquidity = event.token.liquidity_score or 0
@@ -104,18 +103,3 @@ class EventFilterSet:
 
     def _not_blacklisted(self, event: Event) -> bool:
         return not event.token.blacklist_flags
-
-
-def _percentile(values: List[float], q: float) -> float:
-    if not values:
-        return 0.0
-    if q <= 0:
-        return min(values)
-    if q >= 1:
-        return max(values)
-    sorted_vals = sorted(values)
-    rank = q * (len(sorted_vals) - 1)
-    lower_index = int(rank)
-    upper_index = min(lower_index + 1, len(sorted_vals) - 1)
-    weight = rank - lower_index
-    return sorted_vals[lower_index] * (1 - weight) + sorted_vals[upper_index] * weight
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List
 
 from ..core.errors import NormalizationError
 from ..core.types import Event, EventFeature, Token, Wallet
 
+SOURCE_DEX_TRADES = "dex_trades"
+SOURCE_TOKEN_SCREENER = "token_screener"
+SOURCE_NETFLOWS = "netflows"
 
+
+def _intern(value: Any) -> Any:
+    """intern 重複出現的 symbol / chain 字串，讓後續 dict key 比對可走指標相等捷徑。"""
+
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+# 同一區塊內的多筆交易常帶相同時間字串，快取解析結果（datetime 為不可變物件）。
+@lru_cache(maxsize=4096)
 def _parse_timestamp(value: str) -> datetime:
     try:
         dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -25,15 +41,17 @@ class EventNormalizer:
         for item in payload.get("data", []):
             timestamp = item.get("timestamp") or item.get("block_timestamp")
             occurred_at = _parse_timestamp(timestamp) if timestamp else datetime.now(tz=timezone.utc)
+            chain = _intern(item.get("chain"))
             token = Token(
-                symbol=
-                item.get("tokenSymbol")
-                or item.get("token_bought_symbol")
-                or item.get("token_name")
-                or item.get("token_symbol", ""),
+                symbol=_intern(
+                    item.get("tokenSymbol")
+                    or item.get("token_bought_symbol")
+                    or item.get("token_name")
+                    or item.get("token_symbol", "")
+                ),
                 address=item.get("token_bought_address")
                 or item.get("token_address"),
-                chain=item.get("chain"),
+                chain=chain,
                 liquidity_score=item.get("liquidityScore", 1.0),
             )
             wallet = Wallet(address=item.get("address") or item.get("trader_address", ""))
@@ -54,11 +72,11 @@ class EventNormalizer:
             )
             events.append(
                 Event(
-                    source="dex_trades",
+                    source=SOURCE_DEX_TRADES,
                     token=token,
                     wallet=wallet,
                     tx_hash=item.get("txHash") or item.get("transaction_hash"),
-                    chain=item.get("chain"),
+                    chain=chain,
                     occurred_at=occurred_at,
                     features=features,
                 )
@@ -70,9 +88,9 @@ class EventNormalizer:
         now = datetime.now(tz=timezone.utc)
         for item in payload.get("data", []):
             token = Token(
-                symbol=item.get("tokenSymbol") or item.get("token_symbol", ""),
+                symbol=_intern(item.get("tokenSymbol") or item.get("token_symbol", "")),
                 address=item.get("token_address"),
-                chain=item.get("chain"),
+                chain=_intern(item.get("chain")),
                 liquidity_score=item.get("liquidity"),
             )
             features = EventFeature(
@@ -86,7 +104,7 @@ class EventNormalizer:
             )
             events.append(
                 Event(
-                    source="token_screener",
+                    source=SOURCE_TOKEN_SCREENER,
                     token=token,
                     occurred_at=now,
                     features=features,
@@ -114,11 +132,11 @@ class EventNormalizer:
             )
             events.append(
                 Event(
-                    source="netflows",
+                    source=SOURCE_NETFLOWS,
                     token=Token(
-                        symbol=item.get("tokenSymbol") or item.get("token_symbol", "UNKNOWN"),
+                        symbol=_intern(item.get("tokenSymbol") or item.get("token_symbol", "UNKNOWN")),
                         address=item.get("token_address"),
-                        chain=item.get("chain"),
+                        chain=_intern(item.get("chain")),
                     ),
                     wallet=wallet,
                     occurred_at=now,
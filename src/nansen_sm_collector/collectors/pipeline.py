@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-import json
+import io
 import logging
+import os
 import re
-from collections import defaultdict
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, TypedDict
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
+import orjson
+from pydantic import TypeAdapter
+
 from ..adapters.gecko_terminal import GeckoTerminalClient
 from ..adapters.mock_nansen import MockNansenClient
 from ..adapters.nansen_api import NansenAPIClient
@@ -29,16 +34,44 @@ from ..data.repos import (
     WalletRepository,
 )
 from ..services.token_market_data import TokenMarketDataService
-from ..services.token_overview import TokenOverviewService
+from ..services.token_overview import OverviewRow, TokenOverviewService
 from ..services.trade_signal_builder import TradeSignalBuilder
 from ..services.trade_simulator import TradeSimulator
 from ..services.wallet_alpha import WalletAlphaService
 from ..services.telegram_notifier import TelegramNotifier
 from .enrich import EventEnricher
 from .filters import EventFilterSet
-from .normalize import EventNormalizer
+from .normalize import (
+    SOURCE_DEX_TRADES,
+    SOURCE_NETFLOWS,
+    SOURCE_TOKEN_SCREENER,
+    EventNormalizer,
+)
 from .scorer import SignalScorer
 
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+_EVENT_LIST_ADAPTER = TypeAdapter(List[Event])
+# 一次比對切出「前綴 / 地址 / 地址後文字 / chain 標籤 / 其餘」，避免逐段重複掃描。
+_LINE_PATTERN = re.compile(
+    r"(?P<prefix>.*?)(?P<addr>0x[a-fA-F0-9]{6,})"
+    r"(?P<middle>.*?)(?:(?i:\[chain:)\s*(?P<chain>[^\]]+)\]|$)"
+    r"(?P<suffix>.*)",
+    re.DOTALL,
+)
+
+
+class HistoryEntry(TypedDict):
+    """單一 token 群組的報表摘要，同時寫入歷史 JSON 與資料庫。"""
+
+    section: str
+    token_symbol: str
+    token_address: str | None
+    chain: str
+    score: float
+    reasons: List[str]
+    count: int
+    top_wallets: List[str]
+
 
 @dataclass
 class PipelineResult:
@@ -47,19 +80,27 @@ class PipelineResult:
     signals: Sequence[Signal]
     report_path: Path | None = None
     stats: dict[str, object] | None = None
-    history_entries: List[dict] | None = None
+    history_entries: List[HistoryEntry] | None = None
     trade_candidates: dict | None = None
 
 
 class CollectorPipeline:
     """Phase-1 蒐集與評分流程。"""
 
+    _REPORT_DIR: Path = Path("reports")
+    _HISTORY_DIR: Path = _REPORT_DIR / "history"
+
     def __init__(self, settings: AppSettings) -> None:
         self._settings = settings
         self._engine = db.create_db_engine(settings.db_url)
         db.Base.metadata.create_all(self._engine)
         db.upgrade_schema(self._engine)
         self._session_factory = db.create_session_factory(self._engine)
+        self._HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        # 請求內容只取決於設定，建構時先算好；每次執行僅更新時間區間。
+        self._dex_payload_template = self._build_dex_payload()
+        self._token_screener_payload_template = self._build_token_screener_payload()
+        self._netflow_payload_template = self._build_netflow_payload()
         self._logger = logging.getLogger(__name__)
         self._telegram_notifier: TelegramNotifier | None = None
         if (
@@ -92,7 +133,7 @@ class CollectorPipeline:
         trade_signal_builder = TradeSignalBuilder()
         timezone = ZoneInfo(self._settings.timezone)
         report_path: Path | None = None
-        history_entries: List[dict] = []
+        history_entries: List[HistoryEntry] = []
         trade_candidates: dict | None = None
 
         with db.session_scope(self._session_factory) as session:
@@ -151,7 +192,7 @@ class CollectorPipeline:
                 token_overview = market_data_service.enrich(token_overview)
             stats["token_overview_count"] = len(token_overview)
             stats["market_data_pools"] = sum(
-                len((entry.get("market") or {}).get("pools") or []) for entry in token_overview
+                len(entry.market.get("pools") or []) for entry in token_overview
             )
             trade_candidates = trade_signal_builder.build(token_overview)
             stats["trade_candidates_with_smart"] = len(trade_candidates.get("with_smart_money", []))
@@ -160,9 +201,11 @@ class CollectorPipeline:
             stats["trade_candidates_total"] = len(flat_candidates)
             filtered_events, filter_stats = filters.apply(merged_events)
             stats["filter_stats"] = filter_stats
-            signals: List[Signal] = []
-            for event in filtered_events:
-                signal = scorer.score(event)
+            signals = scorer.score_batch(filtered_events)
+            # 先以 IN 查詢一次載入本批代幣與錢包，避免逐筆 upsert 時的 N+1 查詢。
+            token_repo.prefetch((event.token.symbol, event.token.chain) for event in filtered_events)
+            wallet_repo.prefetch(event.wallet.address for event in filtered_events if event.wallet)
+            for event, signal in zip(filtered_events, signals):
                 self._persist_entities(
                     signal=signal,
                     event=event,
@@ -171,7 +214,6 @@ class CollectorPipeline:
                     event_repo=event_repo,
                     signal_repo=signal_repo,
                 )
-                signals.append(signal)
                 if (signal.metadata or {}).get("signal_type") == "sell":
                     sell_count += 1
                 else:
@@ -206,7 +248,13 @@ class CollectorPipeline:
             )
             screener_repo.bulk_insert_snapshots(run_model.id, screener_rows, captured_at=run_time)
             screener_repo.upsert_market_metrics(screener_rows, captured_at=run_time)
-            run_repo.bulk_insert_summaries(run_id, history_entries or [])
+            run_repo.bulk_insert_summaries(
+                run_id,
+                history_entries or [],
+                generated_at=run_time,
+                generated_at_local=run_time_local,
+                run_pk=run_model.id,
+            )
             overview_path = self._write_token_overview(token_overview, run_time)
             stats["token_overview_path"] = str(overview_path) if overview_path else None
             trade_candidates_path = self._write_trade_candidates(trade_candidates, run_time)
@@ -253,19 +301,37 @@ class CollectorPipeline:
     ) -> tuple[List[Event], dict[str, int], List[dict]]:
         stats: dict[str, int] = {}
 
-        dex_events = self._fetch_dex_events(client, normalizer)
+        # 三個來源彼此獨立，同時發出請求以縮短網路等待時間。
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            dex_future = executor.submit(self._fetch_dex_events, client, normalizer)
+            screener_future = executor.submit(
+                client.fetch_token_screener,
+                {
+                    **self._token_screener_payload_template,
+                    "date": self._build_time_window(hours=24),
+                },
+            )
+            netflow_future = executor.submit(
+                client.fetch_netflows, dict(self._netflow_payload_template)
+            )
+            dex_events = dex_future.result()
+            screener_payload = screener_future.result()
+            netflow_payload = netflow_future.result()
+
         stats["dex_events"] = len(dex_events)
 
-        screener_payload = client.fetch_token_screener(self._build_token_screener_payload())
         screener_events = normalizer.token_screener(screener_payload)
         stats["token_screener_events"] = len(screener_events)
         screener_rows: List[dict] = []
         if isinstance(screener_payload, dict):
             data = screener_payload.get("data")
             if isinstance(data, list):
-                screener_rows = [row for row in data if isinstance(row, dict)]
+                # API 回應通常全為 dict，此時直接沿用原串列，不再複製一份。
+                if all(isinstance(row, dict) for row in data):
+                    screener_rows = data
+                else:
+                    screener_rows = [row for row in data if isinstance(row, dict)]
 
-        netflow_payload = client.fetch_netflows(self._build_netflow_payload())
         netflow_events = normalizer.netflows(netflow_payload)
         stats["netflow_events"] = len(netflow_events)
 
@@ -281,7 +347,7 @@ class CollectorPipeline:
         client: NansenAPIClient | MockNansenClient,
         normalizer: EventNormalizer,
     ) -> List[Event]:
-        payload = self._build_dex_payload()
+        payload = dict(self._dex_payload_template)
         response = client.fetch_dex_trades(payload)
         if isinstance(response, dict):
             data = response.get("data", [])
@@ -293,32 +359,44 @@ class CollectorPipeline:
         return normalizer.dex_trades(response)
 
     def _merge_events(self, events: Iterable[Event]) -> List[Event]:
-        grouped: Dict[tuple[str | None, str | None], Dict[str, List[Event]]] = defaultdict(
-            lambda: {"dex_trades": [], "token_screener": [], "netflows": []}
-        )
-        for event in events:
-            key = (event.token.symbol, event.token.chain or event.chain)
-            buckets = grouped[key]
-            buckets.setdefault(event.source, [])
-            buckets[event.source].append(event)
+        keyed_events = [
+            ((event.token.symbol, event.token.chain or event.chain), event) for event in events
+        ]
+
+        # 先找出三個來源都出現的 key，只為這些 key 建立 bucket。
+        keys_by_source: Dict[str, set[tuple[str | None, str | None]]] = {
+            SOURCE_DEX_TRADES: set(),
+            SOURCE_TOKEN_SCREENER: set(),
+            SOURCE_NETFLOWS: set(),
+        }
+        for key, event in keyed_events:
+            source_keys = keys_by_source.get(event.source)
+            if source_keys is not None:
+                source_keys.add(key)
+        valid_keys = set.intersection(*keys_by_source.values())
+
+        grouped: Dict[tuple[str | None, str | None], Dict[str, List[Event]]] = {}
+        for key, event in keyed_events:
+            if key not in valid_keys:
+                continue
+            buckets = grouped.setdefault(key, {})
+            buckets.setdefault(event.source, []).append(event)
 
         merged_events: List[Event] = []
         for buckets in grouped.values():
-            dex_events = buckets.get("dex_trades", [])
-            screener_events = buckets.get("token_screener", [])
-            netflow_events = buckets.get("netflows", [])
-
-            if not dex_events or not screener_events or not netflow_events:
-                continue
+            dex_events = buckets[SOURCE_DEX_TRADES]
+            screener_events = buckets[SOURCE_TOKEN_SCREENER]
+            netflow_events = buckets[SOURCE_NETFLOWS]
 
+            # 以 (key, -index) tuple 比較；同分時與原本 max() 相同取第一筆，且不需比較 Event。
             best_screener = max(
-                screener_events,
-                key=lambda e: e.token.liquidity_score or 0,
-            )
+                (e.token.liquidity_score or 0, -index, e)
+                for index, e in enumerate(screener_events)
+            )[2]
             best_netflow = max(
-                netflow_events,
-                key=lambda e: abs(e.features.smart_money_netflow or 0),
-            )
+                (abs(e.features.smart_money_netflow or 0), -index, e)
+                for index, e in enumerate(netflow_events)
+            )[2]
 
             netflow_value = best_netflow.features.smart_money_netflow or 0.0
             if abs(netflow_value) < self._settings.netflow_min_positive:
@@ -385,7 +463,6 @@ class CollectorPipeline:
     def _build_token_screener_payload(self) -> dict:
         return {
             "chains": self._settings.chains,
-            "date": self._build_time_window(hours=24),
             "pagination": {"page": 1, "per_page": 25},
             "filters": {
                 "only_smart_money": True,
@@ -440,24 +517,26 @@ class CollectorPipeline:
         signals: Sequence[Signal],
         run_time: datetime,
         run_time_local: datetime,
-        token_overview: Sequence[dict] | None = None,
+        token_overview: Sequence[OverviewRow] | None = None,
         trade_candidates: dict | None = None,
-    ) -> tuple[Path, List[dict]]:
-        report_dir = Path("reports")
-        report_dir.mkdir(exist_ok=True)
-        report_path = report_dir / "phase1_latest.md"
+    ) -> tuple[Path, List[HistoryEntry]]:
+        report_path = self._REPORT_DIR / "phase1_latest.md"
         timestamp_text = run_time.isoformat()
         timestamp_local_text = run_time_local.isoformat()
-        lines = [
-            "# Phase-1 Signals Summary",
-            "",
-            f"產出時間 (UTC): {timestamp_text}",
-            f"當地時間 ({self._settings.timezone}): {timestamp_local_text}",
-            "",
-        ]
-        history_entries: List[dict] = []
+        buffer = io.StringIO()
+
+        def emit(text: str = "") -> None:
+            buffer.write(text)
+            buffer.write("\n")
+
+        emit("# Phase-1 Signals Summary")
+        emit()
+        emit(f"產出時間 (UTC): {timestamp_text}")
+        emit(f"當地時間 ({self._settings.timezone}): {timestamp_local_text}")
+        emit()
+        history_entries: List[HistoryEntry] = []
         if not signals:
-            lines.append("尚未產生任何訊號。")
+            emit("尚未產生任何訊號。")
         else:
             buy_groups: Dict[tuple[str, str | None], List[Signal]] = {}
             sell_groups: Dict[tuple[str, str | None], List[Signal]] = {}
@@ -470,55 +549,60 @@ class CollectorPipeline:
                 else:
                     buy_groups.setdefault(key, []).append(signal)
 
-            def _sorted_groups(groups: Dict[tuple[str, str | None], List[Signal]]):
-                return sorted(
-                    groups.items(),
-                    key=lambda item: max(sig.score for sig in item[1]),
-                    reverse=True,
-                )
-
-            def _collect_top_wallets(group: List[Signal], top_n: int = 3) -> List[str]:
+            def _summarize_group(
+                group: List[Signal], top_n: int = 3
+            ) -> tuple[Signal, List[str]]:
+                best_signal = group[0]
                 wallet_scores: Dict[str, float] = {}
                 for signal in group:
+                    score = signal.score
+                    if score > best_signal.score:
+                        best_signal = signal
                     for wallet in signal.wallets:
                         addr = wallet.address
                         if not addr:
                             continue
-                        wallet_scores[addr] = max(wallet_scores.get(addr, 0.0), signal.score)
-                return [addr for addr, _ in sorted(wallet_scores.items(), key=lambda item: item[1], reverse=True)[:top_n]]
+                        if addr not in wallet_scores or score > wallet_scores[addr]:
+                            wallet_scores[addr] = score
+                top_wallets = [
+                    addr
+                    for addr, _ in sorted(wallet_scores.items(), key=lambda item: item[1], reverse=True)[:top_n]
+                ]
+                return best_signal, top_wallets
 
             def _render(section_title: str, groups: Dict[tuple[str, str | None], List[Signal]]):
-                lines.append(f"## {section_title}")
-                lines.append("")
-                for (symbol, address), group in _sorted_groups(groups):
-                    best_signal = max(group, key=lambda s: s.score)
-                    reason_codes = {reason.code for reason in best_signal.reasons}
-                    reason_str = ",".join(sorted(reason_codes)) if reason_codes else "-"
+                emit(f"## {section_title}")
+                emit()
+                group_stats = [
+                    (symbol, address, group, *_summarize_group(group))
+                    for (symbol, address), group in groups.items()
+                ]
+                group_stats.sort(key=lambda item: item[3].score, reverse=True)
+                for symbol, address, group, best_signal, top_wallets in group_stats:
+                    reason_codes = sorted({reason.code for reason in best_signal.reasons})
+                    reason_str = ",".join(reason_codes) if reason_codes else "-"
                     count_suffix = f"（共 {len(group)} 筆）" if len(group) > 1 else ""
                     addr_display = address or "N/A"
                     chain_display = best_signal.token.chain or "unknown"
-                    lines.append(
+                    emit(
                         f"- {symbol} ({addr_display}) [chain: {chain_display}] score={best_signal.score:.2f}"
                         f" reasons={reason_str}{count_suffix}"
                     )
-                    top_wallets = _collect_top_wallets(group)
                     if top_wallets:
-                        lines.append(f"  Top wallets: {', '.join(top_wallets)}")
+                        emit(f"  Top wallets: {', '.join(top_wallets)}")
                     history_entries.append(
-                        {
-                            "section": section_title,
-                            "token_symbol": symbol,
-                            "token_address": address,
-                            "chain": chain_display,
-                            "score": best_signal.score,
-                            "reasons": sorted(reason_codes),
-                            "count": len(group),
-                            "top_wallets": top_wallets,
-                            "generated_at": timestamp_text,
-                            "generated_at_local": timestamp_local_text,
-                        }
+                        HistoryEntry(
+                            section=section_title,
+                            token_symbol=symbol,
+                            token_address=address,
+                            chain=chain_display,
+                            score=best_signal.score,
+                            reasons=reason_codes,
+                            count=len(group),
+                            top_wallets=top_wallets,
+                        )
                     )
-                lines.append("")
+                emit()
 
             if buy_groups:
                 _render("建議買入", buy_groups)
@@ -526,17 +610,17 @@ class CollectorPipeline:
                 _render("建議賣出", sell_groups)
 
         if token_overview:
-            lines.append("## 市場熱度對照")
-            lines.append("")
+            emit("## 市場熱度對照")
+            emit()
             for entry in token_overview:
-                market = entry.get("market", {})
-                smart = entry.get("smart_money", {})
-                lines.append(
-                    f"- {entry.get('token_symbol')} ({entry.get('token_address')}) [chain: {entry.get('chain')}] "
+                market = entry.market
+                smart = entry.smart_money
+                emit(
+                    f"- {entry.token_symbol} ({entry.token_address}) [chain: {entry.chain}] "
                     f"volume={market.get('volume')} netflow={market.get('netflow')} price_change={market.get('price_change')}"
                 )
                 if smart:
-                    lines.append(
+                    emit(
                         f"  Smart money trades={smart.get('event_count')} "
                         f"total_usd={smart.get('total_usd_notional')} netflow={smart.get('netflow_summary')}"
                     )
@@ -544,87 +628,104 @@ class CollectorPipeline:
                 if pools:
                     first_pool = pools[0]
                     trade_stats = first_pool.get("trade_stats") or {}
-                    lines.append(
+                    emit(
                         f"  Pool {first_pool.get('pool_address')} trades={trade_stats.get('trade_count', 0)} "
                         f"volume_usd={trade_stats.get('total_volume_usd')} max_trade={trade_stats.get('max_trade_volume_usd')}"
                     )
-            lines.append("")
+            emit()
 
         if trade_candidates:
             top_with = trade_candidates.get("with_smart_money") or []
             top_without = trade_candidates.get("without_smart_money") or []
             if top_with or top_without:
-                lines.append("## 策略候選清單")
-                lines.append("")
+                emit("## 策略候選清單")
+                emit()
                 if top_with:
-                    lines.append("### 有智慧錢包支持")
-                    lines.append("")
+                    emit("### 有智慧錢包支持")
+                    emit()
                     for item in top_with[:5]:
-                        lines.append(
+                        emit(
                             f"- {item['token_symbol']} ({item['token_address']}) [chain: {item['chain']}] "
                             f"score={item['composite_score']} market={item.get('market_score')} smart={item.get('smart_money_score')}"
                         )
-                    lines.append("")
+                    emit()
                 if top_without:
-                    lines.append("### 無智慧錢包紀錄")
-                    lines.append("")
+                    emit("### 無智慧錢包紀錄")
+                    emit()
                     for item in top_without[:5]:
-                        lines.append(
+                        emit(
                             f"- {item['token_symbol']} ({item['token_address']}) [chain: {item['chain']}] "
                             f"score={item['composite_score']} market={item.get('market_score')}"
                         )
-                    lines.append("")
+                    emit()
 
-        markdown_content = "\n".join(lines)
-        report_path.write_text(markdown_content, encoding="utf-8")
+        markdown_content = buffer.getvalue()
 
-        history_dir = report_dir / "history"
-        history_dir.mkdir(exist_ok=True)
+        history_dir = self._HISTORY_DIR
         history_filename = run_time.strftime("phase1_%Y%m%dT%H%M%SZ")
-        (history_dir / f"{history_filename}.md").write_text(markdown_content, encoding="utf-8")
-
-        (history_dir / f"{history_filename}.json").write_text(
-            json.dumps(history_entries, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        history_report_path = history_dir / f"{history_filename}.md"
+        history_report_path.write_text(markdown_content, encoding="utf-8")
+        self._link_latest(history_report_path, report_path)
+
+        (history_dir / f"{history_filename}.json").write_bytes(
+            orjson.dumps(
+                {
+                    "run": {
+                        "generated_at": timestamp_text,
+                        "generated_at_local": timestamp_local_text,
+                    },
+                    "entries": history_entries,
+                },
+                option=_JSON_DUMP_OPTIONS,
+            )
         )
         return report_path, history_entries
 
-    def _write_token_overview(self, overview: Sequence[dict], run_time: datetime) -> Path | None:
+    @staticmethod
+    def _link_latest(source: Path, latest: Path) -> None:
+        """讓 latest 指向剛寫好的檔案，以硬連結取代重複寫入。
+
+        先建立暫存連結再以 os.replace 置換，latest 永遠是新的 inode，
+        下次覆寫時不會連帶改到舊的歷史檔。
+        """
+
+        staging = latest.with_name(f".{latest.name}.tmp")
+        staging.unlink(missing_ok=True)
+        try:
+            os.link(source, staging)
+        except OSError:
+            shutil.copyfile(source, staging)
+        os.replace(staging, latest)
+
+    def _write_token_overview(self, overview: Sequence[OverviewRow], run_time: datetime) -> Path | None:
         if not overview:
             return None
-        report_dir = Path("reports")
-        report_dir.mkdir(exist_ok=True)
-        path = report_dir / "token_overview_latest.json"
+        path = self._REPORT_DIR / "token_overview_latest.json"
         payload = {
             "generated_at": run_time.isoformat(),
             "data": overview,
         }
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        path.write_bytes(orjson.dumps(payload, option=_JSON_DUMP_OPTIONS))
         return path
 
     def _write_trade_candidates(self, candidates: dict | None, run_time: datetime) -> Path | None:
         if not candidates:
             return None
-        report_dir = Path("reports")
-        report_dir.mkdir(exist_ok=True)
-        path = report_dir / "trade_candidates_latest.json"
+        path = self._REPORT_DIR / "trade_candidates_latest.json"
         payload = {
             "generated_at": run_time.isoformat(),
             "with_smart_money": candidates.get("with_smart_money", []),
             "without_smart_money": candidates.get("without_smart_money", []),
             "all": candidates.get("all", []),
         }
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        path.write_bytes(orjson.dumps(payload, option=_JSON_DUMP_OPTIONS))
         return path
 
     def _dump_raw_events(self, events: Sequence[Event]) -> Path:
         """將合併後的事件寫入 JSON，方便除錯檢視。"""
 
-        report_dir = Path("reports")
-        report_dir.mkdir(exist_ok=True)
-        target_path = report_dir / "phase1_raw_events.json"
-        data = [event.model_dump(mode="json") for event in events]
-        target_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        target_path = self._REPORT_DIR / "phase1_raw_events.json"
+        target_path.write_bytes(_EVENT_LIST_ADAPTER.dump_json(list(events), indent=2))
         return target_path
 
     @staticmethod
@@ -654,8 +755,6 @@ class CollectorPipeline:
         except OSError:
             return "\n".join(lines)
 
-        address_pattern = re.compile(r"0x[a-fA-F0-9]{6,}")
-
         def _format_float(value: str) -> str:
             try:
                 number = float(value)
@@ -665,22 +764,22 @@ class CollectorPipeline:
 
         def _shorten_line(line: str) -> str:
             lines_out: List[str] = []
-            address_line = address_pattern.search(line)
+            # 多數行沒有地址，先用 str 搜尋排除，省去 regex 比對。
+            matched = _LINE_PATTERN.match(line) if "0x" in line else None
 
             prefix = line
             address_text: Optional[str] = None
             suffix = ""
             chain_value: Optional[str] = None
 
-            if address_line:
-                start, end = address_line.span()
-                address_text = address_line.group(0)
-                prefix = line[:start].strip()
-                suffix = line[end:].strip()
-                chain_match = re.search(r"\[chain:\s*([^\]]+)\]", suffix, re.IGNORECASE)
-                if chain_match:
-                    chain_value = chain_match.group(1).strip()
-                    suffix = re.sub(r"\[chain:[^\]]+\]", "", suffix).strip()
+            if matched:
+                prefix, address_text, middle, chain_value, rest = matched.group(
+                    "prefix", "addr", "middle", "chain", "suffix"
+                )
+                prefix = prefix.strip()
+                suffix = f"{middle} {rest}".strip()
+                if chain_value:
+                    chain_value = chain_value.strip()
 
             def _format_segment(segment: str) -> str:
                 parts = segment.split()
@@ -1,92 +1,300 @@
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime
+from typing import Any, List, Sequence
 
 from ..config.settings import AppSettings
 from ..core.errors import ScoringError
 from ..core.types import Event, Signal, SignalReason
 from ..core.utils import utc_now
 
+try:  # numpy / numba 為選用相依套件，未安裝時退回純 Python 計算
+    import numpy as np
+except ImportError:  # pragma: no cover - 依執行環境而定
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - 依執行環境而定
+    njit = None
+
+_NUMPY_AVAILABLE = np is not None
+_NUMBA_AVAILABLE = _NUMPY_AVAILABLE and njit is not None
+
+# 事件數量達此門檻才改用陣列版本（numba JIT 或 NumPy 向量化），
+# 避免少量事件時編譯與陣列轉換成本高於計算本身。
+_JIT_MIN_BATCH = 512
+
+_REASON_SMART_BUY = 1 << 0
+_REASON_LABEL = 1 << 1
+_REASON_ALPHA = 1 << 2
+_REASON_VOL_JUMP = 1 << 3
+_REASON_NETFLOW_BUY = 1 << 4
+_REASON_NETFLOW_SELL = 1 << 5
+_REASON_PENALTY_EXPLOSIVE = 1 << 6
+_REASON_PENALTY_LIQ = 1 << 7
+
+# 理由內容與事件無關，預先建立不可變實例供所有訊號共用。
+_REASONS = (
+    (_REASON_SMART_BUY, SignalReason(code="smart_buy", message="高金額聰明資金買入")),
+    (_REASON_LABEL, SignalReason(code="label", message="錢包具 Smart Money 標籤")),
+    (_REASON_ALPHA, SignalReason(code="alpha", message="錢包歷史命中率佳")),
+    (_REASON_VOL_JUMP, SignalReason(code="vol_jump", message="交易量異常放大")),
+    (_REASON_NETFLOW_BUY, SignalReason(code="netflow_buy", message="聰明資金淨流入")),
+    (_REASON_NETFLOW_SELL, SignalReason(code="netflow_sell", message="聰明資金淨流出")),
+    (_REASON_PENALTY_EXPLOSIVE, SignalReason(code="penalty_explosive", message="價格波動過大")),
+    (_REASON_PENALTY_LIQ, SignalReason(code="penalty_liq", message="流動性不足")),
+)
+
+
+def _score_kernel(
+    usd,
+    has_label,
+    alpha,
+    volume_jump,
+    netflow,
+    liquidity,
+    scores,
+    masks,
+    weight_usd,
+    weight_label,
+    weight_alpha,
+    weight_volz,
+    weight_bias,
+    penalty_explosive,
+    penalty_low_liq,
+    usd_scale,
+    volume_scale,
+    explosive_threshold,
+    liquidity_min,
+):
+    """逐筆計算分數與理由位元遮罩，結果寫入 scores / masks。"""
+
+    for index in range(len(usd)):
+        score = 0.0
+        mask = 0
+
+        usd_value = usd[index]
+        score += weight_usd * min(usd_value / usd_scale, 2.0)
+        if usd_value != 0.0:
+            mask |= _REASON_SMART_BUY
+
+        if has_label[index]:
+            score += weight_label
+            mask |= _REASON_LABEL
+
+        alpha_value = alpha[index]
+        if alpha_value != 0.0:
+            score += weight_alpha * alpha_value
+            mask |= _REASON_ALPHA
+
+        jump = volume_jump[index]
+        score += weight_volz * min(jump / volume_scale, 2.0)
+        if jump != 0.0:
+            mask |= _REASON_VOL_JUMP
+
+        # 淨流入與淨流出加同樣的 bias，只差在理由位元。
+        flow = netflow[index]
+        is_outflow = flow < 0.0
+        if is_outflow or flow > 0.0:
+            score += weight_bias
+            mask |= _REASON_NETFLOW_SELL if is_outflow else _REASON_NETFLOW_BUY
+
+        if jump > explosive_threshold:
+            score -= penalty_explosive
+            mask |= _REASON_PENALTY_EXPLOSIVE
+
+        if liquidity[index] < liquidity_min:
+            score -= penalty_low_liq
+            mask |= _REASON_PENALTY_LIQ
+
+        scores[index] = max(score, 0.0)
+        masks[index] = mask
+
+
+_score_kernel_jit = njit(cache=True)(_score_kernel) if _NUMBA_AVAILABLE else None
+
+
+def _score_vectorized(
+    usd,
+    has_label,
+    alpha,
+    volume_jump,
+    netflow,
+    liquidity,
+    scores,
+    masks,
+    weight_usd,
+    weight_label,
+    weight_alpha,
+    weight_volz,
+    weight_bias,
+    penalty_explosive,
+    penalty_low_liq,
+    usd_scale,
+    volume_scale,
+    explosive_threshold,
+    liquidity_min,
+):
+    """與 _score_kernel 相同規則的 NumPy 版本，加總順序一致以維持相同結果。"""
+
+    has_alpha = alpha != 0.0
+    has_flow = (netflow > 0.0) | (netflow < 0.0)
+    explosive = volume_jump > explosive_threshold
+    low_liquidity = liquidity < liquidity_min
+
+    score = 0.0 + weight_usd * np.minimum(usd / usd_scale, 2.0)
+    score = score + np.where(has_label != 0.0, weight_label, 0.0)
+    score = score + np.where(has_alpha, weight_alpha * alpha, 0.0)
+    score = score + weight_volz * np.minimum(volume_jump / volume_scale, 2.0)
+    score = score + np.where(has_flow, weight_bias, 0.0)
+    score = score - np.where(explosive, penalty_explosive, 0.0)
+    score = score - np.where(low_liquidity, penalty_low_liq, 0.0)
+    np.maximum(score, 0.0, out=scores)
+
+    masks[:] = (
+        np.where(usd != 0.0, _REASON_SMART_BUY, 0)
+        | np.where(has_label != 0.0, _REASON_LABEL, 0)
+        | np.where(has_alpha, _REASON_ALPHA, 0)
+        | np.where(volume_jump != 0.0, _REASON_VOL_JUMP, 0)
+        | np.where(netflow > 0.0, _REASON_NETFLOW_BUY, 0)
+        | np.where(netflow < 0.0, _REASON_NETFLOW_SELL, 0)
+        | np.where(explosive, _REASON_PENALTY_EXPLOSIVE, 0)
+        | np.where(low_liquidity, _REASON_PENALTY_LIQ, 0)
+    )
+
 
 class SignalScorer:
     """依照 Phase-1 規則產生訊號分數。"""
 
     def __init__(self, settings: AppSettings) -> None:
         self._settings = settings
+        # 設定值在執行期間不變，建構時轉成純 float，計分時不再經過 pydantic 屬性存取。
+        self._w_usd = float(settings.weight_usd)
+        self._w_label = float(settings.weight_label)
+        self._w_alpha = float(settings.weight_alpha)
+        self._w_volz = float(settings.weight_volz)
+        self._w_bias = float(settings.weight_bias)
+        self._pen_exp = float(settings.penalty_explosive)
+        self._pen_liq = float(settings.penalty_low_liq)
+        self._min_usd = max(float(settings.min_usd_notional), 1.0)
+        self._volz = max(float(settings.volume_z_th_1h), 1.0)
+        self._volz_explosive = float(settings.volume_z_th_1h) * 3
+        self._liq_min = float(settings.liquidity_min_score)
 
-    def score(self, event: Event) -> Signal:
+    def score(self, event: Event, generated_at: datetime | None = None) -> Signal:
         """將事件轉換為訊號。"""
 
-        if event.wallet is None:
-            raise ScoringError("缺少錢包資訊，無法建立訊號")
+        return self.score_batch([event], generated_at=generated_at)[0]
 
-        reasons: List[SignalReason] = []
-        score = 0.0
-        is_buy_signal = False
-        is_sell_signal = False
-
-        usd_value = event.features.usd_notional or 0.0
-        score += self._settings.weight_usd * self._scale_usd(usd_value)
-        if usd_value:
-            is_buy_signal = True
-            reasons.append(SignalReason(code="smart_buy", message="高金額聰明資金買入"))
-
-        if event.wallet.labels:
-            score += self._settings.weight_label
-            reasons.append(SignalReason(code="label", message="錢包具 Smart Money 標籤"))
-
-        if event.wallet.alpha_score:
-            score += self._settings.weight_alpha * event.wallet.alpha_score
-            reasons.append(SignalReason(code="alpha", message="錢包歷史命中率佳"))
-
-        volume_jump = event.features.volume_jump or 0.0
-        score += self._settings.weight_volz * self._scale_volume(volume_jump)
-        if volume_jump:
-            reasons.append(SignalReason(code="vol_jump", message="交易量異常放大"))
-
-        netflow = event.features.smart_money_netflow or 0.0
-        if netflow > 0:
-            score += self._settings.weight_bias
-            is_buy_signal = True
-            reasons.append(SignalReason(code="netflow_buy", message="聰明資金淨流入"))
-        elif netflow < 0:
-            score += self._settings.weight_bias
-            is_sell_signal = True
-            reasons.append(SignalReason(code="netflow_sell", message="聰明資金淨流出"))
-
-        if self._is_explosive(event):
-            score -= self._settings.penalty_explosive
-            reasons.append(SignalReason(code="penalty_explosive", message="價格波動過大"))
-
-        if self._is_low_liquidity(event):
-            score -= self._settings.penalty_low_liq
-            reasons.append(SignalReason(code="penalty_liq", message="流動性不足"))
+    def score_batch(
+        self,
+        events: Sequence[Event],
+        min_score: float | None = None,
+        generated_at: datetime | None = None,
+    ) -> List[Signal]:
+        """一次為多筆事件計算訊號，數值部分以欄位陣列批次處理。
+
+        指定 ``min_score`` 時，分數低於門檻的訊號不建立理由清單，只保留分數與方向。
+        同一批訊號共用 ``generated_at``（未指定時取一次目前時間）。
+        """
+
+        usd: List[float] = []
+        has_label: List[bool] = []
+        alpha: List[float] = []
+        volume_jump: List[float] = []
+        netflow: List[float] = []
+        liquidity: List[float] = []
+        # 單次走訪事件，巢狀模型各取一次再讀欄位。
+        for event in events:
+            wallet = event.wallet
+            if wallet is None:
+                raise ScoringError("缺少錢包資訊，無法建立訊號")
+            features = event.features
+            usd.append(features.usd_notional or 0.0)
+            has_label.append(bool(wallet.labels))
+            alpha.append(wallet.alpha_score or 0.0)
+            volume_jump.append(features.volume_jump or 0.0)
+            netflow.append(features.smart_money_netflow or 0.0)
+            liquidity.append(event.token.liquidity_score or 0.0)
+
+        count = len(usd)
+        if not count:
+            return []
+
+        columns: tuple[Any, ...] = (usd, has_label, alpha, volume_jump, netflow, liquidity)
+        if _NUMPY_AVAILABLE and count >= _JIT_MIN_BATCH:
+            columns = tuple(np.asarray(column, dtype=np.float64) for column in columns)
+            scores: Any = np.zeros(count, dtype=np.float64)
+            masks: Any = np.zeros(count, dtype=np.int64)
+            kernel = _score_kernel_jit if _NUMBA_AVAILABLE else _score_vectorized
+        else:
+            scores = [0.0] * count
+            masks = [0] * count
+            kernel = _score_kernel
+
+        kernel(
+            *columns,
+            scores,
+            masks,
+            self._w_usd,
+            self._w_label,
+            self._w_alpha,
+            self._w_volz,
+            self._w_bias,
+            self._pen_exp,
+            self._pen_liq,
+            self._min_usd,
+            self._volz,
+            self._volz_explosive,
+            self._liq_min,
+        )
+
+        generated_at = generated_at or utc_now()
+        return [
+            self._build_signal(
+                event,
+                float(score),
+                int(mask),
+                generated_at,
+                with_reasons=min_score is None or score >= min_score,
+            )
+            for event, score, mask in zip(events, scores, masks)
+        ]
+
+    @staticmethod
+    def _build_signal(
+        event: Event,
+        score: float,
+        mask: int,
+        generated_at: datetime,
+        with_reasons: bool = True,
+    ) -> Signal:
+        """由計分結果組出訊號。
+
+        以 ``model_construct`` 建構不做驗證，前提是 ``event`` 已經由 EventNormalizer
+        建立（token / wallet 皆為驗證過的模型），``score`` 為 float、理由為共用的
+        SignalReason 實例；呼叫端不可傳入未經驗證的資料。
+        """
+
+        reasons = (
+            [reason for bit, reason in _REASONS if mask & bit]
+            if with_reasons
+            else []
+        )
 
         signal_type = "buy"
-        if netflow < 0 and not is_buy_signal:
+        if mask & _REASON_NETFLOW_SELL and not mask & _REASON_SMART_BUY:
             signal_type = "sell"
 
-        metadata = {
-            "source_event": event.model_dump(mode="json"),
-            "signal_type": signal_type,
-        }
-        return Signal(
+        signal = Signal.model_construct(
             token=event.token,
             wallets=[event.wallet],
-            score=max(score, 0.0),
+            score=score,
             reasons=reasons,
-            generated_at=utc_now(),
-            metadata=metadata,
+            generated_at=generated_at,
+            metadata={"signal_type": signal_type},
         )
-
-    def _scale_usd(self, value: float) -> float:
-        return min(value / max(self._settings.min_usd_notional, 1), 2.0)
-
-    def _scale_volume(self, value: float) -> float:
-        return min(value / max(self._settings.volume_z_th_1h, 1.0), 2.0)
-
-    def _is_explosive(self, event: Event) -> bool:
-        return (event.features.volume_jump or 0) > (self._settings.volume_z_th_1h * 3)
-
-    def _is_low_liquidity(self, event: Event) -> bool:
-        return (event.token.liquidity_score or 0) < self._settings.liquidity_min_score
+        # 完整事件內容只在寫入 DB / 開倉紀錄時才需要，延後序列化。
+        signal.attach_source_event(event)
+        return signal
@@ -9,6 +9,41 @@ from pydantic import Field, HttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+@lru_cache(maxsize=32)
+def _split_csv(value: str) -> List[str]:
+    """將逗號分隔字串拆成去除空白、非空的清單；以原始字串為鍵快取，呼叫端不可修改結果。"""
+
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@lru_cache(maxsize=8)
+def _parse_token_pools(value: str) -> dict[str, dict[str, list[str]]]:
+    """解析 GeckoTerminal 代幣池 JSON；以原始字串為鍵快取，呼叫端不可修改結果。"""
+
+    try:
+        raw = json.loads(value)
+    except json.JSONDecodeError:
+        return {}
+    result: dict[str, dict[str, list[str]]] = {}
+    if not isinstance(raw, dict):
+        return result
+    for chain, tokens in raw.items():
+        if not isinstance(tokens, dict):
+            continue
+        normalized_chain = str(chain).lower()
+        result.setdefault(normalized_chain, {})
+        for token_address, pools in tokens.items():
+            addr = str(token_address).lower()
+            if isinstance(pools, list):
+                pool_list = [str(pool).lower() for pool in pools if pool]
+            elif isinstance(pools, str):
+                pool_list = [pools.lower()]
+            else:
+                continue
+            result[normalized_chain][addr] = pool_list
+    return result
+
+
 class AppSettings(BaseSettings):
     """應用程式環境設定。"""
 
@@ -86,46 +121,26 @@ class AppSettings(BaseSettings):
 
         return Path(f"phase{self.phase}.ok")
 
+    # 衍生值以原始字串為鍵快取解析結果，欄位被賦值或 model_copy(update=...) 後仍會重新解析。
     @property
     def chains(self) -> List[str]:
-        return [item.strip() for item in self.nansen_chains.split(",") if item.strip()]
+        return _split_csv(self.nansen_chains)
 
     @property
     def dex_include_labels(self) -> List[str]:
-        return [item.strip() for item in self.nansen_dex_include_labels.split(",") if item.strip()]
+        return _split_csv(self.nansen_dex_include_labels)
 
     @property
     def dex_exclude_labels(self) -> List[str]:
-        return [item.strip() for item in self.nansen_dex_exclude_labels.split(",") if item.strip()]
+        return _split_csv(self.nansen_dex_exclude_labels)
 
     @property
     def dashboard_chat_ids(self) -> List[str]:
-        return [item.strip() for item in self.telegram_dashboard_allowed_chat_ids.split(",") if item.strip()]
+        return _split_csv(self.telegram_dashboard_allowed_chat_ids)
 
     @property
     def gecko_terminal_token_pools_map(self) -> dict[str, dict[str, list[str]]]:
-        try:
-            raw = json.loads(self.gecko_terminal_token_pools)
-        except json.JSONDecodeError:
-            return {}
-        result: dict[str, dict[str, list[str]]] = {}
-        if not isinstance(raw, dict):
-            return result
-        for chain, tokens in raw.items():
-            if not isinstance(tokens, dict):
-                continue
-            normalized_chain = str(chain).lower()
-            result.setdefault(normalized_chain, {})
-            for token_address, pools in tokens.items():
-                addr = str(token_address).lower()
-                if isinstance(pools, list):
-                    pool_list = [str(pool).lower() for pool in pools if pool]
-                elif isinstance(pools, str):
-                    pool_list = [pools.lower()]
-                else:
-                    continue
-                result[normalized_chain][addr] = pool_list
-        return result
+        return _parse_token_pools(self.gecko_terminal_token_pools)
 
     @field_validator("nansen_dex_trade_max_usd", mode="before")
     @classmethod
@@ -137,8 +152,13 @@ class AppSettings(BaseSettings):
         return value
 
 
-@lru_cache(maxsize=1)
+_SETTINGS: AppSettings | None = None
+
+
 def get_settings() -> AppSettings:
     """載入並快取設定。"""
 
-    return AppSettings()
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = AppSettings()
+    return _SETTINGS
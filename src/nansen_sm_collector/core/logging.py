@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import logging
 
-import structlog
-
 
 def configure_logging(level: int = logging.INFO) -> None:
     """設定結構化日誌格式。"""
 
+    # structlog 只在實際設定日誌時才載入，未啟用結構化日誌的流程不必付出匯入成本。
+    import structlog
+
     logging.basicConfig(
         level=level,
         format="%(message)s",
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic_core import to_jsonable_python
 
 
 class Wallet(BaseModel):
@@ -46,10 +48,47 @@ class Event(BaseModel):
     occurred_at: datetime
     features: EventFeature = Field(default_factory=EventFeature)
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        """輸出與 ``model_dump(mode="json")`` 相同的 dict；欄位固定，直接組裝以省去通用序列化。"""
+
+        token = self.token
+        wallet = self.wallet
+        features = self.features
+        return {
+            "source": self.source,
+            "token": {
+                "address": token.address,
+                "symbol": token.symbol,
+                "chain": token.chain,
+                "liquidity_score": token.liquidity_score,
+                "blacklist_flags": list(token.blacklist_flags),
+            },
+            "wallet": None
+            if wallet is None
+            else {
+                "address": wallet.address,
+                "labels": list(wallet.labels),
+                "alpha_score": wallet.alpha_score,
+                "last_active_at": to_jsonable_python(wallet.last_active_at),
+            },
+            "tx_hash": self.tx_hash,
+            "chain": self.chain,
+            "occurred_at": to_jsonable_python(self.occurred_at),
+            "features": {
+                "usd_notional": features.usd_notional,
+                "volume_jump": features.volume_jump,
+                "smart_money_netflow": features.smart_money_netflow,
+                "is_buy": features.is_buy,
+                "metadata": to_jsonable_python(features.metadata, inf_nan_mode="null"),
+            },
+        }
+
 
 class SignalReason(BaseModel):
     """評分時產出的理由敘述。"""
 
+    model_config = ConfigDict(frozen=True)
+
     code: str
     message: str
 
@@ -64,8 +103,29 @@ class Signal(BaseModel):
     generated_at: datetime
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    _source_event: Optional[Event] = PrivateAttr(default=None)
+
+    def attach_source_event(self, event: Event) -> None:
+        """記錄產生此訊號的事件，序列化延後到真正需要時。"""
+
+        self._source_event = event
+
+    def source_event_payload(self) -> Dict[str, Any]:
+        """回傳來源事件的 JSON 相容 dict；首次呼叫才執行 model_dump 並快取。"""
+
+        payload = self.metadata.get("source_event")
+        if payload is None and self._source_event is not None:
+            payload = self._source_event.to_json_dict()
+            self.metadata["source_event"] = payload
+        return payload or {}
+
+    @cached_property
+    def reason_codes_str(self) -> str:
+        """以逗號串接的理由代碼；訊號建立後理由不再變動，首次計算後快取。"""
+
+        return ",".join([reason.code for reason in self.reasons])
+
     def summarize(self) -> str:
         """回傳單行摘要。"""
 
-        reason_codes = ",".join(reason.code for reason in self.reasons)
-        return f"{self.token.symbol} score={self.score:.2f} reasons={reason_codes}"
+        return f"{self.token.symbol} score={self.score:.2f} reasons={self.reason_codes_str}"
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable, Iterator, Sequence, TypeVar
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Sequence, TypeVar
 
 
 T = TypeVar("T")
@@ -13,23 +14,39 @@ def utc_now() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
-def chunked(sequence: Sequence[T], size: int) -> Iterator[Sequence[T]]:
-    """將序列切分為固定大小區塊。"""
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """將可疊代物件依序切分為固定大小區塊，支援 generator 串流輸入。"""
 
     if size <= 0:
         raise ValueError("size 必須為正整數")
-    for index in range(0, len(sequence), size):
-        yield sequence[index : index + size]
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
-def ensure_non_empty(iterable: Iterable[T], message: str) -> Iterable[T]:
-    """確認可疊代物件不為空。"""
+def ensure_non_empty(iterable: Iterable[T], message: str) -> Iterator[T]:
+    """確認可疊代物件不為空；呼叫時即檢查，之後直接串接原迭代器。"""
 
     iterator = iter(iterable)
     try:
         first = next(iterator)
     except StopIteration as exc:
         raise ValueError(message) from exc
-    yield first
-    for item in iterator:
-        yield item
+    return chain((first,), iterator)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """以線性內插計算分位數，與 SQL 的 percentile_cont 相同定義。"""
+
+    if not values:
+        return 0.0
+    if q <= 0:
+        return min(values)
+    if q >= 1:
+        return max(values)
+    sorted_vals = sorted(values)
+    rank = q * (len(sorted_vals) - 1)
+    lower_index = int(rank)
+    upper_index = min(lower_index + 1, len(sorted_vals) - 1)
+    weight = rank - lower_index
+    return sorted_vals[lower_index] * (1 - weight) + sorted_vals[upper_index] * weight
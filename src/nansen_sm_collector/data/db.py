@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Iterator
 
+import orjson
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
@@ -10,10 +12,34 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 Base = declarative_base()
 
 
+def json_serializer(value: Any) -> str:
+    """JSON 欄位序列化；orjson 不支援的內容（如超過 64 位元的整數）退回標準 json。"""
+
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        return json.dumps(value)
+
+
+def json_deserializer(value: str | bytes) -> Any:
+    """JSON 欄位反序列化；舊資料含 NaN 等 orjson 不接受的內容時退回標準 json。"""
+
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return json.loads(value)
+
+
 def create_db_engine(url: str, echo: bool = False) -> Engine:
-    """建立資料庫引擎。"""
+    """建立資料庫引擎，JSON 欄位改以 orjson 編解碼。"""
 
-    return create_engine(url, echo=echo, future=True)
+    return create_engine(
+        url,
+        echo=echo,
+        future=True,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
+    )
 
 
 def create_session_factory(engine: Engine) -> sessionmaker:
@@ -41,12 +67,21 @@ def upgrade_schema(engine: Engine) -> None:
     """確保資料表包含最新欄位（適用 SQLite）。"""
 
     with engine.begin() as connection:
+        # 每張表只查一次 PRAGMA table_info，欄位名稱快取成 set。
+        existing: dict[str, set[str]] = {}
+
+        def table_columns(table: str) -> set[str]:
+            if table not in existing:
+                result = connection.execute(text(f"PRAGMA table_info({table})"))
+                existing[table] = {row[1] for row in result}
+            return existing[table]
+
         def has_column(table: str, column: str) -> bool:
-            result = connection.execute(text(f"PRAGMA table_info({table})"))
-            return any(row[1] == column for row in result)
+            return column in table_columns(table)
 
         def add_column(table: str, definition: str) -> None:
             connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {definition}"))
+            table_columns(table).add(definition.split()[0])
 
         if not has_column("simulated_trades", "buy_time_local"):
             add_column("simulated_trades", "buy_time_local TIMESTAMP")
@@ -61,3 +96,22 @@ def upgrade_schema(engine: Engine) -> None:
 
         if not has_column("executed_trades", "integrator_fee_usdc"):
             add_column("executed_trades", "integrator_fee_usdc FLOAT")
+
+        # labels / blacklist_flags 由逗號分隔字串改存 JSON 陣列，舊資料一次性轉換。
+        for table, column in (("wallets", "labels"), ("tokens", "blacklist_flags")):
+            rows = connection.execute(
+                text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL AND {column} NOT LIKE '[%'")
+            ).all()
+            if rows:
+                connection.execute(
+                    text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+                    [
+                        {"id": row_id, "value": json.dumps([item for item in raw.split(",") if item])}
+                        for row_id, raw in rows
+                    ],
+                )
+
+        # create_all 不會替既有資料表補建索引，這裡逐一檢查後補上。
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
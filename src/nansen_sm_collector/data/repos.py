@@ -1,57 +1,235 @@
 from __future__ import annotations
 
+import csv
+import io
 from datetime import datetime
-from typing import Iterable, List, Optional, Sequence
+from typing import Any, Iterable, List, Mapping, Optional, Sequence
 
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import JSON, Table, bindparam, event, func, insert, lambda_stmt, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, selectinload
 
-from ..core.types import Event, Signal, Token, Wallet
-from ..core.utils import utc_now
+from ..core.types import Event, Signal, SignalReason, Token, Wallet
+from ..core.utils import chunked, percentile, utc_now
 from . import schemas
+from .db import json_serializer
+
+_MARKET_METRIC_FIELDS = (
+    "market_cap_usd",
+    "liquidity",
+    "price_usd",
+    "price_change",
+    "fdv",
+    "fdv_mc_ratio",
+    "buy_volume",
+    "sell_volume",
+    "volume",
+    "netflow",
+    "inflow_fdv_ratio",
+    "outflow_fdv_ratio",
+    "token_age_days",
+)
+# 支援 INSERT ... ON CONFLICT DO UPDATE 的方言。
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+# 每批筆數，避免超過 SQLite 的參數上限。
+_UPSERT_CHUNK_SIZE = 500
+# PostgreSQL 上筆數超過此值改用 COPY 匯入。
+_COPY_MIN_ROWS = 100
+_COPY_NULL = r"\N"
+# 讀取歷史金額時每批取回的資料列數。
+_HISTORY_BATCH_SIZE = 1000
+# 一次序列化整個理由清單，省去逐筆呼叫 model_dump。
+_REASONS_ADAPTER = TypeAdapter(List[SignalReason])
+# session.info 中存放 repository 查詢快取的鍵。
+_IDENTITY_CACHE_KEY = "repo_identity_cache"
+
+# 固定結構的查詢在模組載入時建立一次，參數以 bindparam 於執行時帶入。
+_STMT_TOKENS_BY_KEYS = select(schemas.TokenModel).where(
+    tuple_(schemas.TokenModel.symbol, schemas.TokenModel.chain).in_(bindparam("keys", expanding=True))
+)
+_STMT_WALLETS_BY_ADDRESS = select(schemas.WalletModel).where(
+    schemas.WalletModel.address.in_(bindparam("addresses", expanding=True))
+)
+_STMT_USD_NOTIONAL_HISTORY = (
+    select(schemas.EventModel.features["usd_notional"])
+    .join(schemas.TokenModel)
+    .where(schemas.TokenModel.symbol == bindparam("symbol"))
+    .where(schemas.EventModel.occurred_at >= bindparam("since"))
+)
+_STMT_USD_NOTIONAL_HISTORY_BY_CHAIN = _STMT_USD_NOTIONAL_HISTORY.where(
+    schemas.TokenModel.chain == bindparam("chain")
+)
+_STMT_MARKET_METRIC_BY_KEY = select(schemas.TokenMarketMetricModel).where(
+    schemas.TokenMarketMetricModel.chain == bindparam("chain"),
+    schemas.TokenMarketMetricModel.token_address == bindparam("token_address"),
+)
+
+
+def _copy_value(value: Any, is_json: bool) -> Any:
+    if is_json:
+        # 與引擎設定的序列化器一致（NaN / Infinity 寫成 null），PostgreSQL JSONB 才能接受。
+        return json_serializer(value)
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _clear_identity_cache(session: Session, previous_transaction: Any) -> None:
+    for cache in session.info.get(_IDENTITY_CACHE_KEY, {}).values():
+        cache.clear()
 
 
 class BaseRepository:
-    """封裝共同的 Session 行為。"""
+    """封裝共同的 Session 行為。
+
+    高頻查詢以 ``lambda_stmt`` 撰寫，SQLAlchemy 依 lambda 的程式位置快取語句結構，
+    重複呼叫時不必重新建構與計算快取鍵，只替換綁定參數。
+    """
 
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def _identity_cache(self, model: type[schemas.Base]) -> dict[Any, Any]:
+        """取得同一 Session 共用的模型查詢快取（存於 ``session.info``）。
+
+        多個 repository 實例共用同一份快取；交易 rollback 時清空，
+        避免留下已不存在於資料庫的新建物件。
+        """
+
+        caches = self.session.info.get(_IDENTITY_CACHE_KEY)
+        if caches is None:
+            caches = self.session.info[_IDENTITY_CACHE_KEY] = {}
+            event.listen(self.session, "after_soft_rollback", _clear_identity_cache)
+        return caches.setdefault(model, {})
+
+    def _bulk_insert_rows(self, model: type[schemas.Base], rows: List[dict[str, Any]]) -> None:
+        """批次寫入不需 ORM 追蹤的資料列；PostgreSQL 大量資料走 COPY。"""
+
+        if not rows:
+            return
+        # 兩條路徑都繞過 ORM，先送出待寫入物件（如本次 run）以滿足外鍵。
+        self.session.flush()
+        table = model.__table__
+        if len(rows) >= _COPY_MIN_ROWS and self.session.get_bind().dialect.name == "postgresql":
+            if self._copy_rows(table, rows):
+                return
+        # 直接對 Table 做 Core executemany，省去 ORM bulk insert 的逐列處理。
+        self.session.execute(insert(table), rows)
+
+    def _copy_rows(self, table: Table, rows: List[dict[str, Any]]) -> bool:
+        """以 COPY FROM STDIN 匯入；驅動不支援 copy_expert（psycopg2 以外）時回傳 False。"""
+
+        dbapi_connection = self.session.connection().connection.dbapi_connection
+        cursor = dbapi_connection.cursor()
+        try:
+            copy_expert = getattr(cursor, "copy_expert", None)
+            if copy_expert is None:
+                return False
+            columns = list(rows[0])
+            json_flags = [isinstance(table.c[name].type, JSON) for name in columns]
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(
+                    [_copy_value(row[name], is_json) for name, is_json in zip(columns, json_flags)]
+                )
+            buffer.seek(0)
+            copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN "
+                f"WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                buffer,
+            )
+            return True
+        finally:
+            cursor.close()
+
 
 class TokenRepository(BaseRepository):
-    """代幣資料存取。"""
+    """代幣資料存取。
+
+    以 (symbol, chain) 為鍵在 Session 內保留已查詢 / 建立的模型，
+    同一個 Session 內重複 upsert 同一代幣不再逐筆查詢。
+    """
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+        self._cache: dict[tuple[str, str], Optional[schemas.TokenModel]] = self._identity_cache(schemas.TokenModel)
+
+    def prefetch(self, pairs: Iterable[tuple[str, Optional[str]]]) -> None:
+        """以單一 IN 查詢預先載入多個 (symbol, chain)，未指定 chain 者略過。"""
+
+        keys = {(symbol, chain) for symbol, chain in pairs if chain and (symbol, chain) not in self._cache}
+        if not keys:
+            return
+        for chunk in chunked(sorted(keys), _UPSERT_CHUNK_SIZE):
+            for model in self.session.execute(_STMT_TOKENS_BY_KEYS, {"keys": chunk}).scalars():
+                self._cache[(model.symbol, model.chain)] = model
+        for key in keys:
+            self._cache.setdefault(key, None)
 
     def get_by_symbol(self, symbol: str, chain: Optional[str] = None) -> Optional[schemas.TokenModel]:
-        query = self.session.query(schemas.TokenModel).filter_by(symbol=symbol)
+        if chain and (symbol, chain) in self._cache:
+            return self._cache[(symbol, chain)]
+        stmt = lambda_stmt(lambda: select(schemas.TokenModel).where(schemas.TokenModel.symbol == symbol))
         if chain:
-            query = query.filter_by(chain=chain)
-        return query.one_or_none()
+            stmt += lambda s: s.where(schemas.TokenModel.chain == chain)
+        model = self.session.execute(stmt).scalar_one_or_none()
+        if chain:
+            self._cache[(symbol, chain)] = model
+        return model
 
     def upsert(self, token: Token) -> schemas.TokenModel:
         model = self.get_by_symbol(token.symbol, token.chain)
         if model is None:
             model = schemas.TokenModel(symbol=token.symbol, chain=token.chain)
+            if token.chain:
+                self._cache[(token.symbol, token.chain)] = model
         model.address = token.address
         model.liquidity_score = token.liquidity_score
-        model.blacklist_flags = ",".join(token.blacklist_flags)
+        model.blacklist_flags = list(token.blacklist_flags)
         self.session.add(model)
         return model
 
 
 class WalletRepository(BaseRepository):
-    """錢包資料存取。"""
+    """錢包資料存取，以地址為鍵快取同一 Session 內的模型。"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+        self._cache: dict[str, Optional[schemas.WalletModel]] = self._identity_cache(schemas.WalletModel)
+
+    def prefetch(self, addresses: Iterable[str]) -> None:
+        """以單一 IN 查詢預先載入多個錢包。"""
+
+        keys = {address for address in addresses if address not in self._cache}
+        if not keys:
+            return
+        for chunk in chunked(sorted(keys), _UPSERT_CHUNK_SIZE):
+            for model in self.session.execute(_STMT_WALLETS_BY_ADDRESS, {"addresses": chunk}).scalars():
+                self._cache[model.address] = model
+        for key in keys:
+            self._cache.setdefault(key, None)
 
     def get_by_address(self, address: str) -> Optional[schemas.WalletModel]:
-        return (
-            self.session.query(schemas.WalletModel)
-            .filter(schemas.WalletModel.address == address)
-            .one_or_none()
-        )
+        if address in self._cache:
+            return self._cache[address]
+        stmt = lambda_stmt(lambda: select(schemas.WalletModel).where(schemas.WalletModel.address == address))
+        model = self.session.execute(stmt).scalar_one_or_none()
+        self._cache[address] = model
+        return model
 
     def upsert(self, wallet: Wallet) -> schemas.WalletModel:
         model = self.get_by_address(wallet.address)
         if model is None:
             model = schemas.WalletModel(address=wallet.address)
-        model.labels = ",".join(wallet.labels)
+            self._cache[wallet.address] = model
+        model.labels = list(wallet.labels)
         model.alpha_score = wallet.alpha_score
         model.last_active_at = wallet.last_active_at
         self.session.add(model)
@@ -80,25 +258,49 @@ class EventRepository(BaseRepository):
         chain: Optional[str],
         since: datetime,
     ) -> List[float]:
-        query = (
-            self.session.query(schemas.EventModel)
+        # 只在 SQL 端取出 features.usd_notional，不必為每筆事件建立完整 ORM 物件。
+        params: dict[str, Any] = {"symbol": token_symbol, "since": since}
+        stmt = _STMT_USD_NOTIONAL_HISTORY
+        if chain:
+            stmt = _STMT_USD_NOTIONAL_HISTORY_BY_CHAIN
+            params["chain"] = chain
+        # 以 yield_per 分批讀取，驅動程式端同時只保留一批資料列。
+        result = self.session.execute(stmt, params, execution_options={"yield_per": _HISTORY_BATCH_SIZE})
+        # features 由 EventFeature.model_dump() 寫入，usd_notional 只會是數值或 null；
+        # 非數值一律略過，不再逐筆 try/except。
+        return [float(value) for value in result.scalars() if isinstance(value, (int, float))]
+
+    def get_usd_notional_stats(
+        self,
+        token_symbol: str,
+        chain: Optional[str],
+        since: datetime,
+        quantile: float,
+    ) -> dict[str, float]:
+        """回傳期間內 usd_notional 的樣本數與分位數。
+
+        PostgreSQL 直接以 percentile_cont 在 DB 端彙總，只傳回一列；
+        其他資料庫（如 SQLite）沒有對應函式，退回取出數值後在 Python 計算。
+        """
+
+        if self.session.get_bind().dialect.name != "postgresql":
+            history = self.get_usd_notional_history(token_symbol, chain, since)
+            return {"count": len(history), "percentile": percentile(history, quantile)}
+
+        value = schemas.EventModel.features["usd_notional"].as_float()
+        stmt = (
+            select(
+                func.count(value),
+                func.percentile_cont(min(max(quantile, 0.0), 1.0)).within_group(value),
+            )
             .join(schemas.TokenModel)
-            .filter(schemas.TokenModel.symbol == token_symbol)
-            .filter(schemas.EventModel.occurred_at >= since)
+            .where(schemas.TokenModel.symbol == token_symbol)
+            .where(schemas.EventModel.occurred_at >= since)
         )
         if chain:
-            query = query.filter(schemas.TokenModel.chain == chain)
-        events = query.all()
-        values: List[float] = []
-        for event in events:
-            usd_notional = event.features.get("usd_notional") if event.features else None
-            if usd_notional is None:
-                continue
-            try:
-                values.append(float(usd_notional))
-            except (TypeError, ValueError):
-                continue
-        return values
+            stmt = stmt.where(schemas.TokenModel.chain == chain)
+        count, threshold = self.session.execute(stmt).one()
+        return {"count": count, "percentile": float(threshold or 0.0)}
 
 
 class SignalRepository(BaseRepository):
@@ -113,35 +315,39 @@ class SignalRepository(BaseRepository):
         model = schemas.SignalModel(
             token=token_model,
             score=signal.score,
-            reasons=[reason.model_dump() for reason in signal.reasons],
+            reasons=_REASONS_ADAPTER.dump_python(signal.reasons),
             generated_at=signal.generated_at,
-            context=signal.metadata,
+            context={"source_event": signal.source_event_payload(), **signal.metadata},
         )
         model.wallets = list(wallet_models)
         self.session.add(model)
         return model
 
     def top_signals(self, limit: int = 10) -> List[schemas.SignalModel]:
-        return (
-            self.session.query(schemas.SignalModel)
+        # 呼叫端通常會讀取代幣與錢包，一次以 selectin 載入，避免逐筆 lazy load。
+        stmt = lambda_stmt(
+            lambda: select(schemas.SignalModel)
+            .options(selectinload(schemas.SignalModel.token), selectinload(schemas.SignalModel.wallets))
             .order_by(schemas.SignalModel.score.desc())
             .limit(limit)
-            .all()
         )
+        return list(self.session.execute(stmt).scalars())
 
 
 class SimulatedTradeRepository(BaseRepository):
     """管理模擬交易資料。"""
 
     def get_open_trade(self, token_address: str, chain: Optional[str]) -> Optional[schemas.SimulatedTradeModel]:
-        query = (
-            self.session.query(schemas.SimulatedTradeModel)
-            .filter(schemas.SimulatedTradeModel.token_address == token_address.lower())
-            .filter(schemas.SimulatedTradeModel.status == "OPEN")
+        """``token_address`` 需為小寫；create_trade 一律以小寫寫入，查詢時不再轉換。"""
+
+        stmt = lambda_stmt(
+            lambda: select(schemas.SimulatedTradeModel)
+            .where(schemas.SimulatedTradeModel.token_address == token_address)
+            .where(schemas.SimulatedTradeModel.status == "OPEN")
         )
         if chain:
-            query = query.filter(schemas.SimulatedTradeModel.chain == chain)
-        return query.one_or_none()
+            stmt += lambda s: s.where(schemas.SimulatedTradeModel.chain == chain)
+        return self.session.execute(stmt).scalar_one_or_none()
 
     def create_trade(
         self,
@@ -154,25 +360,25 @@ class SimulatedTradeRepository(BaseRepository):
         buy_time: Optional[datetime] = None,
         buy_time_local: Optional[datetime] = None,
     ) -> schemas.SimulatedTradeModel:
+        buy_time = buy_time or utc_now()
         model = schemas.SimulatedTradeModel(
             token_address=token_address.lower(),
             token_symbol=token_symbol,
             chain=chain,
             buy_price=buy_price,
             target_price=target_price,
-            buy_time=buy_time or utc_now(),
-            buy_time_local=buy_time_local or utc_now(),
+            buy_time=buy_time,
+            buy_time_local=buy_time_local or buy_time,
             extra=metadata or {},
         )
         self.session.add(model)
         return model
 
     def list_open_trades(self) -> List[schemas.SimulatedTradeModel]:
-        return (
-            self.session.query(schemas.SimulatedTradeModel)
-            .filter(schemas.SimulatedTradeModel.status == "OPEN")
-            .all()
+        stmt = lambda_stmt(
+            lambda: select(schemas.SimulatedTradeModel).where(schemas.SimulatedTradeModel.status == "OPEN")
         )
+        return list(self.session.execute(stmt).scalars())
 
     def close_trade(
         self,
@@ -184,7 +390,7 @@ class SimulatedTradeRepository(BaseRepository):
         trade.status = "CLOSED"
         trade.sell_price = sell_price
         trade.sell_time = sell_time or utc_now()
-        trade.sell_time_local = sell_time_local or utc_now()
+        trade.sell_time_local = sell_time_local or trade.sell_time
 
 
 class ExecutedTradeRepository(BaseRepository):
@@ -219,7 +425,11 @@ class ExecutedTradeRepository(BaseRepository):
         transaction_payload: Optional[dict] = None,
         executed_at: Optional[datetime] = None,
         executed_at_local: Optional[datetime] = None,
+        flush: bool = False,
     ) -> schemas.ExecutedTradeModel:
+        """建立交易紀錄；需要立即取得 ``id`` 時傳入 ``flush=True``，否則隨交易提交一併寫入。"""
+
+        executed_at = executed_at or utc_now()
         model = schemas.ExecutedTradeModel(
             mode=mode,
             status=status,
@@ -245,13 +455,26 @@ class ExecutedTradeRepository(BaseRepository):
             price_response=price_response,
             quote_response=quote_response,
             transaction_payload=transaction_payload,
-            executed_at=executed_at or utc_now(),
-            executed_at_local=executed_at_local or utc_now(),
+            executed_at=executed_at,
+            executed_at_local=executed_at_local or executed_at,
         )
         self.session.add(model)
-        self.session.flush()
+        if flush:
+            self.session.flush()
         return model
 
+    def insert_record(self, **values: Any) -> int:
+        """寫入建立後不再更新的交易紀錄（例如模擬交易）並回傳 ``id``；欄位同 ``create_record``。
+
+        不建立 ORM 物件，以單一 Core INSERT ... RETURNING 寫入。
+        """
+
+        executed_at = values.get("executed_at") or utc_now()
+        values["executed_at"] = executed_at
+        values["executed_at_local"] = values.get("executed_at_local") or executed_at
+        table = schemas.ExecutedTradeModel.__table__
+        return self.session.execute(insert(table).values(**values).returning(table.c.id)).scalar_one()
+
     def get_by_id(self, trade_id: int) -> Optional[schemas.ExecutedTradeModel]:
         return self.session.get(schemas.ExecutedTradeModel, trade_id)
 
@@ -311,35 +534,64 @@ class RunHistoryRepository(BaseRepository):
         self.session.flush()
         return model
 
-    def bulk_insert_summaries(self, run_uuid: str, entries: Iterable[dict]) -> None:
-        run = (
-            self.session.query(schemas.RunHistoryModel)
-            .filter(schemas.RunHistoryModel.run_uuid == run_uuid)
-            .one()
+    def bulk_insert_summaries(
+        self,
+        run_uuid: str,
+        entries: Iterable[Mapping[str, Any]],
+        generated_at: Optional[datetime] = None,
+        generated_at_local: Optional[datetime] = None,
+        run_pk: Optional[int] = None,
+    ) -> None:
+        """批次寫入摘要；已知 run 主鍵時傳入 ``run_pk`` 可省去以 run_uuid 查詢。"""
+
+        run_id = run_pk
+        if run_id is None:
+            run_id = self.session.execute(
+                select(schemas.RunHistoryModel.id).where(schemas.RunHistoryModel.run_uuid == run_uuid)
+            ).scalar_one()
+        # 同一次執行的摘要共用產出時間，由呼叫端統一帶入。
+        generated_dt = generated_at or utc_now()
+        generated_local_dt = generated_at_local or generated_dt
+        rows = [
+            {
+                "run_id": run_id,
+                "section": entry.get("section", ""),
+                "token_symbol": entry.get("token_symbol", ""),
+                "token_address": entry.get("token_address"),
+                "chain": entry.get("chain"),
+                "score": entry.get("score", 0.0),
+                "reasons": entry.get("reasons", []),
+                "count": entry.get("count", 1),
+                "top_wallets": entry.get("top_wallets", []),
+                "generated_at": generated_dt,
+                "generated_at_local": generated_local_dt,
+            }
+            for entry in entries
+        ]
+        if not rows:
+            return
+        # 摘要不需要 ORM 關聯追蹤，以 Core executemany 寫入並依參數順序取回主鍵。
+        table = schemas.SignalSummaryModel.__table__
+        summary_ids = self.session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        # reasons / top_wallets 另外展開成子表，方便依理由或錢包查詢。
+        self._bulk_insert_rows(
+            schemas.SignalSummaryReasonModel,
+            [
+                {"summary_id": summary_id, "reason_code": code}
+                for summary_id, row in zip(summary_ids, rows)
+                for code in row["reasons"]
+            ],
+        )
+        self._bulk_insert_rows(
+            schemas.SignalSummaryWalletModel,
+            [
+                {"summary_id": summary_id, "rank": rank, "wallet_address": address}
+                for summary_id, row in zip(summary_ids, rows)
+                for rank, address in enumerate(row["top_wallets"], start=1)
+            ],
         )
-        for entry in entries:
-            generated_at = entry.get("generated_at")
-            generated_dt = (
-                datetime.fromisoformat(generated_at) if isinstance(generated_at, str) else utc_now()
-            )
-            model = schemas.SignalSummaryModel(
-                run_id=run.id,
-                section=entry.get("section", ""),
-                token_symbol=entry.get("token_symbol", ""),
-                token_address=entry.get("token_address"),
-                chain=entry.get("chain"),
-                score=entry.get("score", 0.0),
-                reasons=entry.get("reasons", []),
-                count=entry.get("count", 1),
-                top_wallets=entry.get("top_wallets", []),
-                generated_at=generated_dt,
-                generated_at_local=datetime.fromisoformat(
-                    entry.get("generated_at_local")
-                )
-                if isinstance(entry.get("generated_at_local"), str)
-                else utc_now(),
-            )
-            self.session.add(model)
 
 
 class TokenScreenerRepository(BaseRepository):
@@ -351,96 +603,119 @@ class TokenScreenerRepository(BaseRepository):
         snapshots: Sequence[dict],
         captured_at: datetime,
     ) -> None:
-        if not snapshots:
-            return
-        models = []
-        for entry in snapshots:
-            model = schemas.TokenScreenerSnapshotModel(
-                run_id=run_id,
-                captured_at=captured_at,
-                chain=entry.get("chain", ""),
-                token_address=(entry.get("token_address") or "").lower(),
-                token_symbol=entry.get("token_symbol") or "",
-                token_age_days=entry.get("token_age_days"),
-                market_cap_usd=entry.get("market_cap_usd"),
-                liquidity=entry.get("liquidity"),
-                price_usd=entry.get("price_usd"),
-                price_change=entry.get("price_change"),
-                fdv=entry.get("fdv"),
-                fdv_mc_ratio=entry.get("fdv_mc_ratio"),
-                buy_volume=entry.get("buy_volume"),
-                sell_volume=entry.get("sell_volume"),
-                volume=entry.get("volume"),
-                netflow=entry.get("netflow"),
-                inflow_fdv_ratio=entry.get("inflow_fdv_ratio"),
-                outflow_fdv_ratio=entry.get("outflow_fdv_ratio"),
-            )
-            models.append(model)
-        self.session.bulk_save_objects(models)
+        rows = [
+            {
+                "run_id": run_id,
+                "captured_at": captured_at,
+                "chain": entry.get("chain", ""),
+                "token_address": (entry.get("token_address") or "").lower(),
+                "token_symbol": entry.get("token_symbol") or "",
+                "token_age_days": entry.get("token_age_days"),
+                "market_cap_usd": entry.get("market_cap_usd"),
+                "liquidity": entry.get("liquidity"),
+                "price_usd": entry.get("price_usd"),
+                "price_change": entry.get("price_change"),
+                "fdv": entry.get("fdv"),
+                "fdv_mc_ratio": entry.get("fdv_mc_ratio"),
+                "buy_volume": entry.get("buy_volume"),
+                "sell_volume": entry.get("sell_volume"),
+                "volume": entry.get("volume"),
+                "netflow": entry.get("netflow"),
+                "inflow_fdv_ratio": entry.get("inflow_fdv_ratio"),
+                "outflow_fdv_ratio": entry.get("outflow_fdv_ratio"),
+            }
+            for entry in snapshots
+        ]
+        self._bulk_insert_rows(schemas.TokenScreenerSnapshotModel, rows)
 
     def upsert_market_metrics(
         self,
         snapshots: Sequence[dict],
         captured_at: datetime,
     ) -> None:
+        updated_at = utc_now()
+        # 同一批內重複的 token 以最後一筆為準，symbol 為空時沿用先前的值。
+        rows: dict[tuple[str, str], dict[str, Any]] = {}
         for entry in snapshots:
             chain = entry.get("chain", "")
             token_address = (entry.get("token_address") or "").lower()
-            token_symbol = entry.get("token_symbol") or ""
-            model = (
-                self.session.query(schemas.TokenMarketMetricModel)
-                .filter(schemas.TokenMarketMetricModel.chain == chain)
-                .filter(schemas.TokenMarketMetricModel.token_address == token_address)
-                .one_or_none()
+            previous = rows.get((chain, token_address))
+            row: dict[str, Any] = {
+                "chain": chain,
+                "token_address": token_address,
+                "token_symbol": entry.get("token_symbol")
+                or (previous["token_symbol"] if previous else ""),
+                "snapshot_captured_at": captured_at,
+                "updated_at": updated_at,
+            }
+            for field in _MARKET_METRIC_FIELDS:
+                row[field] = entry.get(field)
+            rows[(chain, token_address)] = row
+        if not rows:
+            return
+
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is None:
+            self._upsert_market_metrics_rowwise(rows.values())
+            return
+
+        table = schemas.TokenMarketMetricModel.__table__
+        for chunk in chunked(rows.values(), _UPSERT_CHUNK_SIZE):
+            stmt = dialect_insert(table).values(chunk)
+            excluded = stmt.excluded
+            update_columns: dict[str, Any] = {
+                "token_symbol": func.coalesce(
+                    func.nullif(excluded.token_symbol, ""), table.c.token_symbol
+                ),
+                "snapshot_captured_at": excluded.snapshot_captured_at,
+                "updated_at": excluded.updated_at,
+            }
+            for field in _MARKET_METRIC_FIELDS:
+                update_columns[field] = excluded[field]
+            self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["chain", "token_address"],
+                    set_=update_columns,
+                )
             )
+
+    def _upsert_market_metrics_rowwise(self, rows: Iterable[dict[str, Any]]) -> None:
+        """不支援 ON CONFLICT 的資料庫逐筆查詢後更新。"""
+
+        for row in rows:
+            model = self.session.execute(
+                _STMT_MARKET_METRIC_BY_KEY,
+                {"chain": row["chain"], "token_address": row["token_address"]},
+            ).scalar_one_or_none()
             if model is None:
-                model = schemas.TokenMarketMetricModel(
-                    chain=chain,
-                    token_address=token_address,
-                    token_symbol=token_symbol,
-                    snapshot_captured_at=captured_at,
-                )
-            model.token_symbol = token_symbol or model.token_symbol
-            model.snapshot_captured_at = captured_at
-            model.market_cap_usd = entry.get("market_cap_usd")
-            model.liquidity = entry.get("liquidity")
-            model.price_usd = entry.get("price_usd")
-            model.price_change = entry.get("price_change")
-            model.fdv = entry.get("fdv")
-            model.fdv_mc_ratio = entry.get("fdv_mc_ratio")
-            model.buy_volume = entry.get("buy_volume")
-            model.sell_volume = entry.get("sell_volume")
-            model.volume = entry.get("volume")
-            model.netflow = entry.get("netflow")
-            model.inflow_fdv_ratio = entry.get("inflow_fdv_ratio")
-            model.outflow_fdv_ratio = entry.get("outflow_fdv_ratio")
-            model.token_age_days = entry.get("token_age_days")
-            model.updated_at = utc_now()
-            self.session.add(model)
+                self.session.add(schemas.TokenMarketMetricModel(**row))
+                continue
+            for field, value in row.items():
+                if field == "token_symbol" and not value:
+                    continue
+                setattr(model, field, value)
 
 
 class TradeCandidateRepository(BaseRepository):
     """儲存每次策略候選清單資料。"""
 
     def bulk_insert(self, run_id: int, entries: Sequence[dict]) -> None:
-        if not entries:
-            return
-        models: List[schemas.TradeCandidateModel] = []
-        for entry in entries:
-            model = schemas.TradeCandidateModel(
-                run_id=run_id,
-                scope=entry.get("scope", "all"),
-                rank=entry.get("rank", 0),
-                token_symbol=entry.get("token_symbol", ""),
-                token_address=entry.get("token_address"),
-                chain=entry.get("chain", ""),
-                composite_score=entry.get("composite_score"),
-                market_score=entry.get("market_score"),
-                liquidity_score=entry.get("liquidity_score"),
-                smart_money_score=entry.get("smart_money_score"),
-                has_smart_money=bool(entry.get("has_smart_money")),
-                market=entry.get("market"),
-                smart_money=entry.get("smart_money"),
-            )
-            models.append(model)
-        self.session.bulk_save_objects(models)
+        rows = [
+            {
+                "run_id": run_id,
+                "scope": entry.get("scope", "all"),
+                "rank": entry.get("rank", 0),
+                "token_symbol": entry.get("token_symbol", ""),
+                "token_address": entry.get("token_address"),
+                "chain": entry.get("chain", ""),
+                "composite_score": entry.get("composite_score"),
+                "market_score": entry.get("market_score"),
+                "liquidity_score": entry.get("liquidity_score"),
+                "smart_money_score": entry.get("smart_money_score"),
+                "has_smart_money": bool(entry.get("has_smart_money")),
+                "market": entry.get("market"),
+                "smart_money": entry.get("smart_money"),
+            }
+            for entry in entries
+        ]
+        self._bulk_insert_rows(schemas.TradeCandidateModel, rows)
@@ -9,17 +9,22 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .db import Base
 from ..core.utils import utc_now
 
+# JSON 欄位：PostgreSQL 使用 JSONB（寫入時解析一次、可建 GIN 索引），其他資料庫為一般 JSON。
+_JSONColumn = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
 signal_wallets = Table(
     "signal_wallets",
     Base.metadata,
@@ -32,15 +37,19 @@ class WalletModel(Base):
     """錢包資料表。"""
 
     __tablename__ = "wallets"
+    __table_args__ = (
+        Index("ix_wallets_labels", "labels", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     address: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
-    labels: Mapped[str] = mapped_column(Text, default="")
+    labels: Mapped[list[str]] = mapped_column(_JSONColumn, default=list)
     alpha_score: Mapped[float | None] = mapped_column(Float)
     last_active_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    # 反向集合會隨資料累積無限成長，禁止隱式載入；需要時請明確查詢。
     signals: Mapped[list["SignalModel"]] = relationship(
-        secondary=signal_wallets, back_populates="wallets"
+        secondary=signal_wallets, back_populates="wallets", lazy="raise_on_sql"
     )
 
 
@@ -48,31 +57,39 @@ class TokenModel(Base):
     """代幣資料表。"""
 
     __tablename__ = "tokens"
+    __table_args__ = (Index("ix_tokens_symbol_chain", "symbol", "chain"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     address: Mapped[str | None] = mapped_column(String(128))
     symbol: Mapped[str] = mapped_column(String(32), nullable=False)
     chain: Mapped[str | None] = mapped_column(String(32))
     liquidity_score: Mapped[float | None] = mapped_column(Float)
-    blacklist_flags: Mapped[str] = mapped_column(Text, default="")
+    blacklist_flags: Mapped[list[str]] = mapped_column(_JSONColumn, default=list)
 
-    events: Mapped[list["EventModel"]] = relationship(back_populates="token")
-    signals: Mapped[list["SignalModel"]] = relationship(back_populates="token")
+    # 同 WalletModel.signals，反向集合不允許隱式載入。
+    events: Mapped[list["EventModel"]] = relationship(back_populates="token", lazy="raise_on_sql")
+    signals: Mapped[list["SignalModel"]] = relationship(back_populates="token", lazy="raise_on_sql")
 
 
 class EventModel(Base):
     """事件資料表。"""
 
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_token_occurred", "token_id", "occurred_at"),
+        # WalletAlphaService 依錢包取最近事件。
+        Index("ix_events_wallet_occurred", "wallet_id", "occurred_at"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     token_id: Mapped[int] = mapped_column(ForeignKey("tokens.id"), nullable=False)
     wallet_id: Mapped[int | None] = mapped_column(ForeignKey("wallets.id"))
     source: Mapped[str] = mapped_column(String(32), nullable=False)
     tx_hash: Mapped[str | None] = mapped_column(String(128))
     chain: Mapped[str | None] = mapped_column(String(32))
     occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    features: Mapped[dict] = mapped_column(JSON, default=dict)
+    # JSON 欄位延後載入，只在存取屬性（或以 undefer 指定）時才讀取與解析。
+    features: Mapped[dict] = mapped_column(_JSONColumn, default=dict, deferred=True)
 
     token: Mapped["TokenModel"] = relationship(back_populates="events")
     wallet: Mapped["WalletModel"] = relationship()
@@ -82,13 +99,16 @@ class SignalModel(Base):
     """訊號資料表。"""
 
     __tablename__ = "signals"
+    # B-tree 可反向掃描，ORDER BY score DESC LIMIT N 直接走索引。
+    __table_args__ = (Index("ix_signals_score", "score"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     token_id: Mapped[int] = mapped_column(ForeignKey("tokens.id"), nullable=False)
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    reasons: Mapped[list] = mapped_column(JSON, default=list)
+    # JSON 欄位延後載入，只取分數等欄位時不必解析。
+    reasons: Mapped[list] = mapped_column(_JSONColumn, default=list, deferred=True)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    context: Mapped[dict] = mapped_column("metadata", JSON, default=dict)
+    context: Mapped[dict] = mapped_column("metadata", _JSONColumn, default=dict, deferred=True)
 
     token: Mapped["TokenModel"] = relationship(back_populates="signals")
     wallets: Mapped[list["WalletModel"]] = relationship(
@@ -101,8 +121,10 @@ class SimulatedTradeModel(Base):
     """模擬交易紀錄。"""
 
     __tablename__ = "simulated_trades"
+    # status 放在最前面，同時支援 get_open_trade 與 list_open_trades 的查詢條件。
+    __table_args__ = (Index("ix_simulated_trades_open", "status", "token_address", "chain"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     token_address: Mapped[str] = mapped_column(String(128), nullable=False)
     token_symbol: Mapped[str] = mapped_column(String(64), nullable=False)
     chain: Mapped[str | None] = mapped_column(String(32))
@@ -114,7 +136,7 @@ class SimulatedTradeModel(Base):
     sell_price: Mapped[float | None] = mapped_column(Float)
     sell_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     sell_time_local: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    extra: Mapped[dict] = mapped_column(JSON, default=dict)
+    extra: Mapped[dict] = mapped_column(_JSONColumn, default=dict)
 
 
 class ExecutedTradeModel(Base):
@@ -122,7 +144,7 @@ class ExecutedTradeModel(Base):
 
     __tablename__ = "executed_trades"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     mode: Mapped[str] = mapped_column(String(16), nullable=False)  # SIMULATION 或 LIVE
     status: Mapped[str] = mapped_column(String(16), default="PENDING", nullable=False)
     side: Mapped[str] = mapped_column(String(16), nullable=False)
@@ -147,9 +169,10 @@ class ExecutedTradeModel(Base):
     tx_hash: Mapped[str | None] = mapped_column(String(128))
     error_message: Mapped[str | None] = mapped_column(Text)
 
-    price_response: Mapped[dict | None] = mapped_column(JSON)
-    quote_response: Mapped[dict | None] = mapped_column(JSON)
-    transaction_payload: Mapped[dict | None] = mapped_column(JSON)
+    # 0x API 原始回應可能很大，歸為同一延後載入群組，讀取狀態時不必一併取回。
+    price_response: Mapped[dict | None] = mapped_column(_JSONColumn, deferred=True, deferred_group="payloads")
+    quote_response: Mapped[dict | None] = mapped_column(_JSONColumn, deferred=True, deferred_group="payloads")
+    transaction_payload: Mapped[dict | None] = mapped_column(_JSONColumn, deferred=True, deferred_group="payloads")
 
     executed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
     executed_at_local: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
@@ -162,14 +185,14 @@ class RunHistoryModel(Base):
 
     __tablename__ = "run_history"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     run_uuid: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     executed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     executed_at_local: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     total_signals: Mapped[int] = mapped_column(Integer, default=0)
     buy_signals: Mapped[int] = mapped_column(Integer, default=0)
     sell_signals: Mapped[int] = mapped_column(Integer, default=0)
-    stats: Mapped[dict] = mapped_column(JSON, default=dict)
+    stats: Mapped[dict] = mapped_column(_JSONColumn, default=dict)
 
     summaries: Mapped[list["SignalSummaryModel"]] = relationship(
         back_populates="run",
@@ -190,7 +213,7 @@ class TokenScreenerSnapshotModel(Base):
 
     __tablename__ = "token_screener_snapshots"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     run_id: Mapped[int] = mapped_column(ForeignKey("run_history.id"), nullable=False)
     captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
     chain: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -218,7 +241,7 @@ class TokenMarketMetricModel(Base):
 
     __tablename__ = "token_market_metrics"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     chain: Mapped[str] = mapped_column(String(32), nullable=False)
     token_address: Mapped[str] = mapped_column(String(128), nullable=False)
     token_symbol: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -248,7 +271,7 @@ class TradeCandidateModel(Base):
 
     __tablename__ = "trade_candidates"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     run_id: Mapped[int] = mapped_column(ForeignKey("run_history.id"), nullable=False)
     scope: Mapped[str] = mapped_column(String(32), nullable=False)
     rank: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -260,8 +283,8 @@ class TradeCandidateModel(Base):
     liquidity_score: Mapped[float | None] = mapped_column(Float)
     smart_money_score: Mapped[float | None] = mapped_column(Float)
     has_smart_money: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    market: Mapped[dict | None] = mapped_column(JSON)
-    smart_money: Mapped[dict | None] = mapped_column(JSON)
+    market: Mapped[dict | None] = mapped_column(_JSONColumn)
+    smart_money: Mapped[dict | None] = mapped_column(_JSONColumn)
 
     run: Mapped["RunHistoryModel"] = relationship(back_populates="trade_candidates")
 
@@ -271,17 +294,38 @@ class SignalSummaryModel(Base):
 
     __tablename__ = "signal_summaries"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     run_id: Mapped[int] = mapped_column(ForeignKey("run_history.id"), nullable=False)
     section: Mapped[str] = mapped_column(String(32), nullable=False)
     token_symbol: Mapped[str] = mapped_column(String(64), nullable=False)
     token_address: Mapped[str | None] = mapped_column(String(128))
     chain: Mapped[str | None] = mapped_column(String(32))
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    reasons: Mapped[list] = mapped_column(JSON, default=list)
+    reasons: Mapped[list] = mapped_column(_JSONColumn, default=list)
     count: Mapped[int] = mapped_column(Integer, default=1)
-    top_wallets: Mapped[list] = mapped_column(JSON, default=list)
+    top_wallets: Mapped[list] = mapped_column(_JSONColumn, default=list)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     generated_at_local: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     run: Mapped["RunHistoryModel"] = relationship(back_populates="summaries")
+
+
+class SignalSummaryReasonModel(Base):
+    """摘要的理由代碼，由 signal_summaries.reasons 展開以便以 SQL 篩選。"""
+
+    __tablename__ = "signal_summary_reasons"
+    __table_args__ = (Index("ix_signal_summary_reasons_code", "reason_code"),)
+
+    summary_id: Mapped[int] = mapped_column(ForeignKey("signal_summaries.id"), primary_key=True)
+    reason_code: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+
+class SignalSummaryWalletModel(Base):
+    """摘要的 Top wallets，依名次逐列存放。"""
+
+    __tablename__ = "signal_summary_wallets"
+    __table_args__ = (Index("ix_signal_summary_wallets_address", "wallet_address"),)
+
+    summary_id: Mapped[int] = mapped_column(ForeignKey("signal_summaries.id"), primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    wallet_address: Mapped[str] = mapped_column(String(128), nullable=False)
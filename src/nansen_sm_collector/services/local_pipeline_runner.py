@@ -4,6 +4,24 @@ import asyncio
 from asyncio.subprocess import Process
 from typing import Any, Dict
 
+_TAIL_CHARS = 2000
+# UTF-8 單一字元最多 4 bytes，保留足夠位元組才能解出最後 _TAIL_CHARS 個字元。
+_TAIL_BYTES = _TAIL_CHARS * 4
+_READ_CHUNK = 64 * 1024
+
+
+async def _read_tail(stream: asyncio.StreamReader | None) -> bytes:
+    """讀完串流，只保留最後 _TAIL_BYTES 個位元組。"""
+
+    if stream is None:
+        return b""
+    tail = bytearray()
+    while chunk := await stream.read(_READ_CHUNK):
+        tail += chunk
+        if len(tail) > _TAIL_BYTES:
+            del tail[:-_TAIL_BYTES]
+    return bytes(tail)
+
 
 class LocalPipelineRunner:
     """Simple async runner used when Zeabur API is unavailable."""
@@ -20,14 +38,17 @@ class LocalPipelineRunner:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await self._process.communicate()
-        stdout_text = stdout.decode("utf-8", errors="ignore") if stdout else ""
-        stderr_text = stderr.decode("utf-8", errors="ignore") if stderr else ""
+        # 邊讀邊丟棄舊輸出，只保留結尾，避免長時間執行時整份輸出留在記憶體。
+        stdout, stderr = await asyncio.gather(
+            _read_tail(self._process.stdout),
+            _read_tail(self._process.stderr),
+        )
+        await self._process.wait()
         return {
             "status": "completed",
             "returncode": self._process.returncode,
-            "stdout": stdout_text[-2000:],
-            "stderr": stderr_text[-2000:],
+            "stdout": stdout.decode("utf-8", errors="ignore")[-_TAIL_CHARS:],
+            "stderr": stderr.decode("utf-8", errors="ignore")[-_TAIL_CHARS:],
         }
 
     async def terminate(self) -> Dict[str, Any]:
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence
 
 import httpx
-import json
+import orjson
 
 
 logger = logging.getLogger(__name__)
 
+# 同一聊天室短時間大量發送會被 Telegram 限流（HTTP 429），同時進行的請求數保持在小範圍。
+_MAX_CONCURRENT_SENDS = 4
+
 
 class TelegramNotifier:
     """Encapsulates Telegram Bot API interactions."""
@@ -20,11 +24,28 @@ class TelegramNotifier:
         bot_token: str,
         chat_id: str,
         timeout: float = 15.0,
+        async_transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         self._bot_token = bot_token.strip()
         self._chat_id = chat_id.strip()
         self._timeout = timeout
         self._api_base = f"https://api.telegram.org/bot{self._bot_token}"
+        # 重複使用連線，連續通知時不必每次重新建立 TCP / TLS。
+        self._client = httpx.Client(
+            base_url=self._api_base,
+            http2=True,
+            timeout=timeout,
+        )
+        self._async_transport = async_transport
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "TelegramNotifier":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
 
     def send_text(
         self,
@@ -33,22 +54,59 @@ class TelegramNotifier:
         parse_mode: Optional[str] = None,
         reply_markup: Optional[dict] = None,
     ) -> bool:
-        message = text.strip()
-        if not message:
+        data = self._message_data(text, parse_mode, reply_markup)
+        if data is None:
             return False
-        # Telegram message limit is 4096 characters
-        if len(message) > 4000:
-            message = f"{message[:3900].rstrip()}\n\n...[truncated]"
 
-        url = f"{self._api_base}/sendMessage"
-        data: dict[str, str] = {"chat_id": self._chat_id, "text": message}
-        if parse_mode:
-            data["parse_mode"] = parse_mode
-        if reply_markup:
-            data["reply_markup"] = json.dumps(reply_markup)
+        try:
+            response = self._client.post("/sendMessage", data=data)
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as error:
+            logger.warning(
+                "telegram_send_message_failed",
+                extra={"error": str(error)},
+            )
+            return False
 
+    async def asend_texts(
+        self,
+        texts: Sequence[str],
+        *,
+        parse_mode: Optional[str] = None,
+        ordered: bool = True,
+    ) -> List[bool]:
+        """發送多則訊息，回傳順序與 ``texts`` 相同。
+
+        預設依序送出，拆分的報告在聊天室中維持原本順序；``ordered=False`` 時並行送出，
+        同時進行的請求不超過 ``_MAX_CONCURRENT_SENDS``，送達順序不保證。
+        """
+
+        payloads = [self._message_data(text, parse_mode, None) for text in texts]
+        if not any(payloads):
+            return [False] * len(payloads)
+        async with httpx.AsyncClient(
+            base_url=self._api_base,
+            http2=True,
+            timeout=self._timeout,
+            transport=self._async_transport,
+        ) as client:
+            if ordered:
+                return [await self._apost_message(client, data) for data in payloads]
+            # HTTP/2 會把所有請求多工到同一條連線，連線數上限擋不住同時送出的數量，改以號誌限制。
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
+
+            async def send(data: Optional[dict[str, str]]) -> bool:
+                async with semaphore:
+                    return await self._apost_message(client, data)
+
+            return list(await asyncio.gather(*(send(data) for data in payloads)))
+
+    async def _apost_message(self, client: httpx.AsyncClient, data: Optional[dict[str, str]]) -> bool:
+        if data is None:
+            return False
         try:
-            response = httpx.post(url, data=data, timeout=self._timeout)
+            response = await client.post("/sendMessage", data=data)
             response.raise_for_status()
             return True
         except httpx.HTTPError as error:
@@ -58,17 +116,38 @@ class TelegramNotifier:
             )
             return False
 
+    def _message_data(
+        self,
+        text: str,
+        parse_mode: Optional[str],
+        reply_markup: Optional[dict],
+    ) -> Optional[dict[str, str]]:
+        message = text.strip()
+        if not message:
+            return None
+        # Telegram message limit is 4096 characters
+        if len(message) > 4000:
+            message = f"{message[:3900].rstrip()}\n\n...[truncated]"
+
+        data: dict[str, str] = {"chat_id": self._chat_id, "text": message}
+        if parse_mode:
+            data["parse_mode"] = parse_mode
+        if reply_markup:
+            data["reply_markup"] = orjson.dumps(reply_markup).decode("utf-8")
+        return data
+
     def send_document(self, file_path: Path, caption: Optional[str] = None) -> bool:
         if not file_path.exists():
             logger.warning("telegram_document_missing", extra={"path": str(file_path)})
             return False
 
-        url = f"{self._api_base}/sendDocument"
         data: dict[str, str] = {"chat_id": self._chat_id}
         if caption:
             data["caption"] = caption
 
         try:
+            # 傳入檔案 handle 時 httpx 以 64KB 分段讀取組出 multipart，並依檔案大小
+            # 設定 Content-Length，上傳期間不會把整個檔案載入記憶體。
             with file_path.open("rb") as handle:
                 files = {
                     "document": (
@@ -77,7 +156,7 @@ class TelegramNotifier:
                         "text/markdown" if file_path.suffix.lower() == ".md" else "application/octet-stream",
                     )
                 }
-                response = httpx.post(url, data=data, files=files, timeout=self._timeout)
+                response = self._client.post("/sendDocument", data=data, files=files)
             response.raise_for_status()
             return True
         except httpx.HTTPError as error:
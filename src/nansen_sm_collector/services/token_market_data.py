@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterable, List, Mapping, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, MutableMapping, Sequence
 
 from ..adapters.gecko_terminal import GeckoTerminalClient
 from ..core.errors import AdapterError
+from .token_overview import OverviewRow
 
 logger = logging.getLogger(__name__)
 
+# 同時對 GeckoTerminal 發出的請求上限，避免觸發速率限制。
+_MAX_CONCURRENT_REQUESTS = 8
+
+_BUY_SIDES = frozenset({"buy", "swap_buy"})
+_SELL_SIDES = frozenset({"sell", "swap_sell"})
+_EMPTY_ATTRIBUTES: Mapping[str, object] = {}
+
 
 class TokenMarketDataService:
     """使用 GeckoTerminal API 補充池子 OHLCV 與交易深度資訊。"""
@@ -25,30 +34,61 @@ class TokenMarketDataService:
         self._timeframe = timeframe
         self._limit = max(1, min(limit, 1000))
         self._min_trade_usd = max(0.0, float(min_trade_usd))
-        self._pool_map = pool_map
+        # pool_map 建構後不再變動，預先攤平成 (chain, token) -> pools 並統一小寫。
+        self._pools_by_token: Dict[tuple[str, str], tuple[str, ...]] = {
+            (str(chain).lower(), str(token_address).lower()): tuple(pool.lower() for pool in pools if pool)
+            for chain, tokens in pool_map.items()
+            for token_address, pools in tokens.items()
+        }
 
-    def enrich(self, overview: Sequence[dict]) -> List[dict]:
+    def enrich(self, overview: Sequence[OverviewRow]) -> List[OverviewRow]:
         if not self._client or not overview:
             return list(overview)
 
-        enriched: List[dict] = []
+        resolved = []
         for entry in overview:
-            enriched.append(self._enrich_single(entry))
-        return enriched
+            chain = (entry.chain or "").lower()
+            token_address = (entry.token_address or "").lower()
+            resolved.append((entry, chain, self._resolve_pools(chain, token_address)))
+
+        # 相同 (chain, pool) 只查一次，並以有限的執行緒數同時發出請求以重疊網路延遲。
+        unique_pools = list(dict.fromkeys((chain, pool) for _, chain, pools in resolved for pool in pools))
+        pool_data: Dict[tuple[str, str], tuple[List[dict], List[dict]]] = {}
+        if unique_pools:
+            with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, 2 * len(unique_pools))) as executor:
+                futures = {
+                    key: (
+                        executor.submit(self._fetch_pool_ohlcv, *key),
+                        executor.submit(self._fetch_pool_trades, *key),
+                    )
+                    for key in unique_pools
+                }
+                pool_data = {
+                    key: (ohlcv_future.result(), trades_future.result())
+                    for key, (ohlcv_future, trades_future) in futures.items()
+                }
+
+        return [self._enrich_single(entry, chain, pools, pool_data) for entry, chain, pools in resolved]
+
+    def _enrich_single(
+        self,
+        entry: OverviewRow,
+        chain: str,
+        pools: Sequence[str],
+        pool_data: Mapping[tuple[str, str], tuple[List[dict], List[dict]]],
+    ) -> OverviewRow:
+        # 多數代幣沒有設定池子，不必複製 market。
+        if not pools:
+            return entry
 
-    def _enrich_single(self, entry: dict) -> dict:
-        chain = (entry.get("chain") or "").lower()
-        token_address = (entry.get("token_address") or "").lower()
-        market: MutableMapping[str, object] = dict(entry.get("market") or {})
+        market: MutableMapping[str, object] = dict(entry.market)
 
-        pools = list(self._resolve_pools(chain, token_address))
         pool_payloads = []
         for pool in pools:
             pool_info = {"pool_address": pool}
-            ohlcv = self._fetch_pool_ohlcv(chain, pool)
+            ohlcv, trades = pool_data[(chain, pool)]
             if ohlcv:
                 pool_info["ohlcv"] = ohlcv
-            trades = self._fetch_pool_trades(chain, pool)
             if trades:
                 pool_info["trade_stats"] = self._summarize_trades(trades)
                 pool_info["trades"] = trades[: min(20, len(trades))]
@@ -58,15 +98,11 @@ class TokenMarketDataService:
         if pool_payloads:
             market["pools"] = pool_payloads
 
-        entry["market"] = market
+        entry.market = market
         return entry
 
-    def _resolve_pools(self, chain: str, token_address: str) -> Iterable[str]:
-        chain_map = self._pool_map.get(chain)
-        if not chain_map:
-            return []
-        pools = chain_map.get(token_address, [])
-        return [pool.lower() for pool in pools if pool]
+    def _resolve_pools(self, chain: str, token_address: str) -> Sequence[str]:
+        return self._pools_by_token.get((chain, token_address), ())
 
     def _fetch_pool_ohlcv(self, chain: str, pool_address: str) -> List[dict]:
         try:
@@ -113,10 +149,13 @@ class TokenMarketDataService:
         sell_volume = 0.0
         total_volume = 0.0
         max_volume = 0.0
-        last_timestamp: str | None = None
+        # 只保留最後一筆時間戳原值，迴圈結束後才轉成字串。
+        last_timestamp: object = None
 
         for trade in trades:
-            attributes = trade.get("attributes") if isinstance(trade.get("attributes"), dict) else {}
+            attributes = trade.get("attributes")
+            if not isinstance(attributes, dict):
+                attributes = _EMPTY_ATTRIBUTES
             volume = (
                 attributes.get("amount_in_usd")
                 or attributes.get("volume_in_usd")
@@ -131,7 +170,8 @@ class TokenMarketDataService:
             except (TypeError, ValueError):
                 continue
             total_volume += volume
-            max_volume = max(max_volume, volume)
+            if volume > max_volume:
+                max_volume = volume
             count += 1
 
             side = (
@@ -139,13 +179,13 @@ class TokenMarketDataService:
                 or attributes.get("side")
                 or trade.get("trade_type")
                 or trade.get("side")
-                or ""
             )
-            normalized_side = str(side).lower()
-            if normalized_side in ("buy", "swap_buy"):
-                buy_volume += volume
-            elif normalized_side in ("sell", "swap_sell"):
-                sell_volume += volume
+            if side:
+                normalized_side = str(side).lower()
+                if normalized_side in _BUY_SIDES:
+                    buy_volume += volume
+                elif normalized_side in _SELL_SIDES:
+                    sell_volume += volume
 
             timestamp = (
                 attributes.get("block_timestamp")
@@ -154,7 +194,7 @@ class TokenMarketDataService:
                 or trade.get("timestamp")
             )
             if timestamp:
-                last_timestamp = str(timestamp)
+                last_timestamp = timestamp
 
         return {
             "trade_count": count,
@@ -162,5 +202,5 @@ class TokenMarketDataService:
             "buy_volume_usd": buy_volume,
             "sell_volume_usd": sell_volume,
             "max_trade_volume_usd": max_volume,
-            "last_trade_timestamp": last_timestamp,
+            "last_trade_timestamp": str(last_timestamp) if last_timestamp else None,
         }
@@ -1,11 +1,59 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+import sys
+from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 from ..core.types import Event
 
 
+_SAMPLE_TX_HASHES = 5
+
+
+@dataclass(slots=True)
+class OverviewRow:
+    """單一代幣的市場與聰明資金彙整；欄位順序即輸出 JSON 的鍵順序。"""
+
+    chain: str
+    token_address: str | None
+    token_symbol: str
+    market: dict
+    smart_money: dict
+
+
+def _overview_rank(item: OverviewRow) -> Tuple[float, float]:
+    """排序依據：市場成交量優先，其次為聰明資金總金額。"""
+
+    return (
+        item.market.get("volume") or 0.0,
+        item.smart_money.get("total_usd_notional") or 0.0,
+    )
+
+
+class _EventBucket:
+    """單一代幣的事件累計值。"""
+
+    __slots__ = (
+        "event_count",
+        "wallets",
+        "total_usd_notional",
+        "netflow_sum",
+        "netflow_positive",
+        "netflow_negative",
+        "tx_hashes",
+    )
+
+    def __init__(self) -> None:
+        self.event_count = 0
+        self.wallets: set[str] = set()
+        self.total_usd_notional = 0.0
+        self.netflow_sum = 0.0
+        self.netflow_positive = 0
+        self.netflow_negative = 0
+        self.tx_hashes: List[str] = []
+
+
 class TokenOverviewService:
     """彙整智慧錢包事件與市場熱度指標。"""
 
@@ -13,32 +61,33 @@ class TokenOverviewService:
         self,
         smart_money_events: Sequence[Event],
         screener_rows: Sequence[dict],
-    ) -> List[dict]:
+        top_k: int | None = None,
+    ) -> List[OverviewRow]:
+        """合併市場與聰明資金資料，依熱度由高到低排序。
+
+        指定 ``top_k`` 時只取前 ``top_k`` 筆，以 heap 選取而不排序整份清單。
+        """
+
         market_map = self._index_screener_rows(screener_rows)
         smart_map = self._summarize_events(smart_money_events)
 
-        keys = set(market_map.keys()) | set(smart_map.keys())
-        overview: List[dict] = []
+        keys = market_map.keys() | smart_map.keys()
+        overview: List[OverviewRow] = []
         for key in keys:
             chain, address, symbol = key
-            market = market_map.get(key)
-            smart = smart_map.get(key)
             overview.append(
-                {
-                    "chain": chain,
-                    "token_address": address or None,
-                    "token_symbol": symbol,
-                    "market": market or {},
-                    "smart_money": smart or {},
-                }
+                OverviewRow(
+                    chain=chain,
+                    token_address=address or None,
+                    token_symbol=symbol,
+                    market=market_map.get(key) or {},
+                    smart_money=smart_map.get(key) or {},
+                )
             )
 
-        overview.sort(
-            key=lambda item: (
-                -(item["market"].get("volume") or 0.0),
-                -(item["smart_money"].get("total_usd_notional") or 0.0),
-            )
-        )
+        if top_k is not None:
+            return heapq.nlargest(top_k, overview, key=_overview_rank)
+        overview.sort(key=_overview_rank, reverse=True)
         return overview
 
     def _index_screener_rows(self, rows: Sequence[dict]) -> Dict[Tuple[str, str, str], dict]:
@@ -66,51 +115,48 @@ class TokenOverviewService:
         return indexed
 
     def _summarize_events(self, events: Sequence[Event]) -> Dict[Tuple[str, str, str], dict]:
-        grouped: Dict[Tuple[str, str, str], Dict[str, Any]] = defaultdict(
-            lambda: {
-                "event_count": 0,
-                "wallets": set(),
-                "total_usd_notional": 0.0,
-                "netflow_values": [],
-                "tx_hashes": [],
-            }
-        )
+        # 單次走訪即累加總和與正負計數，不保留 netflow 明細；交易雜湊只留前幾筆。
+        grouped: Dict[Tuple[str, str, str], _EventBucket] = {}
+        normalize = self._normalize_address
 
         for event in events:
-            chain = event.token.chain or event.chain or ""
-            address = self._normalize_address(event.token.address)
-            symbol = event.token.symbol
-            key = (chain, address, symbol)
-            bucket = grouped[key]
-            bucket["event_count"] += 1
-            if event.wallet and event.wallet.address:
-                bucket["wallets"].add(event.wallet.address.lower())
-            usd_notional = event.features.usd_notional or 0.0
-            bucket["total_usd_notional"] += float(usd_notional)
-            if event.features.smart_money_netflow is not None:
-                bucket["netflow_values"].append(float(event.features.smart_money_netflow))
-            if event.tx_hash:
-                bucket["tx_hashes"].append(event.tx_hash)
+            token = event.token
+            key = (token.chain or event.chain or "", normalize(token.address), token.symbol)
+            bucket = grouped.get(key)
+            if bucket is None:
+                bucket = grouped[key] = _EventBucket()
+            bucket.event_count += 1
+            wallet = event.wallet
+            if wallet and wallet.address:
+                bucket.wallets.add(normalize(wallet.address))
+            features = event.features
+            bucket.total_usd_notional += float(features.usd_notional or 0.0)
+            netflow = features.smart_money_netflow
+            if netflow is not None:
+                netflow = float(netflow)
+                bucket.netflow_sum += netflow
+                if netflow > 0:
+                    bucket.netflow_positive += 1
+                elif netflow < 0:
+                    bucket.netflow_negative += 1
+            if event.tx_hash and len(bucket.tx_hashes) < _SAMPLE_TX_HASHES:
+                bucket.tx_hashes.append(event.tx_hash)
 
         summaries: Dict[Tuple[str, str, str], dict] = {}
         for key, bucket in grouped.items():
-            netflows = bucket["netflow_values"]
-            netflow_sum = sum(netflows) if netflows else 0.0
-            positive_count = sum(1 for value in netflows if value > 0)
-            negative_count = sum(1 for value in netflows if value < 0)
-            avg_notional = (
-                bucket["total_usd_notional"] / bucket["event_count"] if bucket["event_count"] else 0.0
-            )
+            netflow_sum = bucket.netflow_sum
+            positive_count = bucket.netflow_positive
+            negative_count = bucket.netflow_negative
             summaries[key] = {
-                "event_count": bucket["event_count"],
-                "wallet_count": len(bucket["wallets"]),
-                "total_usd_notional": bucket["total_usd_notional"],
-                "average_usd_notional": avg_notional,
+                "event_count": bucket.event_count,
+                "wallet_count": len(bucket.wallets),
+                "total_usd_notional": bucket.total_usd_notional,
+                "average_usd_notional": bucket.total_usd_notional / bucket.event_count,
                 "netflow_sum": netflow_sum,
                 "netflow_positive": positive_count,
                 "netflow_negative": negative_count,
                 "netflow_summary": f"sum={netflow_sum:.2f}, +={positive_count}, -={negative_count}",
-                "sample_tx_hashes": bucket["tx_hashes"][:5],
+                "sample_tx_hashes": bucket.tx_hashes,
             }
         return summaries
 
@@ -118,4 +164,7 @@ class TokenOverviewService:
     def _normalize_address(address: Any) -> str:
         if not address:
             return ""
-        return str(address).lower()
+        # 地址多半已是小寫字串，直接略過 lower()；intern 後作為 dict key 比對較快。
+        if type(address) is str and address.islower():
+            return sys.intern(address)
+        return sys.intern(str(address).lower())
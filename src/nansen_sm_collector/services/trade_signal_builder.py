@@ -1,10 +1,216 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Any, List, Optional, Sequence
 
+from .token_overview import OverviewRow
 
-@dataclass
+try:  # numpy / numba 為選用相依套件，未安裝時退回純 Python 計算
+    import numpy as np
+except ImportError:  # pragma: no cover - 依執行環境而定
+    np = None
+
+try:
+    from numba import njit
+    from numba.extending import register_jitable
+except ImportError:  # pragma: no cover - 依執行環境而定
+    njit = None
+
+    def register_jitable(func):
+        return func
+
+_NUMPY_AVAILABLE = np is not None
+_NUMBA_AVAILABLE = _NUMPY_AVAILABLE and njit is not None
+
+# 標的數量達此門檻才改用陣列版本（numba JIT 或 NumPy 向量化），
+# 少量時編譯與陣列轉換成本高於計算本身。
+_VECTOR_MIN_BATCH = 512
+
+_WEIGHT_MARKET = 0.5
+_WEIGHT_LIQUIDITY = 0.2
+_WEIGHT_SMART = 0.3
+
+_NAN = float("nan")
+_INF = float("inf")
+
+
+def _to_float(value: Any) -> float:
+    """轉成 float；缺值或無法轉換時回傳 NaN 作為「無分數」標記。"""
+
+    if value is None:
+        return _NAN
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return _NAN
+    # 原始值本身為 NaN 時，逐筆版本的夾值會得到 1.0，以 +inf 表示以維持相同結果。
+    return _INF if numeric != numeric else numeric
+
+
+@register_jitable
+def _linear_score(value: float, min_value: float, max_value: float) -> float:
+    if value != value or max_value <= min_value:
+        return _NAN
+    if value <= min_value:
+        return 0.0
+    if value >= max_value:
+        return 1.0
+    return (value - min_value) / (max_value - min_value)
+
+
+@register_jitable
+def _mean_present(first: float, second: float, third: float) -> float:
+    # 固定三項直接展開，不為每筆標的建立暫時的 tuple。
+    total = 0.0
+    count = 0
+    if first == first:
+        total += first
+        count += 1
+    if second == second:
+        total += second
+        count += 1
+    if third == third:
+        total += third
+        count += 1
+    return total / count if count else _NAN
+
+
+def _score_kernel(
+    volume,
+    netflow,
+    price_change,
+    liquidity,
+    smart_notional,
+    smart_netflow,
+    smart_events,
+    market_out,
+    liquidity_out,
+    smart_out,
+    composite_out,
+    volume_min,
+    volume_max,
+    netflow_min,
+    netflow_max,
+    price_change_min,
+    price_change_max,
+    liquidity_min,
+    liquidity_max,
+    notional_min,
+    notional_max,
+    smart_netflow_min,
+    smart_netflow_max,
+    events_min,
+    events_max,
+):
+    """逐筆計算各分項與綜合分數，缺值以 NaN 表示，結果寫入 *_out。"""
+
+    for index in range(len(volume)):
+        market = _mean_present(
+            _linear_score(volume[index], volume_min, volume_max),
+            _linear_score(netflow[index], netflow_min, netflow_max),
+            _linear_score(price_change[index], price_change_min, price_change_max),
+        )
+        liquidity_score = _linear_score(liquidity[index], liquidity_min, liquidity_max)
+        smart = _mean_present(
+            _linear_score(smart_notional[index], notional_min, notional_max),
+            _linear_score(smart_netflow[index], smart_netflow_min, smart_netflow_max),
+            _linear_score(smart_events[index], events_min, events_max),
+        )
+
+        accum = 0.0
+        total_weight = 0.0
+        if market == market:
+            accum += market * _WEIGHT_MARKET
+            total_weight += _WEIGHT_MARKET
+        if liquidity_score == liquidity_score:
+            accum += liquidity_score * _WEIGHT_LIQUIDITY
+            total_weight += _WEIGHT_LIQUIDITY
+        if smart == smart:
+            accum += smart * _WEIGHT_SMART
+            total_weight += _WEIGHT_SMART
+
+        market_out[index] = market
+        liquidity_out[index] = liquidity_score
+        smart_out[index] = smart
+        composite_out[index] = accum / total_weight if total_weight > 0 else 0.0
+
+
+# 不開 fastmath：缺值以 NaN 表示，fastmath 假設沒有 NaN 會讓判斷失效。
+_score_kernel_jit = njit(cache=True)(_score_kernel) if _NUMBA_AVAILABLE else None
+
+
+def _linear_score_vectorized(values, min_value: float, max_value: float):
+    if max_value <= min_value:
+        return np.full(values.shape, np.nan)
+    ratio = (values - min_value) / (max_value - min_value)
+    return np.where(values <= min_value, 0.0, np.where(values >= max_value, 1.0, ratio))
+
+
+def _mean_present_vectorized(first, second, third):
+    present = [~np.isnan(scores) for scores in (first, second, third)]
+    total = 0.0
+    for scores, mask in zip((first, second, third), present):
+        total = total + np.where(mask, scores, 0.0)
+    count = present[0].astype(np.int64) + present[1] + present[2]
+    return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def _score_vectorized(
+    volume,
+    netflow,
+    price_change,
+    liquidity,
+    smart_notional,
+    smart_netflow,
+    smart_events,
+    market_out,
+    liquidity_out,
+    smart_out,
+    composite_out,
+    volume_min,
+    volume_max,
+    netflow_min,
+    netflow_max,
+    price_change_min,
+    price_change_max,
+    liquidity_min,
+    liquidity_max,
+    notional_min,
+    notional_max,
+    smart_netflow_min,
+    smart_netflow_max,
+    events_min,
+    events_max,
+):
+    """與 _score_kernel 相同規則的 NumPy 版本，加總順序一致以維持相同結果。"""
+
+    market_out[:] = _mean_present_vectorized(
+        _linear_score_vectorized(volume, volume_min, volume_max),
+        _linear_score_vectorized(netflow, netflow_min, netflow_max),
+        _linear_score_vectorized(price_change, price_change_min, price_change_max),
+    )
+    liquidity_out[:] = _linear_score_vectorized(liquidity, liquidity_min, liquidity_max)
+    smart_out[:] = _mean_present_vectorized(
+        _linear_score_vectorized(smart_notional, notional_min, notional_max),
+        _linear_score_vectorized(smart_netflow, smart_netflow_min, smart_netflow_max),
+        _linear_score_vectorized(smart_events, events_min, events_max),
+    )
+
+    accum = 0.0
+    total_weight = 0.0
+    for scores, weight in (
+        (market_out, _WEIGHT_MARKET),
+        (liquidity_out, _WEIGHT_LIQUIDITY),
+        (smart_out, _WEIGHT_SMART),
+    ):
+        present = ~np.isnan(scores)
+        accum = accum + np.where(present, scores * weight, 0.0)
+        total_weight = total_weight + np.where(present, weight, 0.0)
+    composite_out[:] = np.where(total_weight > 0, accum / np.where(total_weight > 0, total_weight, 1.0), 0.0)
+
+
+@dataclass(slots=True)
 class TradeCandidate:
     token_symbol: str
     token_address: str | None
@@ -14,7 +220,11 @@ class TradeCandidate:
     liquidity_score: float | None
     smart_money_score: float | None
     has_smart_money: bool
-    raw: dict
+    raw: OverviewRow
+
+
+def _candidate_rank(candidate: TradeCandidate) -> tuple[float, float]:
+    return (candidate.composite_score, candidate.market_score or 0.0)
 
 
 class TradeSignalBuilder:
@@ -41,170 +251,135 @@ class TradeSignalBuilder:
         self._smart_netflow_range = smart_netflow_range
         self._smart_event_range = smart_event_range
 
-    def build(self, overview: Sequence[dict]) -> dict:
-        candidates: List[TradeCandidate] = []
-        for entry in overview:
-            candidate = self._score_entry(entry)
-            if candidate:
-                candidates.append(candidate)
-
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda item: (
-                item.composite_score,
-                item.market_score or 0.0,
-            ),
-            reverse=True,
-        )
+    def build(self, overview: Sequence[OverviewRow], *, include_all: bool = True) -> dict:
+        """評分並排序標的；``include_all=False`` 時只為兩組前 N 名建立 payload，結果不含 ``all``。"""
 
-        with_smart = [c for c in sorted_candidates if c.has_smart_money]
-        without_smart = [c for c in sorted_candidates if not c.has_smart_money]
+        candidates = self._score_entries(overview)
+        top_n = self._top_n
 
-        return {
-            "all": [self._to_payload(item) for item in sorted_candidates],
-            "with_smart_money": [
-                self._to_payload(item) for item in with_smart[: self._top_n]
-            ],
-            "without_smart_money": [
-                self._to_payload(item) for item in without_smart[: self._top_n]
-            ],
-        }
-
-    def _score_entry(self, entry: dict) -> Optional[TradeCandidate]:
-        token_symbol = entry.get("token_symbol") or ""
-        token_address = entry.get("token_address")
-        chain = entry.get("chain") or ""
-        market = entry.get("market") or {}
-        smart = entry.get("smart_money") or {}
-
-        market_score = self._score_market(market)
-        liquidity_score = self._score_liquidity(market)
-        smart_money_score = self._score_smart_money(smart)
-
-        composite = self._combine_scores(
-            {
-                "market": (market_score, 0.5),
-                "liquidity": (liquidity_score, 0.2),
-                "smart": (smart_money_score, 0.3),
+        if not include_all:
+            # 不需要完整排名時，各組以 heap 取前 N 名，不排序整份清單。
+            with_smart = heapq.nlargest(
+                top_n, (c for c in candidates if c.has_smart_money), key=_candidate_rank
+            )
+            without_smart = heapq.nlargest(
+                top_n, (c for c in candidates if not c.has_smart_money), key=_candidate_rank
+            )
+            return {
+                "with_smart_money": [self._to_payload(item) for item in with_smart],
+                "without_smart_money": [self._to_payload(item) for item in without_smart],
             }
-        )
 
-        if composite <= 0:
-            return None
+        sorted_candidates = sorted(candidates, key=_candidate_rank, reverse=True)
+        payloads = [self._to_payload(item) for item in sorted_candidates]
 
-        return TradeCandidate(
-            token_symbol=token_symbol,
-            token_address=token_address,
-            chain=chain,
-            composite_score=round(composite, 4),
-            market_score=self._round_or_none(market_score),
-            liquidity_score=self._round_or_none(liquidity_score),
-            smart_money_score=self._round_or_none(smart_money_score),
-            has_smart_money=bool(smart.get("event_count")),
-            raw=entry,
-        )
-
-    def _score_market(self, market: dict) -> Optional[float]:
-        scores: List[float] = []
-        volume = market.get("volume")
-        netflow = market.get("netflow")
-        price_change = market.get("price_change")
-
-        vol_score = self._linear_score(volume, *self._volume_range)
-        if vol_score is not None:
-            scores.append(vol_score)
-
-        netflow_score = self._linear_score(netflow, *self._netflow_range)
-        if netflow_score is not None:
-            scores.append(netflow_score)
+        # 兩組前 N 名直接依排序結果取出，與 "all" 共用同一份 payload。
+        with_smart_payloads: List[dict] = []
+        without_smart_payloads: List[dict] = []
+        for item, payload in zip(sorted_candidates, payloads):
+            group = with_smart_payloads if item.has_smart_money else without_smart_payloads
+            if len(group) < top_n:
+                group.append(payload)
+            elif len(with_smart_payloads) >= top_n and len(without_smart_payloads) >= top_n:
+                break
 
-        price_score = self._linear_score(price_change, *self._price_change_range)
-        if price_score is not None:
-            scores.append(price_score)
-
-        if not scores:
-            return None
-        return sum(scores) / len(scores)
+        return {
+            "all": payloads,
+            "with_smart_money": with_smart_payloads,
+            "without_smart_money": without_smart_payloads,
+        }
 
-    def _score_liquidity(self, market: dict) -> Optional[float]:
-        liquidity = market.get("liquidity")
-        if liquidity is None:
-            return None
-        return self._linear_score(liquidity, *self._liquidity_range)
+    def _score_entries(self, overview: Sequence[OverviewRow]) -> List[TradeCandidate]:
+        """以欄位陣列一次計算所有標的分數，只為綜合分數大於 0 者建立候選。"""
 
-    def _score_smart_money(self, smart: dict) -> Optional[float]:
-        if not smart:
-            return None
+        count = len(overview)
+        if not count:
+            return []
 
-        scores: List[float] = []
+        # 單次走訪抽出各欄位（SoA），缺值為 NaN。
+        volume: List[float] = []
+        netflow: List[float] = []
+        price_change: List[float] = []
+        liquidity: List[float] = []
+        smart_notional: List[float] = []
+        smart_netflow: List[float] = []
+        smart_events: List[float] = []
+        for entry in overview:
+            market = entry.market
+            smart = entry.smart_money
+            volume.append(_to_float(market.get("volume")))
+            netflow.append(_to_float(market.get("netflow")))
+            price_change.append(_to_float(market.get("price_change")))
+            liquidity.append(_to_float(market.get("liquidity")))
+            smart_notional.append(_to_float(smart.get("total_usd_notional")))
+            smart_netflow.append(_to_float(smart.get("netflow_sum")))
+            smart_events.append(_to_float(smart.get("event_count")))
 
-        notional = smart.get("total_usd_notional")
-        notional_score = self._linear_score(
-            notional,
-            *self._smart_notional_range,
+        columns: tuple[Any, ...] = (
+            volume,
+            netflow,
+            price_change,
+            liquidity,
+            smart_notional,
+            smart_netflow,
+            smart_events,
         )
-        if notional_score is not None:
-            scores.append(notional_score)
+        vectorized = _NUMPY_AVAILABLE and count >= _VECTOR_MIN_BATCH
+        if vectorized:
+            columns = tuple(np.asarray(column, dtype=np.float64) for column in columns)
+            outputs: tuple[Any, ...] = tuple(np.empty(count, dtype=np.float64) for _ in range(4))
+            kernel = _score_kernel_jit if _NUMBA_AVAILABLE else _score_vectorized
+        else:
+            outputs = tuple([0.0] * count for _ in range(4))
+            kernel = _score_kernel
 
-        netflow_sum = smart.get("netflow_sum")
-        netflow_score = self._linear_score(
-            netflow_sum,
+        kernel(
+            *columns,
+            *outputs,
+            *self._volume_range,
+            *self._netflow_range,
+            *self._price_change_range,
+            *self._liquidity_range,
+            *self._smart_notional_range,
             *self._smart_netflow_range,
-        )
-        if netflow_score is not None:
-            scores.append(netflow_score)
-
-        event_count = smart.get("event_count")
-        event_score = self._linear_score(
-            event_count,
             *self._smart_event_range,
         )
-        if event_score is not None:
-            scores.append(event_score)
 
-        if not scores:
-            return None
-        return sum(scores) / len(scores)
+        market_scores, liquidity_scores, smart_scores, composites = outputs
+        if vectorized:
+            # 以遮罩一次找出綜合分數大於 0 的索引，分數為 0 的標的不進 Python 迴圈；
+            # 分項轉成 list 後逐筆取值，避免反覆建立 numpy 純量。
+            indices = np.flatnonzero(composites > 0).tolist()
+            market_scores, liquidity_scores, smart_scores, composites = (
+                column.tolist() for column in outputs
+            )
+        else:
+            indices = [index for index in range(count) if composites[index] > 0]
 
-    @staticmethod
-    def _linear_score(
-        value: Optional[float],
-        min_value: float,
-        max_value: float,
-    ) -> Optional[float]:
-        if value is None:
-            return None
-        try:
-            numeric = float(value)
-        except (TypeError, ValueError):
-            return None
-        if max_value <= min_value:
-            return None
-        if numeric <= min_value:
-            return 0.0
-        if numeric >= max_value:
-            return 1.0
-        ratio = (numeric - min_value) / (max_value - min_value)
-        return max(0.0, min(1.0, ratio))
-
-    @staticmethod
-    def _combine_scores(weighted_scores: Dict[str, tuple[Optional[float], float]]) -> float:
-        total_weight = 0.0
-        accum = 0.0
-        for score, weight in weighted_scores.values():
-            if score is None or weight <= 0:
-                continue
-            accum += score * weight
-            total_weight += weight
-        if total_weight <= 0:
-            return 0.0
-        return accum / total_weight
+        candidates: List[TradeCandidate] = []
+        for index in indices:
+            entry = overview[index]
+            composite = composites[index]
+            candidates.append(
+                TradeCandidate(
+                    token_symbol=entry.token_symbol or "",
+                    token_address=entry.token_address,
+                    chain=entry.chain or "",
+                    composite_score=round(composite, 4),
+                    market_score=self._round_or_none(market_scores[index]),
+                    liquidity_score=self._round_or_none(liquidity_scores[index]),
+                    smart_money_score=self._round_or_none(smart_scores[index]),
+                    has_smart_money=bool(entry.smart_money.get("event_count")),
+                    raw=entry,
+                )
+            )
+        return candidates
 
     @staticmethod
-    def _round_or_none(value: Optional[float]) -> Optional[float]:
-        if value is None:
+    def _round_or_none(value: float) -> Optional[float]:
+        if value != value:
             return None
-        return round(value, 4)
+        return round(float(value), 4)
 
     @staticmethod
     def _to_payload(candidate: TradeCandidate) -> dict:
@@ -218,6 +393,6 @@ class TradeSignalBuilder:
             "smart_money_score": candidate.smart_money_score,
             "has_smart_money": candidate.has_smart_money,
         }
-        payload["market"] = candidate.raw.get("market")
-        payload["smart_money"] = candidate.raw.get("smart_money")
+        payload["market"] = candidate.raw.market
+        payload["smart_money"] = candidate.raw.smart_money
         return payload
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, List, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Sequence
 from zoneinfo import ZoneInfo
 
 from ..adapters.gecko_terminal import GeckoTerminalClient
 from ..core.types import Signal
 from ..core.utils import utc_now
+from ..data import schemas
 from ..data.repos import SimulatedTradeRepository
 
+# 各鏈報價請求彼此獨立，以有限的執行緒數同時發出。
+_MAX_CONCURRENT_REQUESTS = 8
+
 
 class TradeSimulator:
     """紀錄模擬買入並在達到目標時賣出。"""
@@ -26,42 +31,49 @@ class TradeSimulator:
         self._timezone = timezone
 
     def process_signals(self, signals: Sequence[Signal]) -> Dict[str, int]:
-        opened = self._open_trades(signals)
-        closed = self._close_trades()
-        return {"opened": opened, "closed": closed}
+        # 開倉候選與既有未平倉部位的地址合併，每條鏈只查一次報價，開倉與平倉共用。
+        # 資料庫中的地址一律小寫，候選地址在此轉換一次後一路沿用。
+        candidates: List[tuple[Signal, str]] = []
+        grouped: Dict[str, List[str]] = defaultdict(list)
+        for signal in signals:
+            token = signal.token
+            if not token.address or (signal.metadata or {}).get("signal_type", "buy") != "buy":
+                continue
+            address = token.address.lower()
+            candidates.append((signal, address))
+            grouped[token.chain or ""].append(address)
+        open_trades = self._repo.list_open_trades()
+        for trade in open_trades:
+            grouped[trade.chain or ""].append(trade.token_address)
+        prices_by_chain = self._fetch_prices_by_chain(
+            {chain: list(dict.fromkeys(addresses)) for chain, addresses in grouped.items()}
+        )
 
-    def _open_trades(self, signals: Sequence[Signal]) -> int:
-        candidates: List[Signal] = [
-            signal
-            for signal in signals
-            if (signal.metadata or {}).get("signal_type", "buy") == "buy"
-            and signal.token.address
-        ]
-        grouped: Dict[str, List[Signal]] = defaultdict(list)
-        for signal in candidates:
-            chain = signal.token.chain or ""
-            grouped[chain].append(signal)
+        opened_trades = self._open_trades(candidates, prices_by_chain)
+        closed = self._close_trades(open_trades + opened_trades, prices_by_chain)
+        return {"opened": len(opened_trades), "closed": closed}
 
-        opened = 0
-        for chain, group in grouped.items():
-            addresses = [s.token.address for s in group]
-            prices = self._fetch_prices(chain, addresses)
-            for signal in group:
-                address = signal.token.address
-                if not address:
-                    continue
-                if self._repo.get_open_trade(address, signal.token.chain):
-                    continue
-                price = prices.get(address.lower())
-                if price is None:
-                    continue
-                target_price = price * (1 + self._gain_threshold)
-                now_utc = utc_now()
-                now_local = now_utc.astimezone(self._timezone)
-                metadata = {
-                    "opened_from": (signal.metadata or {}).get("source_event", {}),
-                    "opened_at": now_local.isoformat(),
-                }
+    def _open_trades(
+        self,
+        candidates: Sequence[tuple[Signal, str]],
+        prices_by_chain: Mapping[str, Mapping[str, float]],
+    ) -> List[schemas.SimulatedTradeModel]:
+        # 同一輪開倉共用一個時間點。
+        now_utc = utc_now()
+        now_local = now_utc.astimezone(self._timezone)
+        opened: List[schemas.SimulatedTradeModel] = []
+        for signal, address in candidates:
+            if self._repo.get_open_trade(address, signal.token.chain):
+                continue
+            price = prices_by_chain.get(signal.token.chain or "", {}).get(address)
+            if price is None:
+                continue
+            target_price = price * (1 + self._gain_threshold)
+            metadata = {
+                "opened_from": signal.source_event_payload(),
+                "opened_at": now_local.isoformat(),
+            }
+            opened.append(
                 self._repo.create_trade(
                     token_address=address,
                     token_symbol=signal.token.symbol,
@@ -72,29 +84,22 @@ class TradeSimulator:
                     buy_time=now_utc,
                     buy_time_local=now_local,
                 )
-                opened += 1
+            )
         return opened
 
-    def _close_trades(self) -> int:
-        open_trades = self._repo.list_open_trades()
-        grouped: Dict[str | None, List[str]] = defaultdict(list)
-        for trade in open_trades:
-            grouped[trade.chain].append(trade.token_address)
-
-        prices_by_chain: Dict[tuple[str | None, str], float] = {}
-        for chain, addresses in grouped.items():
-            prices = self._fetch_prices(chain, addresses)
-            for address, price in prices.items():
-                prices_by_chain[(chain, address)] = price
-
+    def _close_trades(
+        self,
+        open_trades: Sequence[schemas.SimulatedTradeModel],
+        prices_by_chain: Mapping[str, Mapping[str, float]],
+    ) -> int:
+        now_utc = utc_now()
+        now_local = now_utc.astimezone(self._timezone)
         closed = 0
         for trade in open_trades:
-            price = prices_by_chain.get((trade.chain, trade.token_address.lower()))
+            price = prices_by_chain.get(trade.chain or "", {}).get(trade.token_address)
             if price is None:
                 continue
             if price >= trade.target_price:
-                now_utc = utc_now()
-                now_local = now_utc.astimezone(self._timezone)
                 self._repo.close_trade(trade, price, sell_time=now_utc, sell_time_local=now_local)
                 extra = trade.extra or {}
                 extra["closed_at"] = now_local.isoformat()
@@ -102,6 +107,21 @@ class TradeSimulator:
                 closed += 1
         return closed
 
+    def _fetch_prices_by_chain(
+        self,
+        groups: Mapping[str, Iterable[str]],
+    ) -> Dict[str, Dict[str, float]]:
+        """各鏈各查一次報價；多條鏈時同時發出請求，單鏈失敗只影響該鏈。"""
+
+        if len(groups) <= 1:
+            return {chain: self._fetch_prices(chain, addresses) for chain, addresses in groups.items()}
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, len(groups))) as executor:
+            futures = {
+                chain: executor.submit(self._fetch_prices, chain, addresses)
+                for chain, addresses in groups.items()
+            }
+            return {chain: future.result() for chain, future in futures.items()}
+
     def _fetch_prices(self, chain: str | None, addresses: Iterable[str]) -> Dict[str, float]:
         try:
             return self._price_client.get_prices(chain or "", addresses)
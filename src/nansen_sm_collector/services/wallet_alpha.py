@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque
-
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import sessionmaker
 
 from ..data import schemas
@@ -18,30 +16,19 @@ class WalletAlphaService:
     def score_wallet(self, address: str) -> float:
         """回傳介於 0 與 1 之間的簡易 Alpha 分數。"""
 
+        # 最近 lookback 筆事件中 usd_notional > 0 的比例，直接在資料庫計算，不載入事件內容。
+        usd_notional = schemas.EventModel.features["usd_notional"].as_float()
+        recent = (
+            select(case((usd_notional > 0, 1.0), else_=0.0).label("hit"))
+            .join(schemas.WalletModel, schemas.WalletModel.id == schemas.EventModel.wallet_id)
+            .where(schemas.WalletModel.address == address)
+            .order_by(schemas.EventModel.occurred_at.desc())
+            .limit(self._lookback)
+            .subquery()
+        )
         with self._session_factory() as session:
-            wallet = (
-                session.query(schemas.WalletModel)
-                .filter(schemas.WalletModel.address == address)
-                .one_or_none()
-            )
-            if wallet is None:
-                return 0.0
-
-            events = (
-                session.query(schemas.EventModel)
-                .filter(schemas.EventModel.wallet_id == wallet.id)
-                .order_by(schemas.EventModel.occurred_at.desc())
-                .limit(self._lookback)
-                .all()
-            )
-
-        if not events:
-            return 0.0
+            alpha = session.execute(select(func.avg(recent.c.hit))).scalar()
 
-        scores: Deque[float] = deque(maxlen=self._lookback)
-        for event in events:
-            usd_notional = event.features.get("usd_notional", 0)
-            scores.append(1.0 if usd_notional and usd_notional > 0 else 0.0)
-
-        alpha = sum(scores) / len(scores)
-        return round(alpha, 4)
+        if alpha is None:
+            return 0.0
+        return round(float(alpha), 4)
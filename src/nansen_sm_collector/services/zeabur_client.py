@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import time
 from typing import Any, Optional, Sequence
 
 import httpx
 
 
+# 控制面板連續點擊時，短時間內重複查詢排程狀態直接沿用上一次結果。
+_STATUS_CACHE_SECONDS = 5.0
+
+
 class ZeaburAPIError(RuntimeError):
     """Raised when Zeabur API requests fail."""
 
@@ -37,6 +42,13 @@ class ZeaburAPIClient:
         self._environment_id = environment_id
         self._pipeline_command = pipeline_command
         self._timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._status_cache: tuple[float, dict[str, Any]] | None = None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def trigger_pipeline_once(self, command: Optional[str] = None) -> dict[str, Any]:
         cmd = command or self._pipeline_command
@@ -50,13 +62,19 @@ class ZeaburAPIClient:
             "RUN_LOOP_INTERVAL_SECONDS="
             f"{seconds} nohup python scripts/run_loop.py > /tmp/nansen_run_loop.log 2>&1 & echo RUN_LOOP_STARTED"
         )
+        self._status_cache = None
         return await self._execute_bash(command)
 
     async def stop_scheduler(self) -> dict[str, Any]:
         command = 'pkill -f "python scripts/run_loop.py" || true'
+        self._status_cache = None
         return await self._execute_bash(command)
 
     async def fetch_scheduler_status(self) -> dict[str, Any]:
+        if self._status_cache is not None:
+            cached_at, cached = self._status_cache
+            if time.monotonic() - cached_at < _STATUS_CACHE_SECONDS:
+                return cached
         command = (
             'if pgrep -f "python scripts/run_loop.py" >/dev/null; '
             'then echo "running"; else echo "idle"; fi'
@@ -64,11 +82,13 @@ class ZeaburAPIClient:
         result = await self._execute_bash(command)
         output_text = result.get("output", "")
         lines = [line.strip() for line in output_text.replace("\r\n", "\n").split("\n") if line.strip()]
-        return {
+        status = {
             "status": lines[-1] if lines else "unknown",
             "exit_code": result.get("exit_code"),
             "raw": result,
         }
+        self._status_cache = (time.monotonic(), status)
+        return status
 
     async def execute_command(self, command: Sequence[str]) -> dict[str, Any]:
         if not self._service_id or not self._environment_id:
@@ -96,12 +116,7 @@ class ZeaburAPIClient:
     async def _graphql_request(self, payload: dict[str, Any]) -> dict[str, Any]:
         if not self._token:
             raise ZeaburAPIError("ZEABUR_API_TOKEN is not configured")
-        headers = {
-            "Authorization": f"Bearer {self._token}",
-            "Content-Type": "application/json",
-        }
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(self._graphql_url, headers=headers, json=payload)
+        response = await self._get_client().post(self._graphql_url, json=payload)
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
@@ -115,3 +130,15 @@ class ZeaburAPIClient:
         if errors := data.get("errors"):
             raise ZeaburAPIError(str(errors))
         return data.get("data") or {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # 連線池綁定事件迴圈，於第一次請求（已在迴圈內）時建立，之後的輪詢重複使用連線。
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                headers={
+                    "Authorization": f"Bearer {self._token}",
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._client
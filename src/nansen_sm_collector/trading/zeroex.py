@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
 from datetime import datetime
 from decimal import Decimal, InvalidOperation, ROUND_DOWN
-from typing import Any, Dict, Literal, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Literal, Optional
 from zoneinfo import ZoneInfo
 
 import httpx
+import orjson
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
 from httpx import Response
 from sqlalchemy.orm import sessionmaker
 from web3 import Web3
 from web3.contract import Contract
 from web3.exceptions import ContractLogicError
 
+try:  # faster-eth-utils 為選用相依套件，以編譯版本計算 checksum，介面與 eth_utils 相同
+    from faster_eth_utils import to_checksum_address
+except ImportError:  # pragma: no cover - 依執行環境而定
+    from eth_utils import to_checksum_address
+
 from ..core.utils import utc_now
 from ..data.db import session_scope
 from ..data.repos import ExecutedTradeRepository
@@ -59,6 +73,37 @@ BASE_TOKEN_REGISTRY: dict[int, dict[str, TokenInfo]] = {
 }
 
 
+# checksum 需對地址做 keccak256，每筆 swap 會對同幾個地址重複計算，結果快取。
+# 以小寫地址為鍵，同一地址不論來源大小寫都只計算一次。
+@lru_cache(maxsize=4096)
+def _checksum_lower(address_lower: str) -> str:
+    return to_checksum_address(address_lower)
+
+
+def _checksum_address(address: str) -> str:
+    return _checksum_lower(address.lower())
+
+
+# 登錄表地址預先轉成 checksum 格式（同時預先填入快取），比對時不必每次重算。
+BASE_TOKEN_REGISTRY = {
+    chain_id: {
+        symbol: replace(info, address=_checksum_address(info.address))
+        for symbol, info in tokens.items()
+    }
+    for chain_id, tokens in BASE_TOKEN_REGISTRY.items()
+}
+
+# 攤平成單層查表，每筆 swap 只需一次 dict 查詢。
+_BASE_TOKENS: dict[tuple[int, str], TokenInfo] = {
+    (chain_id, symbol): info
+    for chain_id, tokens in BASE_TOKEN_REGISTRY.items()
+    for symbol, info in tokens.items()
+}
+_USDC_BY_CHAIN: dict[int, TokenInfo] = {
+    chain_id: tokens["USDC"] for chain_id, tokens in BASE_TOKEN_REGISTRY.items() if "USDC" in tokens
+}
+
+
 ERC20_ABI: list[dict[str, Any]] = [
     {
         "constant": True,
@@ -95,7 +140,60 @@ ERC20_ABI: list[dict[str, Any]] = [
 ]
 
 
+# 熱路徑上的 ERC20 唯讀呼叫直接組 calldata 走 eth_call，不經過合約物件的 ABI 編解碼。
+_SELECTOR_DECIMALS = bytes.fromhex("313ce567")
+_SELECTOR_ALLOWANCE = bytes.fromhex("dd62ed3e")
+_SELECTOR_APPROVE = bytes.fromhex("095ea7b3")
+
+
 INTEGRATOR_FEE_RATE = Decimal("0.0015")
+# 手續費以整數運算：費率拆成分子 / 分母，USDC 手續費取到小數第 8 位（無條件捨去）。
+_FEE_RATE_NUMERATOR, _FEE_RATE_DENOMINATOR = INTEGRATOR_FEE_RATE.as_integer_ratio()
+_FEE_USDC_DECIMALS = 8
+
+# 手續費用的 USDC 估價在此秒數內沿用上一次的匯率，同一代幣連續交易時不必再問一次 0x。
+_USDC_RATE_CACHE_SECONDS = 15.0
+
+_CONNECT_TIMEOUT = 5.0
+
+# 等待收據時查詢 eth_getTransactionReceipt 的間隔（秒）。web3 預設 0.1 秒，
+# 一個區塊內會發出數十次請求；交易已送出，晚一秒記錄結果不影響成交。
+_RECEIPT_POLL_INTERVAL = 1.0
+
+# 連線池上限；0x API 有速率限制，同時進行的請求維持在小範圍即可。
+# 閒置連線保留 60 秒，連續交易之間不必重新 TLS 握手。
+_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=60.0,
+)
+
+
+_STORED_RESPONSE_KEYS = ("sellAmount", "buyAmount", "zid", "allowanceTarget")
+
+
+def _project_response(response: dict) -> dict:
+    """只保留交易紀錄會用到的 0x 回應欄位（數量、報價 ID、授權對象）。"""
+
+    projected = {key: response[key] for key in _STORED_RESPONSE_KEYS if key in response}
+    allowance_issue = (response.get("issues") or {}).get("allowance")
+    if allowance_issue:
+        projected["issues"] = {"allowance": allowance_issue}
+    return projected
+
+
+# eth-account 0.13 起改名為 raw_transaction，舊版為 rawTransaction；載入時決定一次。
+_RAW_TX_ATTR = "raw_transaction" if hasattr(SignedTransaction, "raw_transaction") else "rawTransaction"
+
+_NUMERIC_TX_KEYS = frozenset({"gas", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas", "value"})
+
+
+def _parse_int(value: Any) -> int:
+    """交易數值欄位可能是十進位或 0x 開頭的十六進位字串，都轉成 int。"""
+
+    if isinstance(value, str) and value.startswith("0x"):
+        return int(value, 16)
+    return int(value)
 
 
 class ZeroExAPIError(RuntimeError):
@@ -134,9 +232,9 @@ class SwapRequest:
             self.quote_token_symbol = self.quote_token_symbol.upper()
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class SwapContext:
-    """內部使用的 Swap 執行資訊。"""
+    """內部使用的 Swap 執行資訊；建立後不再變動。"""
 
     base_token: TokenInfo
     quote_token_symbol: str
@@ -147,7 +245,7 @@ class SwapContext:
     buy_token_address: str
     buy_token_decimals: Optional[int]
     sell_amount: str
-    sell_amount_decimal: Optional[Decimal]
+    sell_amount_decimal: Decimal
     direction: TradeDirection
 
 
@@ -175,22 +273,54 @@ class ZeroExSwapClient:
         version: str = "v2",
         timeout: float = 20.0,
         client: Optional[httpx.Client] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         self._api_key = api_key
         self._version = version
-        self._client = client or httpx.Client(base_url=base_url, timeout=timeout)
+        self._base_url = base_url
+        self._timeout = timeout
+        self._headers = {
+            "0x-api-key": api_key,
+            "0x-version": version,
+        }
+        # 同一筆 swap 的報價、估價與 quote 共用 HTTP/2 持久連線。
+        self._client = client or httpx.Client(
+            base_url=base_url,
+            http2=True,
+            timeout=self._timeout_config(),
+            limits=_CONNECTION_LIMITS,
+        )
         self._owns_client = client is None
+        # 非同步用戶端延遲建立，只走同步 API 時不開連線池。
+        self._async_client = async_client
+        self._owns_async_client = async_client is None
+
+    def _timeout_config(self) -> httpx.Timeout:
+        # 連線建立失敗應盡快回報，不必等滿整體逾時。
+        return httpx.Timeout(self._timeout, connect=min(self._timeout, _CONNECT_TIMEOUT))
 
     def close(self) -> None:
         if self._owns_client:
             self._client.close()
 
+    async def aclose(self) -> None:
+        if self._owns_async_client and self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def __enter__(self) -> "ZeroExSwapClient":
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
+    async def __aenter__(self) -> "ZeroExSwapClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+        self.close()
+
     def get_price(
         self,
         *,
@@ -201,15 +331,7 @@ class ZeroExSwapClient:
         taker: str,
         slippage_bps: Optional[int] = None,
     ) -> dict:
-        params = {
-            "chainId": str(chain_id),
-            "sellToken": sell_token,
-            "buyToken": buy_token,
-            "sellAmount": sell_amount,
-            "taker": taker,
-        }
-        if slippage_bps is not None:
-            params["slippageBps"] = str(slippage_bps)
+        params = self._swap_params(chain_id, sell_token, buy_token, sell_amount, taker, slippage_bps)
         return self._request("GET", "/swap/allowance-holder/price", params=params)
 
     def get_quote(
@@ -221,6 +343,44 @@ class ZeroExSwapClient:
         sell_amount: str,
         taker: str,
         slippage_bps: Optional[int] = None,
+    ) -> dict:
+        params = self._swap_params(chain_id, sell_token, buy_token, sell_amount, taker, slippage_bps)
+        return self._request("GET", "/swap/allowance-holder/quote", params=params)
+
+    async def aget_price(
+        self,
+        *,
+        chain_id: int,
+        sell_token: str,
+        buy_token: str,
+        sell_amount: str,
+        taker: str,
+        slippage_bps: Optional[int] = None,
+    ) -> dict:
+        params = self._swap_params(chain_id, sell_token, buy_token, sell_amount, taker, slippage_bps)
+        return await self._arequest("GET", "/swap/allowance-holder/price", params=params)
+
+    async def aget_quote(
+        self,
+        *,
+        chain_id: int,
+        sell_token: str,
+        buy_token: str,
+        sell_amount: str,
+        taker: str,
+        slippage_bps: Optional[int] = None,
+    ) -> dict:
+        params = self._swap_params(chain_id, sell_token, buy_token, sell_amount, taker, slippage_bps)
+        return await self._arequest("GET", "/swap/allowance-holder/quote", params=params)
+
+    @staticmethod
+    def _swap_params(
+        chain_id: int,
+        sell_token: str,
+        buy_token: str,
+        sell_amount: str,
+        taker: str,
+        slippage_bps: Optional[int],
     ) -> dict:
         params = {
             "chainId": str(chain_id),
@@ -231,29 +391,48 @@ class ZeroExSwapClient:
         }
         if slippage_bps is not None:
             params["slippageBps"] = str(slippage_bps)
-        return self._request("GET", "/swap/allowance-holder/quote", params=params)
+        return params
 
     def _request(self, method: str, path: str, *, params: Optional[dict] = None) -> dict:
-        headers = {
-            "0x-api-key": self._api_key,
-            "0x-version": self._version,
-        }
         try:
-            response: Response = self._client.request(method, path, params=params, headers=headers)
+            response: Response = self._client.request(method, path, params=params, headers=self._headers)
         except httpx.HTTPError as exc:  # pragma: no cover - 網路錯誤
             raise ZeroExAPIError(f"0x API request failed: {exc}") from exc
+        return self._parse_response(response)
 
+    async def _arequest(self, method: str, path: str, *, params: Optional[dict] = None) -> dict:
+        client = self._get_async_client()
+        try:
+            response: Response = await client.request(method, path, params=params, headers=self._headers)
+        except httpx.HTTPError as exc:  # pragma: no cover - 網路錯誤
+            raise ZeroExAPIError(f"0x API request failed: {exc}") from exc
+        return self._parse_response(response)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            # 同時進行的多筆 swap 共用連線池，以 HTTP/2 在單一連線上多工。
+            self._async_client = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=True,
+                timeout=self._timeout_config(),
+                limits=_CONNECTION_LIMITS,
+            )
+        return self._async_client
+
+    @staticmethod
+    def _parse_response(response: Response) -> dict:
+        # 報價回應含路徑與來源明細，以 orjson 直接解析 bytes，不經過 response.text 解碼。
         if response.status_code >= 400:
             message = response.text
             try:
-                payload = response.json()
+                payload = orjson.loads(response.content)
                 message = payload.get("message", message)
             except ValueError:
                 pass
             raise ZeroExAPIError(
                 f"0x API returned {response.status_code}: {message}",
             )
-        return response.json()
+        return orjson.loads(response.content)
 
 
 class ZeroExTradingService:
@@ -266,24 +445,62 @@ class ZeroExTradingService:
         *,
         timezone: str = "UTC",
         web3: Optional[Web3] = None,
+        persist_full_responses: bool = False,
     ) -> None:
         self._swap_client = swap_client
         self._session_factory = session_factory
         self._tz = ZoneInfo(timezone)
         self._web3 = web3
+        # 0x 回應含完整路徑與來源明細，預設只寫入服務會讀取的欄位；需要稽核時再保留全文。
+        self._persist_full_responses = persist_full_responses
+        # ERC20 的 symbol / decimals 不會變動，同一代幣重複交易時不再發 eth_call。
+        self._token_symbols: dict[str, str] = {}
+        self._token_decimals: dict[str, int] = {}
+        self._erc20_contracts: dict[str, Contract] = {}
+        # (chain_id, 地址) -> 下一筆可用的 nonce。首次查詢鏈上 pending 數量後在本地遞增，
+        # 連續交易不必每筆都查 eth_getTransactionCount；送出失敗時清除，下次重新查詢。
+        self._next_nonces: dict[tuple[int, str], int] = {}
+        # 只在確定 nonce 到廣播之間持有，避免多執行緒送出相同 nonce。
+        self._nonce_lock = threading.Lock()
+        self._accounts: dict[str, LocalAccount] = {}
+        # (chain_id, token, spender, owner) -> 扣除已送出交易用量後的剩餘 allowance。
+        self._allowances: dict[tuple[int, str, str, str], int] = {}
+        self._allowance_locks: dict[tuple[int, str, str, str], threading.Lock] = {}
+        # (chain_id, token) -> (取得時間, USDC 數量, 對應的賣出數量)，皆為最小單位。
+        self._usdc_rates: dict[tuple[int, str], tuple[float, int, int]] = {}
 
     def simulate_swap(self, request: SwapRequest) -> TradeResult:
         """執行虛擬交易，僅取得價格與路徑資訊。"""
 
         context = self._prepare_context(request)
-        price_response = self._swap_client.get_price(
-            chain_id=request.chain_id,
-            sell_token=context.sell_token_address,
-            buy_token=context.buy_token_address,
-            sell_amount=context.sell_amount,
-            taker=request.taker_address,
-            slippage_bps=request.slippage_bps,
+        price_response, sell_usdc_value = self._fetch_price_and_usdc_value(request, context)
+        return self._record_simulation(request, context, price_response, sell_usdc_value)
+
+    async def asimulate_swap(self, request: SwapRequest) -> TradeResult:
+        """``simulate_swap`` 的非同步版本，主要報價與手續費估價同時送出。"""
+
+        context = self._prepare_context(request)
+        price_response, sell_usdc_value = await asyncio.gather(
+            self._swap_client.aget_price(**self._price_params(request, context)),
+            self._aconvert_to_usdc_value(
+                chain_id=request.chain_id,
+                token_address=context.sell_token_address,
+                amount_raw=context.sell_amount,
+                taker=request.taker_address,
+            ),
+            return_exceptions=True,
         )
+        if isinstance(price_response, BaseException):
+            raise price_response
+        return self._record_simulation(request, context, price_response, sell_usdc_value)
+
+    def _record_simulation(
+        self,
+        request: SwapRequest,
+        context: SwapContext,
+        price_response: dict,
+        sell_usdc_value: int | BaseException,
+    ) -> TradeResult:
         timestamps = self._current_timestamps()
 
         buy_amount_str = price_response.get("buyAmount")
@@ -304,11 +521,11 @@ class ZeroExTradingService:
             context=context,
             buy_amount_str=buy_amount_str,
             buy_amount_decimal=buy_amount_decimal,
+            sell_usdc_value=sell_usdc_value,
         )
 
         with session_scope(self._session_factory) as session:
-            repo = ExecutedTradeRepository(session)
-            record = repo.create_record(
+            trade_id = ExecutedTradeRepository(session).insert_record(
                 mode="SIMULATION",
                 status="COMPLETED",
                 side=context.direction,
@@ -322,21 +539,20 @@ class ZeroExTradingService:
                 sell_amount=context.sell_amount,
                 sell_amount_decimal=self._decimal_to_float(context.sell_amount_decimal),
                 buy_amount=buy_amount_str,
-                buy_amount_decimal=self._decimal_to_float(buy_amount_decimal),
+                buy_amount_decimal=buy_amount_decimal,
                 price=price_value,
                 slippage_bps=request.slippage_bps,
-                integrator_fee_usdc=self._decimal_to_float(fee_usdc),
+                integrator_fee_usdc=fee_usdc,
                 allowance_target=self._extract_allowance_target(price_response),
                 quote_id=price_response.get("zid"),
                 tx_hash=None,
                 error_message=None,
-                price_response=price_response,
+                price_response=self._stored_response(price_response),
                 quote_response=None,
                 transaction_payload=None,
                 executed_at=timestamps["utc"],
                 executed_at_local=timestamps["local"],
             )
-            trade_id = record.id
 
         return TradeResult(
             trade_id=trade_id,
@@ -354,6 +570,7 @@ class ZeroExTradingService:
         private_key: str,
         wait_for_receipt: bool = True,
         receipt_timeout: int = 600,
+        receipt_poll_interval: float = _RECEIPT_POLL_INTERVAL,
     ) -> TradeResult:
         """真正送出交易到鏈上，並記錄結果。"""
 
@@ -361,14 +578,7 @@ class ZeroExTradingService:
             raise Web3NotConfiguredError("執行實際交易需要設定 Web3 提供者")
 
         context = self._prepare_context(request)
-        price_response = self._swap_client.get_price(
-            chain_id=request.chain_id,
-            sell_token=context.sell_token_address,
-            buy_token=context.buy_token_address,
-            sell_amount=context.sell_amount,
-            taker=request.taker_address,
-            slippage_bps=request.slippage_bps,
-        )
+        price_response, sell_usdc_value = self._fetch_price_and_usdc_value(request, context)
 
         timestamps_initial = self._current_timestamps()
         price_buy_amount_str = price_response.get("buyAmount")
@@ -389,9 +599,13 @@ class ZeroExTradingService:
             context=context,
             buy_amount_str=price_buy_amount_str,
             buy_amount_decimal=price_buy_amount_decimal,
+            sell_usdc_value=sell_usdc_value,
         )
 
-        with session_scope(self._session_factory) as session:
+        # 整筆交易共用同一個 Session：PENDING 紀錄先提交（送出上鏈前即落盤），
+        # 結束時直接更新同一物件再提交，不必重新開 Session 並以主鍵查回紀錄。
+        # 提交後 Session 即歸還連線，等待上鏈期間不佔用連線。
+        with self._session_factory() as session:
             repo = ExecutedTradeRepository(session)
             record = repo.create_record(
                 mode="LIVE",
@@ -407,128 +621,162 @@ class ZeroExTradingService:
                 sell_amount=context.sell_amount,
                 sell_amount_decimal=self._decimal_to_float(context.sell_amount_decimal),
                 buy_amount=price_buy_amount_str,
-                buy_amount_decimal=self._decimal_to_float(price_buy_amount_decimal),
+                buy_amount_decimal=price_buy_amount_decimal,
                 price=price_value,
                 slippage_bps=request.slippage_bps,
-                integrator_fee_usdc=self._decimal_to_float(fee_usdc),
+                integrator_fee_usdc=fee_usdc,
                 allowance_target=self._extract_allowance_target(price_response),
                 quote_id=price_response.get("zid"),
                 tx_hash=None,
                 error_message=None,
-                price_response=price_response,
+                price_response=self._stored_response(price_response),
                 quote_response=None,
                 transaction_payload=None,
                 executed_at=timestamps_initial["utc"],
                 executed_at_local=timestamps_initial["local"],
             )
+            session.commit()
             trade_id = record.id
 
-        allowance_tx_hash: Optional[str] = None
-        quote_response: Optional[dict] = None
-        tx_hash_hex: Optional[str] = None
-        error_message: Optional[str] = None
-        final_status: str = "PENDING"
-        buy_amount_str: Optional[str] = price_buy_amount_str
-        buy_amount_decimal = price_buy_amount_decimal
-        price_final = price_value
-        allowance_target = self._extract_allowance_target(price_response)
-        transaction_payload: Dict[str, Any] | None = None
-        fee_usdc: Optional[Decimal] = fee_usdc
+            allowance_tx_hash: Optional[str] = None
+            quote_response: Optional[dict] = None
+            tx_hash_hex: Optional[str] = None
+            error_message: Optional[str] = None
+            final_status: str = "PENDING"
+            buy_amount_str: Optional[str] = price_buy_amount_str
+            buy_amount_decimal = price_buy_amount_decimal
+            price_final = price_value
+            allowance_target = self._extract_allowance_target(price_response)
+            transaction_payload: Dict[str, Any] | None = None
+            fee_usdc: Optional[float] = fee_usdc
 
-        try:
-            if allowance_target is not None:
-                allowance_tx_hash = self._ensure_allowance(
-                    owner=request.taker_address,
-                    token=context.sell_token_address,
-                    spender=allowance_target,
-                    amount=int(context.sell_amount),
-                    chain_id=request.chain_id,
-                    private_key=private_key,
+            try:
+                # 同一組 (代幣, spender, owner) 的授權檢查、預留到 swap 廣播在同一把鎖內完成：
+                # approve 是覆寫額度而非累加，必須確保 swap 依序排在對應的 approve 之後。
+                allowance_lock = (
+                    self._allowance_lock(
+                        self._allowance_key(
+                            request.chain_id,
+                            context.sell_token_address,
+                            allowance_target,
+                            request.taker_address,
+                        )
+                    )
+                    if allowance_target is not None
+                    else nullcontext()
                 )
+                with allowance_lock:
+                    # quote 與授權檢查 / approve 送出互不相依，quote 在背景執行緒同時取得；
+                    # approve 仍在 swap 之前送出，送出失敗時不會留下 nonce 斷層的 swap 交易。
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        quote_future = executor.submit(
+                            self._swap_client.get_quote, **self._price_params(request, context)
+                        )
+                        if allowance_target is not None:
+                            allowance_tx_hash = self._ensure_allowance(
+                                owner=request.taker_address,
+                                token=context.sell_token_address,
+                                spender=allowance_target,
+                                amount=int(context.sell_amount),
+                                chain_id=request.chain_id,
+                                private_key=private_key,
+                            )
+                        quote_response = quote_future.result()
+                    transaction_payload = {"quote_transaction": quote_response.get("transaction")}
+                    if allowance_tx_hash:
+                        transaction_payload["allowance_tx_hash"] = allowance_tx_hash
+
+                    buy_amount_str = quote_response.get("buyAmount", buy_amount_str)
+                    buy_amount_decimal = self._calculate_decimal(buy_amount_str, context.buy_token_decimals)
+                    price_final = self._calculate_price(
+                        sell_amount=context.sell_amount,
+                        sell_decimals=context.sell_token_decimals,
+                        buy_amount=buy_amount_str,
+                        buy_decimals=context.buy_token_decimals,
+                    )
 
-            quote_response = self._swap_client.get_quote(
-                chain_id=request.chain_id,
-                sell_token=context.sell_token_address,
-                buy_token=context.buy_token_address,
-                sell_amount=context.sell_amount,
-                taker=request.taker_address,
-                slippage_bps=request.slippage_bps,
-            )
-            transaction_payload = {"quote_transaction": quote_response.get("transaction")}
-            if allowance_tx_hash:
-                transaction_payload["allowance_tx_hash"] = allowance_tx_hash
-
-            buy_amount_str = quote_response.get("buyAmount", buy_amount_str)
-            buy_amount_decimal = self._calculate_decimal(buy_amount_str, context.buy_token_decimals)
-            price_final = self._calculate_price(
-                sell_amount=context.sell_amount,
-                sell_decimals=context.sell_token_decimals,
-                buy_amount=buy_amount_str,
-                buy_decimals=context.buy_token_decimals,
-            )
-
-            (
-                buy_amount_str,
-                buy_amount_decimal,
-                fee_usdc_quote,
-            ) = self._apply_integrator_fee(
-                request=request,
-                context=context,
-                buy_amount_str=buy_amount_str,
-                buy_amount_decimal=buy_amount_decimal,
-            )
-            if fee_usdc_quote is not None:
-                fee_usdc = fee_usdc_quote
+                    # 賣出代幣與數量與報價階段相同，沿用同一份 USDC 估價，不再多一次往返。
+                    (
+                        buy_amount_str,
+                        buy_amount_decimal,
+                        fee_usdc_quote,
+                    ) = self._apply_integrator_fee(
+                        request=request,
+                        context=context,
+                        buy_amount_str=buy_amount_str,
+                        buy_amount_decimal=buy_amount_decimal,
+                        sell_usdc_value=sell_usdc_value,
+                    )
+                    if fee_usdc_quote is not None:
+                        fee_usdc = fee_usdc_quote
 
-            tx_params = self._prepare_transaction_params(
-                quote_response.get("transaction", {}),
-                chain_id=request.chain_id,
-                from_address=request.taker_address,
-            )
-            tx_hash_hex = self._send_transaction(tx_params, private_key=private_key)
-            final_status = "SUBMITTED"
-
-            if wait_for_receipt:
-                receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash_hex, timeout=receipt_timeout)
-                receipt_info = {
-                    "blockNumber": receipt.blockNumber,
-                    "status": receipt.status,
-                }
-                if transaction_payload is not None:
-                    transaction_payload["receipt"] = receipt_info
-                if receipt.status == 1:
-                    final_status = "COMPLETED"
-                else:
+                    tx_params = self._prepare_transaction_params(
+                        quote_response.get("transaction", {}),
+                        chain_id=request.chain_id,
+                        from_address=request.taker_address,
+                    )
+                    tx_hash_hex = self._send_transaction(tx_params, private_key=private_key)
+                    final_status = "SUBMITTED"
+
+                if wait_for_receipt:
+                    receipt = self._web3.eth.wait_for_transaction_receipt(
+                        tx_hash_hex,
+                        timeout=receipt_timeout,
+                        poll_latency=receipt_poll_interval,
+                    )
+                    receipt_info = {
+                        "blockNumber": receipt.blockNumber,
+                        "status": receipt.status,
+                    }
+                    if transaction_payload is not None:
+                        transaction_payload["receipt"] = receipt_info
+                    if receipt.status == 1:
+                        final_status = "COMPLETED"
+                    else:
+                        final_status = "FAILED"
+                        error_message = "Transaction reverted on-chain"
+
+            except Exception as exc:  # noqa: BLE001
+                error_message = str(exc)
+                if final_status != "FAILED":
                     final_status = "FAILED"
-                    error_message = "Transaction reverted on-chain"
-
-        except Exception as exc:  # noqa: BLE001
-            error_message = str(exc)
-            if final_status != "FAILED":
-                final_status = "FAILED"
-
-        finally:
-            timestamps_final = self._current_timestamps()
-            with session_scope(self._session_factory) as session:
-                repo = ExecutedTradeRepository(session)
-                trade = repo.get_by_id(trade_id)
-                if trade is not None:
-                    trade.buy_amount = buy_amount_str
-                    trade.buy_amount_decimal = self._decimal_to_float(buy_amount_decimal)
-                    trade.price = price_final
-                    trade.quote_id = (quote_response or {}).get("zid", trade.quote_id)
-                    trade.allowance_target = allowance_target or trade.allowance_target
-                    trade.transaction_payload = transaction_payload
-                    repo.update_status(
-                        trade,
-                        status=final_status,
-                        tx_hash=tx_hash_hex,
-                        error_message=error_message,
-                        executed_at=timestamps_final["utc"],
-                        executed_at_local=timestamps_final["local"],
-                        quote_response=quote_response,
-                        integrator_fee_usdc=self._decimal_to_float(fee_usdc),
+
+            finally:
+                if final_status == "FAILED":
+                    # 交易可能已廣播卻未上鏈（逾時、被丟棄），本地 nonce 不再可信，下次重新查詢。
+                    self._next_nonces.pop(
+                        (request.chain_id, self._normalize_address(request.taker_address)),
+                        None,
                     )
+                if final_status == "FAILED" and allowance_target is not None:
+                    # 失敗可能是授權在別處被撤銷，下次交易重新讀取鏈上額度。
+                    self._allowances.pop(
+                        self._allowance_key(
+                            request.chain_id,
+                            context.sell_token_address,
+                            allowance_target,
+                            request.taker_address,
+                        ),
+                        None,
+                    )
+                timestamps_final = self._current_timestamps()
+                record.buy_amount = buy_amount_str
+                record.buy_amount_decimal = buy_amount_decimal
+                record.price = price_final
+                record.quote_id = (quote_response or {}).get("zid", record.quote_id)
+                record.allowance_target = allowance_target or record.allowance_target
+                record.transaction_payload = transaction_payload
+                repo.update_status(
+                    record,
+                    status=final_status,
+                    tx_hash=tx_hash_hex,
+                    error_message=error_message,
+                    executed_at=timestamps_final["utc"],
+                    executed_at_local=timestamps_final["local"],
+                    quote_response=self._stored_response(quote_response),
+                    integrator_fee_usdc=fee_usdc,
+                )
+                session.commit()
 
         return TradeResult(
             trade_id=trade_id,
@@ -540,55 +788,126 @@ class ZeroExTradingService:
             error_message=error_message,
         )
 
+    async def aexecute_live_swap(
+        self,
+        request: SwapRequest,
+        *,
+        private_key: str,
+        wait_for_receipt: bool = True,
+        receipt_timeout: int = 600,
+        receipt_poll_interval: float = _RECEIPT_POLL_INTERVAL,
+    ) -> TradeResult:
+        """``execute_live_swap`` 的非同步版本，以 ``asyncio.gather`` 同時送出多筆交易時使用。
+
+        交易在工作執行緒中執行：nonce 分配與廣播由 ``_nonce_lock`` 依序進行，
+        耗時最長的收據等待則彼此重疊。
+        """
+
+        return await asyncio.to_thread(
+            self.execute_live_swap,
+            request,
+            private_key=private_key,
+            wait_for_receipt=wait_for_receipt,
+            receipt_timeout=receipt_timeout,
+            receipt_poll_interval=receipt_poll_interval,
+        )
+
     # --- Helpers ---------------------------------------------------------
 
+    def _stored_response(self, response: Optional[dict]) -> Optional[dict]:
+        if response is None or self._persist_full_responses:
+            return response
+        return _project_response(response)
+
+    def _price_params(self, request: SwapRequest, context: SwapContext) -> dict:
+        return {
+            "chain_id": request.chain_id,
+            "sell_token": context.sell_token_address,
+            "buy_token": context.buy_token_address,
+            "sell_amount": context.sell_amount,
+            "taker": request.taker_address,
+            "slippage_bps": request.slippage_bps,
+        }
+
+    def _fetch_price_and_usdc_value(
+        self,
+        request: SwapRequest,
+        context: SwapContext,
+    ) -> tuple[dict, int | BaseException]:
+        """取得主要報價與賣出數量的 USDC 估價（USDC 最小單位）。
+
+        兩者互不相依，賣出代幣不是 USDC 時估價請求在背景執行緒與主要報價同時送出。
+        估價失敗時回傳例外，由 ``_apply_integrator_fee`` 在確實需要手續費時才拋出。
+        """
+
+        usdc_info = self._get_chain_usdc(request.chain_id)
+        local_value = self._local_usdc_value(
+            request.chain_id, usdc_info, context.sell_token_address, context.sell_amount
+        )
+        if local_value is not None:
+            return self._swap_client.get_price(**self._price_params(request, context)), local_value
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            usdc_future = executor.submit(
+                self._convert_to_usdc_value,
+                chain_id=request.chain_id,
+                token_address=context.sell_token_address,
+                amount_raw=context.sell_amount,
+                taker=request.taker_address,
+            )
+            price_response = self._swap_client.get_price(**self._price_params(request, context))
+            error = usdc_future.exception()
+        return price_response, error if error is not None else usdc_future.result()
+
     def _apply_integrator_fee(
         self,
         *,
         request: SwapRequest,
         context: SwapContext,
         buy_amount_str: Optional[str],
-        buy_amount_decimal: Optional[Decimal],
-    ) -> tuple[Optional[str], Optional[Decimal], Optional[Decimal]]:
+        buy_amount_decimal: Optional[float],
+        sell_usdc_value: int | BaseException,
+    ) -> tuple[Optional[str], Optional[float], Optional[float]]:
+        """自買入數量扣除整合商手續費；金額皆以最小單位整數計算，只在回傳時轉成 float。"""
+
         if buy_amount_str is None or buy_amount_decimal is None:
             return buy_amount_str, buy_amount_decimal, None
         if buy_amount_decimal == 0:
             return buy_amount_str, buy_amount_decimal, None
 
-        sell_amount_decimal = context.sell_amount_decimal
-        if sell_amount_decimal is None:
-            sell_amount_decimal = Decimal(context.sell_amount) / (Decimal(10) ** context.sell_token_decimals)
-            context.sell_amount_decimal = sell_amount_decimal
-
-        sell_usdc_value = self._convert_to_usdc_value(
-            chain_id=request.chain_id,
-            token_address=context.sell_token_address,
-            amount_raw=context.sell_amount,
-            taker=request.taker_address,
-        )
+        if isinstance(sell_usdc_value, BaseException):
+            raise sell_usdc_value
         if sell_usdc_value <= 0:
             return buy_amount_str, buy_amount_decimal, None
 
-        fee_usdc = (sell_usdc_value * INTEGRATOR_FEE_RATE).quantize(Decimal("0.00000001"), rounding=ROUND_DOWN)
-        if fee_usdc <= 0:
+        usdc_decimals = self._get_chain_usdc(request.chain_id).decimals
+        fee_units = (sell_usdc_value * _FEE_RATE_NUMERATOR * 10**_FEE_USDC_DECIMALS) // (
+            _FEE_RATE_DENOMINATOR * 10**usdc_decimals
+        )
+        if fee_units <= 0:
             return buy_amount_str, buy_amount_decimal, None
 
-        tokens_per_usdc = buy_amount_decimal / sell_usdc_value if sell_usdc_value > 0 else Decimal(0)
-        fee_token_decimal = (fee_usdc * tokens_per_usdc)
-        buy_amount_decimal_after = buy_amount_decimal - fee_token_decimal
-        if buy_amount_decimal_after < 0:
-            buy_amount_decimal_after = Decimal(0)
-
         if context.buy_token_decimals is None:
             raise ValueError("缺少 buy token decimals，無法扣除手續費")
-        scale = Decimal(10) ** context.buy_token_decimals
-        raw_after = int((buy_amount_decimal_after * scale).to_integral_value(rounding=ROUND_DOWN))
-
-        return str(raw_after), buy_amount_decimal_after, fee_usdc
+        # 手續費換算成買入代幣：fee_usdc * buy / sell_usdc，換回最小單位後無條件進位，
+        # 等同扣除後的數量無條件捨去。
+        buy_raw = int(buy_amount_str)
+        numerator = fee_units * buy_raw * 10**usdc_decimals
+        denominator = sell_usdc_value * 10**_FEE_USDC_DECIMALS
+        fee_raw = -(-numerator // denominator)
+        raw_after = max(buy_raw - fee_raw, 0)
+
+        return (
+            str(raw_after),
+            raw_after / 10**context.buy_token_decimals,
+            fee_units / 10**_FEE_USDC_DECIMALS,
+        )
 
     def _prepare_context(self, request: SwapRequest) -> SwapContext:
         base_token = self._resolve_base_token(request.chain_id, request.base_token_symbol)
         quote_address = self._normalize_address(request.quote_token_address)
+        if request.quote_token_symbol is None and request.quote_token_decimals is None:
+            self._prefetch_token_metadata(quote_address)
         quote_symbol = request.quote_token_symbol or self._fetch_token_symbol(quote_address) or "UNKNOWN"
         quote_decimals = request.quote_token_decimals
 
@@ -635,35 +954,94 @@ class ZeroExTradingService:
         token_address: str,
         amount_raw: str,
         taker: str,
-    ) -> Decimal:
-        normalized_token = self._normalize_address(token_address)
+    ) -> int:
         usdc_info = self._get_chain_usdc(chain_id)
-        if normalized_token == self._normalize_address(usdc_info.address):
-            return Decimal(amount_raw) / (Decimal(10) ** usdc_info.decimals)
+        local_value = self._local_usdc_value(chain_id, usdc_info, token_address, amount_raw)
+        if local_value is not None:
+            return local_value
 
         response = self._swap_client.get_price(
             chain_id=chain_id,
-            sell_token=normalized_token,
+            sell_token=self._normalize_address(token_address),
+            buy_token=usdc_info.address,
+            sell_amount=amount_raw,
+            taker=taker,
+        )
+        return self._usdc_value_from_response(response, chain_id, token_address, amount_raw)
+
+    async def _aconvert_to_usdc_value(
+        self,
+        *,
+        chain_id: int,
+        token_address: str,
+        amount_raw: str,
+        taker: str,
+    ) -> int:
+        usdc_info = self._get_chain_usdc(chain_id)
+        local_value = self._local_usdc_value(chain_id, usdc_info, token_address, amount_raw)
+        if local_value is not None:
+            return local_value
+
+        response = await self._swap_client.aget_price(
+            chain_id=chain_id,
+            sell_token=self._normalize_address(token_address),
             buy_token=usdc_info.address,
             sell_amount=amount_raw,
             taker=taker,
         )
+        return self._usdc_value_from_response(response, chain_id, token_address, amount_raw)
+
+    def _local_usdc_value(
+        self,
+        chain_id: int,
+        usdc_info: TokenInfo,
+        token_address: str,
+        amount_raw: str,
+    ) -> Optional[int]:
+        """不需向 0x 估價時回傳 USDC 數量：代幣本身是 USDC，或快取的匯率仍在有效期間。"""
+
+        normalized = self._normalize_address(token_address)
+        if normalized == usdc_info.address:
+            return int(amount_raw)
+        cached = self._usdc_rates.get((chain_id, normalized))
+        if cached is None:
+            return None
+        fetched_at, usdc_raw, sell_raw = cached
+        if time.monotonic() - fetched_at >= _USDC_RATE_CACHE_SECONDS:
+            return None
+        return int(amount_raw) * usdc_raw // sell_raw
+
+    def _usdc_value_from_response(
+        self,
+        response: dict,
+        chain_id: int,
+        token_address: str,
+        amount_raw: str,
+    ) -> int:
         buy_amount_str = response.get("buyAmount")
         if buy_amount_str is None:
             raise ZeroExAPIError("無法取得 USDC 估價以計算手續費")
-        return Decimal(buy_amount_str) / (Decimal(10) ** usdc_info.decimals)
+        usdc_raw = int(buy_amount_str)
+        sell_raw = int(amount_raw)
+        if sell_raw > 0:
+            self._usdc_rates[(chain_id, self._normalize_address(token_address))] = (
+                time.monotonic(),
+                usdc_raw,
+                sell_raw,
+            )
+        return usdc_raw
 
     def _get_chain_usdc(self, chain_id: int) -> TokenInfo:
-        registry = BASE_TOKEN_REGISTRY.get(chain_id)
-        if not registry or "USDC" not in registry:
+        usdc_info = _USDC_BY_CHAIN.get(chain_id)
+        if usdc_info is None:
             raise ValueError(f"Chain {chain_id} 缺少 USDC 設定，無法計算手續費")
-        return registry["USDC"]
+        return usdc_info
 
     def _resolve_base_token(self, chain_id: int, symbol: str) -> TokenInfo:
-        registry = BASE_TOKEN_REGISTRY.get(chain_id)
-        if not registry or symbol not in registry:
+        token = _BASE_TOKENS.get((chain_id, symbol))
+        if token is None:
             raise ValueError(f"Chain {chain_id} 不支援 base token {symbol}")
-        return registry[symbol]
+        return token
 
     def _resolve_sell_amount(
         self,
@@ -671,18 +1049,18 @@ class ZeroExTradingService:
         *,
         decimals: int,
         token_address: str,
-    ) -> tuple[Optional[Decimal], str]:
+    ) -> tuple[Decimal, str]:
         if request.amount_wei is not None:
             raw_int = int(str(request.amount_wei), 10)
             if raw_int <= 0:
                 raise ValueError("sell amount 必須為正整數")
-            decimal_value = Decimal(raw_int) / Decimal(10**decimals)
+            decimal_value = Decimal(raw_int).scaleb(-decimals)
             return decimal_value, str(raw_int)
 
         amount_decimal = self._normalize_decimal(request.amount)
         if amount_decimal is None or amount_decimal <= 0:
             raise ValueError("sell amount 必須大於 0")
-        scaled = (amount_decimal * Decimal(10**decimals)).quantize(Decimal("1"), rounding=ROUND_DOWN)
+        scaled = amount_decimal.scaleb(decimals).quantize(Decimal("1"), rounding=ROUND_DOWN)
         if scaled <= 0:
             raise ValueError("sell amount 小於最小單位")
         return amount_decimal, str(int(scaled))
@@ -697,10 +1075,11 @@ class ZeroExTradingService:
         except InvalidOperation as exc:  # pragma: no cover - 無效輸入
             raise ValueError(f"無法解析 amount: {value}") from exc
 
-    def _calculate_decimal(self, amount: Optional[str], decimals: Optional[int]) -> Optional[Decimal]:
+    def _calculate_decimal(self, amount: Optional[str], decimals: Optional[int]) -> Optional[float]:
+        # 只用來寫入 *_decimal 的 float 欄位；整數相除即取最接近的 float，不必經過 Decimal。
         if amount is None or decimals is None:
             return None
-        return Decimal(amount) / Decimal(10**decimals)
+        return int(amount) / 10**decimals
 
     def _calculate_price(
         self,
@@ -712,11 +1091,11 @@ class ZeroExTradingService:
     ) -> Optional[float]:
         if buy_amount is None or buy_decimals is None:
             return None
-        sell_value = Decimal(sell_amount) / Decimal(10**sell_decimals)
-        if sell_value == 0:
+        sell_raw = int(sell_amount)
+        if sell_raw == 0:
             return None
-        buy_value = Decimal(buy_amount) / Decimal(10**buy_decimals)
-        return float(buy_value / sell_value)
+        # 整數相除由 Python 直接取最接近的 float，不經過 Decimal。
+        return (int(buy_amount) * 10**sell_decimals) / (sell_raw * 10**buy_decimals)
 
     def _decimal_to_float(self, value: Optional[Decimal]) -> Optional[float]:
         if value is None:
@@ -737,33 +1116,114 @@ class ZeroExTradingService:
         return None
 
     def _normalize_address(self, address: str) -> str:
-        return Web3.to_checksum_address(address)
+        return _checksum_address(address)
 
     def _fetch_token_symbol(self, address: str) -> Optional[str]:
         if self._web3 is None:
             return None
+        cached = self._token_symbols.get(address)
+        if cached is not None:
+            return cached
         try:
             contract = self._erc20_contract(address)
-            symbol = contract.functions.symbol().call()
-            if isinstance(symbol, bytes):
-                symbol = symbol.decode("utf-8").strip("\x00")
-            return symbol.upper()
+            symbol = self._decode_symbol(contract.functions.symbol().call())
         except ContractLogicError:  # pragma: no cover - 少見情境
             return None
+        self._token_symbols[address] = symbol
+        return symbol
+
+    @staticmethod
+    def _decode_symbol(symbol: str | bytes) -> str:
+        if isinstance(symbol, bytes):
+            symbol = symbol.decode("utf-8").strip("\x00")
+        return symbol.upper()
+
+    def _prefetch_token_metadata(self, address: str) -> None:
+        """symbol 與 decimals 都需查詢時，以一次 JSON-RPC batch 取回並寫入快取。
+
+        provider 不支援 batch（或 web3 版本沒有 ``batch_requests``）時不做事，
+        之後由 ``_fetch_token_symbol`` / ``_fetch_token_decimals`` 逐一查詢。
+        """
+
+        if self._web3 is None or not hasattr(self._web3, "batch_requests"):
+            return
+        if address in self._token_symbols or address in self._token_decimals:
+            return
+        contract = self._erc20_contract(address)
+        try:
+            with self._web3.batch_requests() as batch:
+                batch.add(contract.functions.symbol())
+                batch.add(contract.functions.decimals())
+                symbol, decimals = batch.execute()
+        except Exception:  # noqa: BLE001 - 僅為預取，失敗時退回逐一查詢
+            return
+        self._token_symbols[address] = self._decode_symbol(symbol)
+        self._token_decimals[address] = decimals
+
+    def _batched_reads(self, *reads: Callable[[], Any]) -> list[Any]:
+        """把多個唯讀 RPC 合併成一次 JSON-RPC batch；provider 不支援時逐一呼叫。"""
+
+        if hasattr(self._web3, "batch_requests"):
+            try:
+                with self._web3.batch_requests() as batch:
+                    for read in reads:
+                        batch.add(read())
+                    return list(batch.execute())
+            except Exception:  # noqa: BLE001 - 唯讀呼叫，失敗時改逐一查詢以取得原本的錯誤
+                pass
+        return [read() for read in reads]
 
     def _fetch_token_decimals(self, address: str) -> Optional[int]:
         if self._web3 is None:
             return None
+        cached = self._token_decimals.get(address)
+        if cached is not None:
+            return cached
         try:
-            contract = self._erc20_contract(address)
-            return contract.functions.decimals().call()
+            decimals = self._call_uint(address, _SELECTOR_DECIMALS)
         except ContractLogicError:  # pragma: no cover - 少見情境
             return None
+        if decimals is None:
+            return None
+        self._token_decimals[address] = decimals
+        return decimals
+
+    def _call_uint(self, address: str, data: bytes) -> Optional[int]:
+        """以 eth_call 呼叫回傳單一 uint 的函式；無回傳資料（例如非合約地址）時為 None。"""
+
+        if self._web3 is None:
+            raise Web3NotConfiguredError("需要 Web3 提供者來操作 ERC20 合約")
+        raw = self._web3.eth.call({"to": self._normalize_address(address), "data": data})
+        if len(raw) < 32:
+            return None
+        return int.from_bytes(raw[:32], "big")
+
+    @staticmethod
+    def _encode_address(address: str) -> bytes:
+        return bytes.fromhex(address[2:]).rjust(32, b"\x00")
 
     def _erc20_contract(self, address: str) -> Contract:
         if self._web3 is None:
             raise Web3NotConfiguredError("需要 Web3 提供者來操作 ERC20 合約")
-        return self._web3.eth.contract(address=self._normalize_address(address), abi=ERC20_ABI)
+        checksum = self._normalize_address(address)
+        # 建立合約物件要解析 ABI 並產生函式代理，同一地址重複使用。
+        contract = self._erc20_contracts.get(checksum)
+        if contract is None:
+            contract = self._web3.eth.contract(address=checksum, abi=ERC20_ABI)
+            self._erc20_contracts[checksum] = contract
+        return contract
+
+    def _allowance_key(self, chain_id: int, token: str, spender: str, owner: str) -> tuple[int, str, str, str]:
+        return (
+            chain_id,
+            self._normalize_address(token),
+            self._normalize_address(spender),
+            self._normalize_address(owner),
+        )
+
+    def _allowance_lock(self, key: tuple[int, str, str, str]) -> threading.Lock:
+        # dict.setdefault 為原子操作，同一個鍵只會留下一把鎖。
+        return self._allowance_locks.setdefault(key, threading.Lock())
 
     def _ensure_allowance(
         self,
@@ -775,27 +1235,50 @@ class ZeroExTradingService:
         chain_id: int,
         private_key: str,
     ) -> Optional[str]:
-        contract = self._erc20_contract(token)
-        owner_address = self._normalize_address(owner)
-        spender_address = self._normalize_address(spender)
-        current = contract.functions.allowance(owner_address, spender_address).call()
+        """確認授權額度足夠並預留本次用量，不足時送出 approve。
+
+        呼叫端須持有 ``_allowance_lock(key)`` 直到 swap 廣播。本地紀錄等於鏈上額度扣掉
+        已廣播（可能尚未上鏈）的 swap 用量，因此有紀錄時不再讀鏈上值；鏈上值看不到
+        pending 中的 swap，只在沒有紀錄時讀取。錢包未在別處動用授權時，每筆 swap
+        上鏈時的實際額度不小於本地預留的額度。
+        """
+
+        key = self._allowance_key(chain_id, token, spender, owner)
+        _, token_address, spender_address, owner_address = key
+        current = self._allowances.get(key)
+        if current is None:
+            current = self._call_uint(
+                token_address,
+                _SELECTOR_ALLOWANCE + self._encode_address(owner_address) + self._encode_address(spender_address),
+            )
+            if current is None:
+                raise ValueError(f"無法讀取 {token_address} 的 allowance")
         if current >= amount:
+            self._allowances[key] = current - amount
             return None
 
-        nonce = self._web3.eth.get_transaction_count(owner_address, block_identifier="pending")
-        tx = contract.functions.approve(spender_address, amount).build_transaction(
-            {
-                "chainId": chain_id,
-                "from": owner_address,
-                "nonce": nonce,
-            }
+        # approve 交易直接組 calldata，不經過 build_transaction 的 ABI 編碼與預設值填補。
+        tx: dict[str, Any] = {
+            "chainId": chain_id,
+            "from": owner_address,
+            "to": token_address,
+            "value": 0,
+            "data": "0x" + (_SELECTOR_APPROVE + self._encode_address(spender_address) + amount.to_bytes(32, "big")).hex(),
+        }
+        nonce = self._next_nonces.get((chain_id, owner_address))
+        gas_estimate, gas_price, *pending = self._batched_reads(
+            lambda: self._web3.eth.estimate_gas(tx),
+            lambda: self._web3.eth.gas_price,
+            *([lambda: self._pending_nonce(owner_address)] if nonce is None else []),
         )
-        if "gas" not in tx:
-            tx["gas"] = int(self._web3.eth.estimate_gas(tx) * 1.2)
-        if "gasPrice" not in tx and "maxFeePerGas" not in tx:
-            tx["gasPrice"] = self._web3.eth.gas_price
+        tx["nonce"] = pending[0] if nonce is None else nonce
+        tx["gas"] = int(gas_estimate * 1.2)
+        tx["gasPrice"] = gas_price
 
-        return self._send_transaction(tx, private_key=private_key)
+        tx_hash = self._send_transaction(tx, private_key=private_key)
+        # approve 的額度恰為本次用量，swap 後即用完。
+        self._allowances[key] = 0
+        return tx_hash
 
     def _prepare_transaction_params(
         self,
@@ -807,28 +1290,66 @@ class ZeroExTradingService:
         if not transaction:
             raise ValueError("quote 回傳的 transaction 資料為空")
 
-        params = dict(transaction)
+        # 一次走訪完成複製與數值欄位轉換；quote 的 transaction 會寫入紀錄，不能原地修改。
+        params = {
+            key: _parse_int(value) if key in _NUMERIC_TX_KEYS and value is not None else value
+            for key, value in transaction.items()
+        }
         params["chainId"] = chain_id
         params["from"] = self._normalize_address(from_address)
-        params["nonce"] = self._web3.eth.get_transaction_count(params["from"], block_identifier="pending")
-        if "to" in params and params["to"]:
+        nonce = self._next_nonces.get((chain_id, params["from"]))
+        if params.get("gasPrice") is None and params.get("maxFeePerGas") is None:
+            # quote 未附 gas 價格時與 nonce 一起查詢，只需一次往返。
+            if nonce is None:
+                nonce, params["gasPrice"] = self._batched_reads(
+                    lambda: self._pending_nonce(params["from"]),
+                    lambda: self._web3.eth.gas_price,
+                )
+            else:
+                params["gasPrice"] = self._web3.eth.gas_price
+        elif nonce is None:
+            nonce = self._pending_nonce(params["from"])
+        params["nonce"] = nonce
+        if params.get("to"):
             params["to"] = self._normalize_address(params["to"])
-
-        for key in ("gas", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas", "value"):
-            if key in params and params[key] is not None:
-                params[key] = int(params[key])
         return params
 
+    def _pending_nonce(self, address: str) -> int:
+        return self._web3.eth.get_transaction_count(address, block_identifier="pending")
+
     def _send_transaction(self, tx_params: dict, *, private_key: str) -> str:
+        """簽署並送出交易，成功後把本地 nonce 推進到下一筆。
+
+        ``tx_params["nonce"]`` 在鎖外查得，可能已被同地址的其他交易用掉；鎖內以本地 nonce
+        為準再簽署。本地 nonce 可能因錢包在別處送出交易而過期；節點回報 nonce 錯誤時
+        清除快取，以鏈上 pending 數量重簽一次。
+        """
+
         if self._web3 is None:
             raise Web3NotConfiguredError("需要 Web3 提供者才能送出交易")
-        signed = self._web3.eth.account.sign_transaction(tx_params, private_key=private_key)
-        raw_tx = getattr(signed, "rawTransaction", None)
-        if raw_tx is None:
-            raw_tx = getattr(signed, "raw_transaction", None)
-        if raw_tx is None:
-            raise ValueError("Signed transaction 缺少 raw transaction 資料")
-        tx_hash = self._web3.eth.send_raw_transaction(raw_tx)
+        key = (tx_params["chainId"], tx_params["from"])
+        with self._nonce_lock:
+            nonce = self._next_nonces.get(key)
+            if nonce is not None and nonce != tx_params["nonce"]:
+                tx_params = {**tx_params, "nonce": nonce}
+            try:
+                tx_hash = self._sign_and_send(tx_params, private_key=private_key)
+            except Exception as exc:
+                self._next_nonces.pop(key, None)
+                if "nonce" not in str(exc).lower():
+                    raise
+                tx_params = {**tx_params, "nonce": self._pending_nonce(tx_params["from"])}
+                tx_hash = self._sign_and_send(tx_params, private_key=private_key)
+            self._next_nonces[key] = tx_params["nonce"] + 1
+        return tx_hash
+
+    def _sign_and_send(self, tx_params: dict, *, private_key: str) -> str:
+        # 由私鑰推導公鑰與地址的工作每把金鑰只做一次。
+        account = self._accounts.get(private_key)
+        if account is None:
+            account = self._accounts[private_key] = self._web3.eth.account.from_key(private_key)
+        signed = account.sign_transaction(tx_params)
+        tx_hash = self._web3.eth.send_raw_transaction(getattr(signed, _RAW_TX_ATTR))
         return tx_hash.hex()
 
     def _current_timestamps(self) -> dict[str, datetime]:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+from tenacity import wait_none
+
+from nansen_sm_collector.adapters.nansen_api import NansenAPIClient
+from nansen_sm_collector.collectors.enrich import EventEnricher
+from nansen_sm_collector.core.types import Event, Token, Wallet
+
+
+def _make_client(requested: list[str]) -> NansenAPIClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        address = orjson.loads(request.content)["parameters"]["address"]
+        requested.append(address)
+        if address == "0xlimited":
+            return httpx.Response(status_code=429, text="rate limited")
+        return httpx.Response(status_code=200, json={"data": [{"label": f"label-{address}"}, {"label": ""}]})
+
+    return NansenAPIClient(
+        "https://api.nansen.ai",
+        "test-key",
+        async_transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(NansenAPIClient._apost.retry, "wait", wait_none())
+
+
+def test_afetch_address_labels_keeps_successes_when_one_address_fails() -> None:
+    requested: list[str] = []
+    client = _make_client(requested)
+
+    try:
+        responses = asyncio.run(
+            client.afetch_address_labels({"0xaaa": "ethereum", "0xlimited": "ethereum", "0xbbb": "base"})
+        )
+    finally:
+        client.close()
+
+    assert set(responses) == {"0xaaa", "0xbbb"}
+    assert responses["0xaaa"]["data"][0]["label"] == "label-0xaaa"
+    # 失敗的地址依重試設定共送出三次。
+    assert requested.count("0xlimited") == 3
+
+
+def test_enricher_applies_labels_fetched_through_async_client() -> None:
+    requested: list[str] = []
+    client = _make_client(requested)
+    enricher = EventEnricher(client, SimpleNamespace(score_wallet=lambda address: 0.5))
+    occurred_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    events = [
+        Event(
+            source="dex_trades",
+            token=Token(symbol="AAA", chain="ethereum"),
+            wallet=Wallet(address=address),
+            occurred_at=occurred_at,
+        )
+        for address in ("0xaaa", "0xlimited", "0xbbb")
+    ]
+
+    try:
+        enriched = enricher.enrich(events)
+    finally:
+        client.close()
+
+    assert [event.wallet.labels for event in enriched] == [["label-0xaaa"], [], ["label-0xbbb"]]
+    assert all(event.wallet.alpha_score == 0.5 for event in enriched)
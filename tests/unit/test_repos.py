@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from nansen_sm_collector.data import db, schemas
+from nansen_sm_collector.core.types import Signal, Token, Wallet
+from nansen_sm_collector.data.repos import (
+    EventRepository,
+    SignalRepository,
+    TokenRepository,
+    TokenScreenerRepository,
+    WalletRepository,
+)
+
+
+def _make_session() -> Session:
+    engine = create_engine("sqlite://")
+    db.Base.metadata.create_all(engine)
+    return db.create_session_factory(engine)()
+
+
+def test_upsert_market_metrics_merges_existing_and_duplicate_rows() -> None:
+    session = _make_session()
+    repo = TokenScreenerRepository(session)
+    first = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    second = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+    repo.upsert_market_metrics(
+        [
+            {"chain": "ethereum", "token_address": "0xAAA", "token_symbol": "AAA", "price_usd": 1.0},
+            {"chain": "ethereum", "token_address": "0xbbb", "token_symbol": "BBB", "price_usd": 2.0},
+            {"chain": "ethereum", "token_address": "0xbbb", "token_symbol": "", "price_usd": 3.0},
+        ],
+        captured_at=first,
+    )
+    repo.upsert_market_metrics(
+        [{"chain": "ethereum", "token_address": "0xaaa", "token_symbol": "", "price_usd": 9.0}],
+        captured_at=second,
+    )
+    session.commit()
+
+    rows = {
+        model.token_address: (model.token_symbol, model.price_usd)
+        for model in session.query(schemas.TokenMarketMetricModel)
+    }
+    assert rows == {"0xaaa": ("AAA", 9.0), "0xbbb": ("BBB", 3.0)}
+
+
+def test_token_upsert_reuses_prefetched_and_new_models() -> None:
+    session = _make_session()
+    session.add(schemas.TokenModel(symbol="AAA", chain="ethereum"))
+    session.commit()
+
+    repo = TokenRepository(session)
+    repo.prefetch([("AAA", "ethereum"), ("BBB", "ethereum")])
+    first = repo.upsert(Token(symbol="BBB", chain="ethereum"))
+    second = repo.upsert(Token(symbol="BBB", chain="ethereum", liquidity_score=0.5))
+    session.commit()
+
+    assert first is second
+    assert repo.get_by_symbol("AAA", "ethereum") is not None
+    assert session.query(schemas.TokenModel).count() == 2
+
+
+def test_usd_notional_stats_interpolates_percentile() -> None:
+    session = _make_session()
+    token = schemas.TokenModel(symbol="AAA", chain="ethereum")
+    session.add(token)
+    session.flush()
+    now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    for value in (5, 1, 3, None, 10):
+        session.add(
+            schemas.EventModel(token_id=token.id, source="dex_trades", occurred_at=now, features={"usd_notional": value})
+        )
+    session.flush()
+
+    stats = EventRepository(session).get_usd_notional_stats("AAA", "ethereum", now - timedelta(hours=1), 0.75)
+
+    assert stats == {"count": 4, "percentile": 6.25}
+
+
+def test_token_cache_is_shared_per_session_and_cleared_on_rollback() -> None:
+    session = _make_session()
+
+    created = TokenRepository(session).upsert(Token(symbol="AAA", chain="ethereum"))
+    assert TokenRepository(session).get_by_symbol("AAA", "ethereum") is created
+
+    session.rollback()
+    assert TokenRepository(session).get_by_symbol("AAA", "ethereum") is None
+
+
+def test_signal_wallet_links_flush_as_single_executemany() -> None:
+    session = _make_session()
+    token_model = TokenRepository(session).upsert(Token(symbol="AAA", chain="ethereum"))
+    wallet_models = [WalletRepository(session).upsert(Wallet(address=f"0x{i}")) for i in range(3)]
+    session.flush()
+
+    repo = SignalRepository(session)
+    for _ in range(5):
+        signal = Signal(
+            token=Token(symbol="AAA", chain="ethereum"),
+            wallets=[],
+            score=1.0,
+            generated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        repo.create(signal, token_model=token_model, wallet_models=wallet_models)
+
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    session.flush()
+
+    assert sum(stmt.startswith("INSERT INTO signal_wallets") for stmt in statements) == 1
+
+
+def test_copy_rows_encodes_csv_nulls_and_json_like_engine() -> None:
+    copied: dict[str, str] = {}
+
+    class FakeCursor:
+        def copy_expert(self, sql: str, buffer) -> None:
+            copied["sql"] = sql
+            copied["data"] = buffer.read()
+
+        def close(self) -> None:
+            pass
+
+    dbapi_connection = SimpleNamespace(cursor=FakeCursor)
+    session = SimpleNamespace(
+        connection=lambda: SimpleNamespace(connection=SimpleNamespace(dbapi_connection=dbapi_connection))
+    )
+    occurred_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    copied_ok = EventRepository(session)._copy_rows(  # type: ignore[arg-type]
+        schemas.EventModel.__table__,
+        [
+            {"token_id": 1, "wallet_id": None, "occurred_at": occurred_at, "features": {"usd_notional": float("nan")}},
+            {"token_id": 2, "wallet_id": 3, "occurred_at": occurred_at, "features": {"note": 'say "hi"'}},
+        ],
+    )
+
+    assert copied_ok
+    assert copied["sql"] == (
+        "COPY events (token_id, wallet_id, occurred_at, features) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    assert copied["data"].splitlines() == [
+        '1,\\N,2024-01-01T00:00:00+00:00,"{""usd_notional"":null}"',
+        '2,3,2024-01-01T00:00:00+00:00,"{""note"":""say \\""hi\\""""}"',
+    ]
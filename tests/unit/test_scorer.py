@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from nansen_sm_collector.collectors import scorer as scorer_module
+from nansen_sm_collector.collectors.scorer import SignalScorer
+from nansen_sm_collector.config.settings import AppSettings
+from nansen_sm_collector.core.types import Event, EventFeature, Token, Wallet
+
+
+def _make_event(
+    *,
+    usd_notional: float | None = None,
+    netflow: float | None = None,
+    volume_jump: float | None = None,
+    liquidity: float | None = 1.0,
+    labels: list[str] | None = None,
+) -> Event:
+    return Event(
+        source="dex_trades",
+        token=Token(symbol="MOCK", address="0xmock", chain="ethereum", liquidity_score=liquidity),
+        wallet=Wallet(address="0xwallet", labels=labels or []),
+        occurred_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        features=EventFeature(
+            usd_notional=usd_notional,
+            smart_money_netflow=netflow,
+            volume_jump=volume_jump,
+        ),
+    )
+
+
+def _settings() -> AppSettings:
+    return AppSettings(NANSEN_API_KEY="dummy-key")
+
+
+def test_score_batch_builds_reasons_and_signal_type() -> None:
+    scorer = SignalScorer(_settings())
+    buy_event = _make_event(usd_notional=150_000, netflow=10_000, labels=["Fund"])
+    buy, sell = scorer.score_batch([buy_event, _make_event(netflow=-5_000, liquidity=0.1)])
+
+    assert [reason.code for reason in buy.reasons] == ["smart_buy", "label", "netflow_buy"]
+    assert buy.metadata["signal_type"] == "buy"
+    assert buy.score == pytest.approx(0.25 * 1.5 + 0.25 + 0.10)
+    assert "source_event" not in buy.metadata
+    assert buy.source_event_payload() == buy_event.model_dump(mode="json")
+
+    assert [reason.code for reason in sell.reasons] == ["netflow_sell", "penalty_liq"]
+    assert sell.metadata["signal_type"] == "sell"
+    assert sell.score == pytest.approx(0.0)
+
+
+def test_score_batch_min_score_skips_reasons_below_threshold() -> None:
+    scorer = SignalScorer(_settings())
+    strong, weak = scorer.score_batch(
+        [
+            _make_event(usd_notional=150_000, netflow=10_000, labels=["Fund"]),
+            _make_event(netflow=-5_000, liquidity=0.1),
+        ],
+        min_score=0.65,
+    )
+
+    assert [reason.code for reason in strong.reasons] == ["smart_buy", "label", "netflow_buy"]
+    assert weak.reasons == []
+    assert weak.metadata["signal_type"] == "sell"
+
+
+def _varied_events() -> list[Event]:
+    return [
+        _make_event(
+            usd_notional=index * 2_500.0,
+            netflow=(index % 7 - 3) * 1_000.0,
+            volume_jump=(index % 11) * 0.8,
+            liquidity=(index % 5) * 0.25,
+            labels=["Fund"] if index % 2 else [],
+        )
+        for index in range(64)
+    ]
+
+
+@pytest.mark.parametrize(
+    "kernel",
+    [
+        pytest.param(
+            "jit",
+            marks=pytest.mark.skipif(not scorer_module._NUMBA_AVAILABLE, reason="numba 未安裝"),
+        ),
+        pytest.param(
+            "vectorized",
+            marks=pytest.mark.skipif(not scorer_module._NUMPY_AVAILABLE, reason="numpy 未安裝"),
+        ),
+    ],
+)
+def test_score_batch_array_kernel_matches_python_path(kernel: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    events = _varied_events()
+    scorer = SignalScorer(_settings())
+
+    monkeypatch.setattr(scorer_module, "_JIT_MIN_BATCH", 1)
+    if kernel == "vectorized":
+        monkeypatch.setattr(scorer_module, "_NUMBA_AVAILABLE", False)
+    array_signals = scorer.score_batch(events)
+    monkeypatch.setattr(scorer_module, "_NUMPY_AVAILABLE", False)
+    monkeypatch.setattr(scorer_module, "_NUMBA_AVAILABLE", False)
+    python_signals = scorer.score_batch(events)
+
+    assert [s.score for s in array_signals] == [s.score for s in python_signals]
+    assert [s.reasons for s in array_signals] == [s.reasons for s in python_signals]
@@ -15,3 +15,22 @@ def test_settings_default_values() -> None:
     assert settings.nansen_enable_wallet_labels is True
     assert settings.dex_include_labels == ["Fund", "Smart Trader"]
     assert settings.dex_exclude_labels == []
+
+
+def test_settings_derived_values_follow_field_updates() -> None:
+    settings = AppSettings(
+        NANSEN_API_KEY="dummy-key",
+        NANSEN_CHAINS="ethereum,solana",
+        GECKO_TERMINAL_TOKEN_POOLS='{"eth": {"0xA": ["0xP1"]}}',
+    )
+    assert settings.chains == ["ethereum", "solana"]
+    assert settings.gecko_terminal_token_pools_map == {"eth": {"0xa": ["0xp1"]}}
+
+    updated = settings.model_copy(
+        update={"nansen_chains": "base", "gecko_terminal_token_pools": '{"base": {"0xB": "0xP2"}}'}
+    )
+    assert updated.chains == ["base"]
+    assert updated.gecko_terminal_token_pools_map == {"base": {"0xb": ["0xp2"]}}
+
+    settings.nansen_chains = "solana"
+    assert settings.chains == ["solana"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from nansen_sm_collector.services import telegram_notifier as notifier_module
+from nansen_sm_collector.services.telegram_notifier import TelegramNotifier
+
+
+def _make_notifier(delays: dict[str, float]) -> tuple[TelegramNotifier, list[str], list[int]]:
+    delivered: list[str] = []
+    in_flight_peaks: list[int] = []
+    in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight
+        text = parse_qs(request.content.decode())["text"][0]
+        in_flight += 1
+        in_flight_peaks.append(in_flight)
+        await asyncio.sleep(delays.get(text, 0.0))
+        in_flight -= 1
+        delivered.append(text)
+        if text == "bad":
+            return httpx.Response(status_code=429)
+        return httpx.Response(status_code=200, json={"ok": True})
+
+    notifier = TelegramNotifier(
+        bot_token="token",
+        chat_id="chat",
+        async_transport=httpx.MockTransport(handler),
+    )
+    return notifier, delivered, in_flight_peaks
+
+
+def test_asend_texts_delivers_in_order_by_default() -> None:
+    notifier, delivered, in_flight_peaks = _make_notifier({"part 1": 0.03, "part 2": 0.01})
+
+    try:
+        results = asyncio.run(notifier.asend_texts(["part 1", "part 2", "", "bad", "part 3"]))
+    finally:
+        notifier.close()
+
+    assert results == [True, True, False, False, True]
+    assert delivered == ["part 1", "part 2", "bad", "part 3"]
+    assert max(in_flight_peaks) == 1
+
+
+def test_asend_texts_unordered_caps_concurrent_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(notifier_module, "_MAX_CONCURRENT_SENDS", 2)
+    texts = [f"message {index}" for index in range(6)]
+    notifier, delivered, in_flight_peaks = _make_notifier({text: 0.01 for text in texts})
+
+    try:
+        results = asyncio.run(notifier.asend_texts(texts, ordered=False))
+    finally:
+        notifier.close()
+
+    assert results == [True] * 6
+    assert sorted(delivered) == texts
+    assert max(in_flight_peaks) == 2
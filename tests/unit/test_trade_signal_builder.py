@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from nansen_sm_collector.services import trade_signal_builder as builder_module
+from nansen_sm_collector.services.token_overview import OverviewRow
+from nansen_sm_collector.services.trade_signal_builder import TradeSignalBuilder
+
+
+def _make_overview(count: int) -> list[OverviewRow]:
+    rows = []
+    for index in range(count):
+        market = {
+            "volume": index * 40_000.0 if index % 4 else None,
+            "netflow": (index % 9 - 2) * 60_000.0,
+            "price_change": (index % 6) * 0.25,
+            "liquidity": "bad" if index % 10 == 3 else index * 90_000.0,
+        }
+        smart = (
+            {
+                "total_usd_notional": index * 9_000.0,
+                "netflow_sum": (index % 5 - 1) * 30_000.0,
+                "event_count": index % 7,
+            }
+            if index % 3
+            else {}
+        )
+        rows.append(
+            OverviewRow(
+                chain="ethereum",
+                token_address=f"0x{index:04x}",
+                token_symbol=f"T{index}",
+                market=market,
+                smart_money=smart,
+            )
+        )
+    return rows
+
+
+def test_build_scores_and_splits_candidates() -> None:
+    overview = [
+        OverviewRow(
+            chain="ethereum",
+            token_address="0xaaa",
+            token_symbol="AAA",
+            market={"volume": 1_050_000.0, "liquidity": 200_000.0},
+            smart_money={"total_usd_notional": 275_000.0, "event_count": 3},
+        ),
+        OverviewRow(
+            chain="ethereum",
+            token_address="0xbbb",
+            token_symbol="BBB",
+            market={"volume": 50_000.0},
+            smart_money={},
+        ),
+    ]
+
+    result = TradeSignalBuilder().build(overview)
+
+    assert [item["token_symbol"] for item in result["all"]] == ["AAA"]
+    top = result["with_smart_money"][0]
+    assert top["market_score"] == 0.5
+    assert top["liquidity_score"] == 0.0
+    assert top["smart_money_score"] == 0.5
+    assert top["composite_score"] == pytest.approx(0.4)
+    assert result["without_smart_money"] == []
+
+
+@pytest.mark.parametrize(
+    "kernel",
+    [
+        pytest.param(
+            "jit",
+            marks=pytest.mark.skipif(not builder_module._NUMBA_AVAILABLE, reason="numba 未安裝"),
+        ),
+        pytest.param(
+            "vectorized",
+            marks=pytest.mark.skipif(not builder_module._NUMPY_AVAILABLE, reason="numpy 未安裝"),
+        ),
+    ],
+)
+def test_build_array_kernel_matches_python_path(kernel: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    overview = _make_overview(64)
+    builder = TradeSignalBuilder()
+
+    monkeypatch.setattr(builder_module, "_VECTOR_MIN_BATCH", 1)
+    if kernel == "vectorized":
+        monkeypatch.setattr(builder_module, "_NUMBA_AVAILABLE", False)
+    array_result = builder.build(overview)
+    monkeypatch.setattr(builder_module, "_NUMPY_AVAILABLE", False)
+    monkeypatch.setattr(builder_module, "_NUMBA_AVAILABLE", False)
+    python_result = builder.build(overview)
+
+    assert array_result == python_result
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from decimal import Decimal
 from types import SimpleNamespace
 from typing import Optional
@@ -9,10 +11,12 @@ import httpx
 import pytest
 from sqlalchemy.orm import sessionmaker
 from web3 import Web3
+from web3.providers.base import JSONBaseProvider
 
 from nansen_sm_collector.data import schemas
 from nansen_sm_collector.data.db import create_db_engine, create_session_factory
 from nansen_sm_collector.trading import (
+    BASE_TOKEN_REGISTRY,
     SwapRequest,
     Web3NotConfiguredError,
     ZeroExSwapClient,
@@ -31,14 +35,15 @@ def _make_session_factory(tmp_path) -> sessionmaker:
 
 
 def _make_swap_client(price_response: dict, quote_response: Optional[dict] = None) -> tuple[ZeroExSwapClient, httpx.Client]:
+    routes = {"price": price_response}
+    if quote_response is not None:
+        routes["quote"] = quote_response
+
     def handler(request: httpx.Request) -> httpx.Response:
-        if request.url.path.endswith("/price"):
-            return httpx.Response(status_code=200, json=price_response)
-        if request.url.path.endswith("/quote"):
-            if quote_response is None:
-                pytest.fail("Unexpected quote request during test")
-            return httpx.Response(status_code=200, json=quote_response)
-        pytest.fail(f"Unexpected request path: {request.url.path}")
+        payload = routes.get(request.url.path.rsplit("/", 1)[-1])
+        if payload is None:
+            pytest.fail(f"Unexpected request path: {request.url.path}")
+        return httpx.Response(status_code=200, json=payload)
 
     transport = httpx.MockTransport(handler)
     http_client = httpx.Client(base_url="https://api.0x.org", transport=transport)
@@ -78,6 +83,7 @@ def test_simulate_swap_records_trade(tmp_path) -> None:
     session = session_factory()
     try:
         trade = session.query(schemas.ExecutedTradeModel).one()
+        assert trade.id == result.trade_id
         assert trade.mode == "SIMULATION"
         assert trade.status == "COMPLETED"
         assert trade.sell_amount == "100000000"
@@ -149,6 +155,7 @@ def test_execute_live_swap_records_success(tmp_path) -> None:
     assert result.tx_hash == "0xdeadbeef"
     assert result.error_message is None
     assert result.quote_response == quote_response
+    wait_receipt_mock.assert_called_once_with("0xdeadbeef", timeout=30, poll_latency=1.0)
 
     session = session_factory()
     try:
@@ -163,6 +170,12 @@ def test_execute_live_swap_records_success(tmp_path) -> None:
         assert trade.integrator_fee_usdc == pytest.approx(0.15)
         assert trade.transaction_payload["allowance_tx_hash"] == "0xallowancetx"
         assert trade.transaction_payload["receipt"]["status"] == 1
+        assert trade.quote_response == {
+            "sellAmount": "100000000",
+            "buyAmount": "300000000",
+            "zid": "quote-test",
+            "allowanceTarget": ALLOWANCE_TARGET,
+        }
     finally:
         session.close()
 
@@ -192,3 +205,282 @@ def test_execute_live_swap_requires_web3(tmp_path) -> None:
 
     swap_client.close()
     http_client.close()
+
+
+def test_simulate_swap_prices_fee_alongside_main_quote(tmp_path) -> None:
+    usdc_address = BASE_TOKEN_REGISTRY[1]["USDC"].address
+    requested_buy_tokens: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        buy_token = request.url.params["buyToken"]
+        requested_buy_tokens.append(buy_token)
+        if buy_token == usdc_address:
+            return httpx.Response(status_code=200, json={"buyAmount": "2000000000"})
+        return httpx.Response(status_code=200, json={"buyAmount": "2000000000", "zid": "price-test"})
+
+    transport = httpx.MockTransport(handler)
+    http_client = httpx.Client(base_url="https://api.0x.org", transport=transport)
+    async_client = httpx.AsyncClient(base_url="https://api.0x.org", transport=transport)
+    swap_client = ZeroExSwapClient("test-key", client=http_client, async_client=async_client)
+    session_factory = _make_session_factory(tmp_path)
+    service = ZeroExTradingService(swap_client, session_factory, timezone="UTC")
+
+    request = SwapRequest(
+        chain_id=1,
+        taker_address="0x5A384227B65FA093DEC03Ec34E111Db80A040615",
+        base_token_symbol="WETH",
+        quote_token_address="0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        quote_token_symbol="USDT",
+        amount=Decimal("1"),
+        quote_token_decimals=6,
+    )
+
+    try:
+        sync_result = service.simulate_swap(request)
+        async_result = asyncio.run(service.asimulate_swap(request))
+    finally:
+        asyncio.run(async_client.aclose())
+        http_client.close()
+
+    # 第二次交易沿用快取的 USDC 匯率，不再發出估價請求。
+    assert requested_buy_tokens.count(usdc_address) == 1
+    session = session_factory()
+    try:
+        trades = {
+            trade.id: trade
+            for trade in session.query(schemas.ExecutedTradeModel)
+        }
+        for result in (sync_result, async_result):
+            trade = trades[result.trade_id]
+            assert trade.buy_amount == "1997000000"
+            assert trade.integrator_fee_usdc == pytest.approx(3.0)
+    finally:
+        session.close()
+
+
+def test_prepare_transaction_params_batches_nonce_and_gas_price(tmp_path) -> None:
+    rpc_calls: list[object] = []
+    results = {"eth_chainId": "0x1", "eth_getTransactionCount": "0x7", "eth_gasPrice": "0x3b9aca00"}
+
+    class FakeProvider(JSONBaseProvider):
+        def make_request(self, method, params):
+            rpc_calls.append(method)
+            return {"jsonrpc": "2.0", "id": 1, "result": results[method]}
+
+        def make_batch_request(self, requests):
+            rpc_calls.append([method for method, _ in requests])
+            return [
+                {"jsonrpc": "2.0", "id": index, "result": results[method]}
+                for index, (method, _) in enumerate(requests)
+            ]
+
+    swap_client, http_client = _make_swap_client({})
+    service = ZeroExTradingService(
+        swap_client,
+        _make_session_factory(tmp_path),
+        timezone="UTC",
+        web3=Web3(FakeProvider()),
+    )
+    try:
+        params = service._prepare_transaction_params(
+            {"to": ALLOWANCE_TARGET, "data": "0x1234", "gas": "850000", "value": "0"},
+            chain_id=1,
+            from_address="0x5A384227B65FA093DEC03Ec34E111Db80A040615",
+        )
+    finally:
+        swap_client.close()
+        http_client.close()
+
+    assert rpc_calls == [["eth_getTransactionCount", "eth_gasPrice"]]
+    assert params["nonce"] == 7
+    assert params["gasPrice"] == 1_000_000_000
+    assert params["gas"] == 850000
+
+
+def test_send_transaction_advances_local_nonce_and_recovers_from_stale_nonce(tmp_path) -> None:
+    taker = Web3.to_checksum_address("0x5a384227b65fa093dec03ec34e111db80a040615")
+    sent_nonces: list[int] = []
+
+    def send_raw_transaction(raw_tx):
+        nonce = raw_tx["nonce"]
+        if nonce in (7, 8):
+            raise ValueError("nonce too low")
+        sent_nonces.append(nonce)
+        return bytes([nonce])
+
+    get_transaction_count = MagicMock(side_effect=[5, 9])
+    eth = SimpleNamespace(
+        account=SimpleNamespace(
+            from_key=lambda key: SimpleNamespace(sign_transaction=lambda tx: SimpleNamespace(raw_transaction=tx))
+        ),
+        send_raw_transaction=send_raw_transaction,
+        get_transaction_count=get_transaction_count,
+    )
+    swap_client, http_client = _make_swap_client({})
+    service = ZeroExTradingService(
+        swap_client,
+        _make_session_factory(tmp_path),
+        timezone="UTC",
+        web3=SimpleNamespace(eth=eth),
+    )
+    transaction = {"to": ALLOWANCE_TARGET, "data": "0x", "gas": "21000", "gasPrice": "1", "value": "0"}
+    try:
+        for _ in range(2):
+            params = service._prepare_transaction_params(transaction, chain_id=1, from_address=taker)
+            service._send_transaction(params, private_key="0xabc")
+        # 錢包在別處送出交易後本地 nonce 過期，重新查詢後改用鏈上數值。
+        service._next_nonces[(1, taker)] = 7
+        params = service._prepare_transaction_params(transaction, chain_id=1, from_address=taker)
+        service._send_transaction(params, private_key="0xabc")
+    finally:
+        swap_client.close()
+        http_client.close()
+
+    assert sent_nonces == [5, 6, 9]
+    assert get_transaction_count.call_count == 2
+    assert service._next_nonces[(1, taker)] == 10
+
+
+def test_ensure_allowance_reuses_known_remaining_allowance(tmp_path) -> None:
+    eth_call = MagicMock(return_value=(250).to_bytes(32, "big"))
+    swap_client, http_client = _make_swap_client({})
+    service = ZeroExTradingService(
+        swap_client,
+        _make_session_factory(tmp_path),
+        timezone="UTC",
+        web3=SimpleNamespace(eth=SimpleNamespace(call=eth_call)),
+    )
+    usdc = BASE_TOKEN_REGISTRY[1]["USDC"].address
+    try:
+        for _ in range(2):
+            assert (
+                service._ensure_allowance(
+                    owner="0x5A384227B65FA093DEC03Ec34E111Db80A040615",
+                    token=usdc,
+                    spender=ALLOWANCE_TARGET,
+                    amount=100,
+                    chain_id=1,
+                    private_key="0xabc",
+                )
+                is None
+            )
+    finally:
+        swap_client.close()
+        http_client.close()
+
+    # 第二筆沿用本地剩餘額度 150，不再讀取鏈上 allowance。
+    assert eth_call.call_count == 1
+    assert list(service._allowances.values()) == [50]
+
+
+def test_execute_live_swap_forgets_local_nonce_when_receipt_times_out(tmp_path) -> None:
+    price_response = {"sellAmount": "100000000", "buyAmount": "250000000", "zid": "price-test"}
+    quote_response = {
+        **price_response,
+        "zid": "quote-test",
+        "transaction": {"to": ALLOWANCE_TARGET, "data": "0x1234", "gas": "850000", "gasPrice": "1", "value": "0"},
+    }
+    swap_client, http_client = _make_swap_client(price_response, quote_response)
+    wait_receipt_mock = MagicMock(side_effect=TimeoutError("receipt timeout"))
+    service = ZeroExTradingService(
+        swap_client,
+        _make_session_factory(tmp_path),
+        timezone="UTC",
+        web3=SimpleNamespace(eth=SimpleNamespace(wait_for_transaction_receipt=wait_receipt_mock)),
+    )
+    taker = Web3.to_checksum_address("0x5a384227b65fa093dec03ec34e111db80a040615")
+    service._next_nonces[(1, taker)] = 4
+    service._sign_and_send = MagicMock(return_value="0xdeadbeef")  # type: ignore[method-assign]
+
+    request = SwapRequest(
+        chain_id=1,
+        taker_address=taker,
+        base_token_symbol="USDC",
+        quote_token_address="0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        quote_token_symbol="USDT",
+        amount=Decimal("100"),
+        quote_token_decimals=6,
+    )
+    try:
+        result = service.execute_live_swap(request, private_key="0xabc", receipt_timeout=1)
+    finally:
+        swap_client.close()
+        http_client.close()
+
+    # 已廣播但未確認上鏈，下一筆交易必須重新查詢 pending nonce。
+    assert result.status == "FAILED"
+    assert service._sign_and_send.call_args.args[0]["nonce"] == 4
+    assert (1, taker) not in service._next_nonces
+
+
+def test_concurrent_live_swaps_get_consecutive_nonces_and_share_one_approve(tmp_path) -> None:
+    price_response = {
+        "sellAmount": "100000000",
+        "buyAmount": "250000000",
+        "allowanceTarget": ALLOWANCE_TARGET,
+        "zid": "price-test",
+    }
+    quote_response = {
+        **price_response,
+        "zid": "quote-test",
+        "transaction": {"to": ALLOWANCE_TARGET, "data": "0x1234", "gas": "850000", "gasPrice": "1", "value": "0"},
+    }
+    sent: list[dict] = []
+
+    def send_raw_transaction(raw_tx: dict) -> bytes:
+        time.sleep(0.01)
+        sent.append(raw_tx)
+        return raw_tx["nonce"].to_bytes(32, "big")
+
+    def wait_for_transaction_receipt(tx_hash, timeout, poll_latency):
+        time.sleep(0.05)
+        return SimpleNamespace(blockNumber=1, status=1)
+
+    # 鏈上授權 250 USDC：前兩筆各預留 100，第三筆只剩 50，需要一次 approve。
+    eth_call = MagicMock(return_value=(250_000_000).to_bytes(32, "big"))
+    eth = SimpleNamespace(
+        call=eth_call,
+        estimate_gas=lambda tx: 50_000,
+        gas_price=1,
+        get_transaction_count=MagicMock(return_value=10),
+        account=SimpleNamespace(
+            from_key=lambda key: SimpleNamespace(sign_transaction=lambda tx: SimpleNamespace(raw_transaction=dict(tx)))
+        ),
+        send_raw_transaction=send_raw_transaction,
+        wait_for_transaction_receipt=wait_for_transaction_receipt,
+    )
+    swap_client, http_client = _make_swap_client(price_response, quote_response)
+    service = ZeroExTradingService(
+        swap_client,
+        _make_session_factory(tmp_path),
+        timezone="UTC",
+        web3=SimpleNamespace(eth=eth),
+    )
+    request = SwapRequest(
+        chain_id=1,
+        taker_address="0x5A384227B65FA093DEC03Ec34E111Db80A040615",
+        base_token_symbol="USDC",
+        quote_token_address="0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        quote_token_symbol="USDT",
+        amount=Decimal("100"),
+        quote_token_decimals=6,
+    )
+
+    async def run_swaps() -> list:
+        return await asyncio.gather(
+            *(service.aexecute_live_swap(request, private_key="0xabc") for _ in range(3))
+        )
+
+    try:
+        results = asyncio.run(run_swaps())
+    finally:
+        swap_client.close()
+        http_client.close()
+
+    assert [result.status for result in results] == ["COMPLETED"] * 3
+    assert sorted(tx["nonce"] for tx in sent) == [10, 11, 12, 13]
+    approves = [tx for tx in sent if tx["data"].startswith("0x095ea7b3")]
+    assert len(approves) == 1
+    assert eth_call.call_count == 1
+    # 用到新額度的 swap 必須排在 approve 之後。
+    assert max(tx["nonce"] for tx in sent) > approves[0]["nonce"]